@@ -1,15 +1,39 @@
 import numpy as np
 from abc import ABC, abstractmethod
-from game.action import Action
+from typing import Optional, Sequence
+from game.action import NO_ACTION, Action
+from game.state import GameState
 
 
 class Agent(ABC):
+    # action taken in place of a decision that misses its deadline under the AGENT_DEFAULT fallback (None for none)
+    DEFAULT_ACTION: Optional[Action] = None
+
     @abstractmethod
-    def get_action(self, observation: np.ndarray) -> Action:
+    def get_action(self, observation: np.ndarray, state: Optional[GameState] = None) -> Action:
         """
         Get an action given the observation
 
         :param observation: Observation numpy array
+        :param state: structured game state (settled board, active and saved blocks) - games always pass it, agents
+            that plan on it may require it
         """
 
         raise NotImplementedError()
+
+    def get_actions(self, observations: np.ndarray, states: Optional[Sequence[GameState]] = None) -> np.ndarray:
+        """
+        Get an action for each of a stack of games, e.g. the boards of a VectorGame. By default get_action is
+        called once per game - agents that can decide for many games at once override this.
+
+        :param observations: (N, H, W) observations
+        :param states: structured state of each game - required by agents that plan on it
+        :return: (N,) Action values (NO_ACTION for none)
+        """
+
+        if states is None:
+            actions = [self.get_action(observation) for observation in observations]
+        else:
+            actions = [self.get_action(observation, state) for observation, state in zip(observations, states)]
+
+        return np.array([NO_ACTION if action is None else action.value for action in actions], dtype=np.int64)
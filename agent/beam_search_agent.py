@@ -0,0 +1,301 @@
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from agent.agent import Agent
+from agent.placement_agent import PlacementAgent
+from agent.transposition_cache import TranspositionCache
+from element.features import FEATURE_NAMES, compute_features
+from element.placement import Placement
+from element.tetris_blocks import BLOCK_TYPES
+from element.zobrist import hash_observations
+from game.action import Action
+from game.afterstates import get_afterstates
+from game.state import GameState
+
+
+class _SearchTimeout(Exception):
+    """
+    Raised inside the search when the decision's time budget runs out
+    """
+
+
+class _Expansion(NamedTuple):
+    """
+    Every placement available from a board for a piece (and the held piece, when swapping is allowed)
+    """
+
+    # placement of the active or held piece - only kept at the root, so that cached expansions hold nothing but
+    # arrays (millions of small tuples in the cache make garbage collection pauses stall decisions)
+    placements: Optional[List[Placement]]
+    # whether each placement uses the held piece
+    uses_hold: np.ndarray
+    # (P, H, W) resulting boards and their hashes
+    boards: np.ndarray
+    hashes: np.ndarray
+    # held piece after each placement (-1 for none)
+    holds: np.ndarray
+    # points gained by each placement
+    points: np.ndarray
+    # points plus heuristic value of each resulting board, sorted descending
+    scores: np.ndarray
+
+
+class BeamSearchAgent(Agent, PlacementAgent):
+    """
+    Act by searching over placement sequences and moving the active block towards the best first placement.
+
+    Each decision considers placing the active block or swapping in the saved block (SAVE_BLOCK), and looks ahead
+    over the unknown next blocks by averaging over all block types. Only the beam_width best placements of each
+    node (by points plus a board heuristic) are searched deeper. The search deepens one ply at a time until the
+    time budget runs out and the deepest completed search is used, so a tight budget degrades to a shallower
+    search rather than stalling the game. The budget is checked before every expansion, so a decision overruns it
+    by at most one expansion (the root's is always built). The path to the chosen placement is re-planned from the block's
+    current location on every call, so gravity and other interference are handled. As a PlacementAgent, the same
+    search picks a target once per block instead.
+    """
+
+    DEFAULT_BEAM_WIDTH = 4
+    # seconds per decision
+    DEFAULT_TIME_BUDGET = 0.05
+    DEFAULT_MAX_DEPTH = 2
+
+    # heuristic weights over element.features.FEATURE_NAMES
+    FEATURE_WEIGHTS = {
+        "aggregate_height": -0.51,
+        "holes": -0.36,
+        "bumpiness": -0.18,
+        "well_depth": -0.05,
+    }
+    POINTS_WEIGHT = 0.76
+    # value of a board where the next block cannot spawn
+    GAME_OVER_VALUE = -1e6
+
+    # number of expansions to keep across decisions
+    CACHE_CAPACITY = 2048
+
+    def __init__(
+            self,
+            beam_width: int = DEFAULT_BEAM_WIDTH,
+            time_budget: Optional[float] = DEFAULT_TIME_BUDGET,
+            max_depth: int = DEFAULT_MAX_DEPTH,
+        ):
+        """
+        Initialize the agent
+
+        :param beam_width: number of placements per node searched deeper
+        :param time_budget: seconds per decision; when even the first ply runs out of time, the best placement by
+            the board heuristic is taken without weighing a swap into the empty hold. None searches to max_depth.
+        :param max_depth: maximum number of blocks placed in a search
+        """
+
+        assert beam_width >= 1, "Beam width must be at least 1"
+        assert max_depth >= 1, "Max depth must be at least 1"
+
+        self._beam_width = beam_width
+        self._time_budget = time_budget
+        self._max_depth = max_depth
+        self._weights = np.array([self.FEATURE_WEIGHTS.get(name, 0.0) for name in FEATURE_NAMES])
+
+        # expansions keyed by (board hash, piece, hold) - boards recur while a block falls and across decisions
+        self._expansions = TranspositionCache(self.CACHE_CAPACITY)
+        # chance node values keyed by (board hash, hold, depth) for the current settled board
+        self._chance_values: Dict[Tuple[int, int, int], float] = {}
+        self._root_hash = None
+        self._deadline = None
+
+        # depth of the last completed search, for inspection
+        self.last_depth = 0
+
+    def get_action(self, observation: np.ndarray, state: Optional[GameState] = None) -> Action:
+        assert state is not None, "Beam search plans on the game state"
+        root, best = self._search(state)
+        if root is None:
+            # nowhere to go - the block is about to lock
+            return Action.MOVE_TO_BOTTOM
+
+        if best is None or root.uses_hold[best]:
+            return Action.SAVE_BLOCK
+
+        return root.placements[best].actions[0]
+
+    def get_placement(self, observation: np.ndarray, state: GameState, placements: List[Placement]) -> Optional[int]:
+        root, best = self._search(state)
+        if root is None:
+            # nowhere to go with either block - any choice locks the active block where it is
+            return 0 if placements else None
+        if best is None or root.uses_hold[best]:
+            return None
+
+        # the root placements of the active block are the same as the given ones, ordered by score
+        cells = root.placements[best].cells
+        return next(idx for idx, placement in enumerate(placements) if placement.cells == cells)
+
+    def _search(self, state: GameState) -> Tuple[Optional[_Expansion], Optional[int]]:
+        """
+        Search for the best placement of the active block (or the saved block swapped in for it)
+
+        :return: root expansion (None if there is nowhere to go) and the index of its best placement, None if
+            saving the active block into the empty hold is best
+        """
+
+        self._deadline = None if self._time_budget is None else time.perf_counter() + self._time_budget
+
+        board_hash = int(hash_observations(state.board))
+        if board_hash != self._root_hash:
+            self._root_hash = board_hash
+            self._chance_values.clear()
+
+        hold = -1 if state.saved_block_type is None else state.saved_block_type
+        root = self._expand_root(state, board_hash, hold)
+        save_to_empty_hold = state.can_save and state.saved_block_type is None
+        if len(root.scores) == 0 and not save_to_empty_hold:
+            return None, None
+
+        # iterative deepening - at the first ply only weighing a swap into the empty hold expands further nodes, so
+        # when that runs out of time the best placement is taken
+        try:
+            best = self._search_root(root, state.board, board_hash, state.block_type, save_to_empty_hold, depth=1)
+        except _SearchTimeout:
+            best = 0 if len(root.scores) > 0 else None
+        self.last_depth = 1
+        for depth in range(2, self._max_depth + 1):
+            try:
+                best = self._search_root(root, state.board, board_hash, state.block_type, save_to_empty_hold, depth)
+            except _SearchTimeout:
+                break
+            self.last_depth = depth
+
+        return root, best
+
+    def _search_root(
+            self,
+            root: _Expansion,
+            board: np.ndarray,
+            board_hash: int,
+            block_type: int,
+            save_to_empty_hold: bool,
+            depth: int,
+        ) -> Optional[int]:
+        """
+        Search the root to a depth
+
+        :return: index of the best root placement, None if saving the active block into the empty hold is best
+        """
+
+        best_idx, best_value = self._best_child(root, depth)
+        if save_to_empty_hold:
+            # the active block is held and an unknown block spawns in its place
+            value = self._chance_value(board, board_hash, block_type, depth)
+            if best_idx is None or value > best_value:
+                return None
+
+        return best_idx
+
+    def _best_child(self, expansion: _Expansion, depth: int) -> Tuple[Optional[int], float]:
+        """
+        Find the best placement of a node searching depth blocks deep
+
+        :return: index of the best placement (None if there are none) and its value
+        """
+
+        if len(expansion.scores) == 0:
+            return None, self.GAME_OVER_VALUE
+
+        if depth == 1:
+            return 0, float(expansion.scores[0])
+
+        best_idx, best_value = None, None
+        for idx in range(min(self._beam_width, len(expansion.scores))):
+            value = self.POINTS_WEIGHT * expansion.points[idx] + self._chance_value(
+                expansion.boards[idx], int(expansion.hashes[idx]), int(expansion.holds[idx]), depth - 1)
+            if best_value is None or value > best_value:
+                best_idx, best_value = idx, value
+
+        return best_idx, best_value
+
+    def _chance_value(self, board: np.ndarray, board_hash: int, hold: int, depth: int) -> float:
+        """
+        Get the expected value of a board over the next block type
+
+        :param hold: held piece (-1 for none)
+        """
+
+        key = (board_hash, hold, depth)
+        if key not in self._chance_values:
+            values = [
+                self._best_child(self._expand(board, board_hash, block_type, hold), depth)[1]
+                for block_type in range(len(BLOCK_TYPES))
+            ]
+            self._chance_values[key] = sum(values) / len(values)
+
+        return self._chance_values[key]
+
+    def _expand(self, board: np.ndarray, board_hash: int, block_type: int, hold: int) -> _Expansion:
+        """
+        Get the placements of a freshly spawned block, or of the held block swapped in for it
+        """
+
+        expansion = self._expansions.get(board_hash, block_type, hold)
+        if expansion is None:
+            if self._deadline is not None and time.perf_counter() > self._deadline:
+                raise _SearchTimeout()
+
+            expansion = self._build_expansion(board, [
+                (block_type, hold, False, 0, None, None),
+                (hold, block_type, True, 0, None, None),
+            ] if hold >= 0 and hold != block_type else [
+                (block_type, hold, False, 0, None, None),
+            ], keep_placements=False)
+            self._expansions.put(board_hash, block_type, hold, expansion)
+
+        return expansion
+
+    def _expand_root(self, state: GameState, board_hash: int, hold: int) -> _Expansion:
+        """
+        Get the placements reachable by the active block from its current location, plus those of the saved
+        block if it can be swapped in
+        """
+
+        options = [(state.block_type, hold, False, state.rotation_state, state.x, state.y)]
+        if state.can_save and hold >= 0:
+            options.append((hold, state.block_type, True, 0, None, None))
+
+        return self._build_expansion(state.board, options, keep_placements=True)
+
+    def _build_expansion(self, board: np.ndarray, options: List[Tuple], keep_placements: bool) -> _Expansion:
+        """
+        Build an expansion from the afterstates of each (piece, hold after, uses hold, rotation, x, y) option
+
+        :param keep_placements: whether to keep the placements (with their action sequences) in the expansion
+        """
+
+        placements = []
+        uses_hold = []
+        boards = []
+        holds = []
+        points = []
+        for piece, next_hold, option_uses_hold, rotation_state, x, y in options:
+            afterstates = get_afterstates(board, BLOCK_TYPES[piece], rotation_state=rotation_state, x=x, y=y)
+            placements += afterstates.placements
+            uses_hold += [option_uses_hold] * len(afterstates.placements)
+            boards.append(afterstates.boards)
+            holds += [next_hold] * len(afterstates.placements)
+            points.append(afterstates.points)
+
+        boards = np.concatenate(boards)
+        points = np.concatenate(points)
+        scores = self.POINTS_WEIGHT * points + compute_features(boards) @ self._weights
+        # children are kept best first so the beam is a prefix
+        order = np.argsort(-scores, kind="stable")
+
+        return _Expansion(
+            placements=[placements[idx] for idx in order] if keep_placements else None,
+            uses_hold=np.array(uses_hold, dtype=bool)[order],
+            boards=boards[order],
+            hashes=hash_observations(boards[order]),
+            holds=np.array(holds, dtype=np.int64)[order],
+            points=points[order],
+            scores=scores[order],
+        )
@@ -1,7 +1,9 @@
 import numpy as np
 import random
+from typing import Optional, Sequence
 from agent.agent import Agent
 from game.action import Action
+from game.state import GameState
 
 
 class BiasedRandomAgent(Agent):
@@ -21,6 +23,22 @@ class BiasedRandomAgent(Agent):
     ]
     ACTIONS = [action for action, _ in ACTION_PROBABILITIES]
     PROBABILITIES = np.array([p for _, p in ACTION_PROBABILITIES])
+    CODES = np.array([action.value for action in ACTIONS], dtype=np.int64)
+    # cumulative weights, as random.choices uses them (the probabilities need not add up to 1)
+    CUM_WEIGHTS = np.cumsum(PROBABILITIES)
 
-    def get_action(self, observation: np.ndarray) -> Action: 
+    def __init__(self):
+        # generator for batched decisions - created on first use from the global RNG, so that seeding random
+        # seeds it too without changing the draws of get_action
+        self._rng: Optional[np.random.Generator] = None
+
+    def get_action(self, observation: np.ndarray, state: Optional[GameState] = None) -> Action: 
         return random.choices(self.ACTIONS, weights=self.PROBABILITIES)[0]
+
+    def get_actions(self, observations: np.ndarray, states: Optional[Sequence[GameState]] = None) -> np.ndarray:
+        if self._rng is None:
+            self._rng = np.random.default_rng(random.getrandbits(64))
+
+        # inverse transform sampling over the cumulative weights
+        draws = self._rng.random(len(observations)) * self.CUM_WEIGHTS[-1]
+        return self.CODES[np.searchsorted(self.CUM_WEIGHTS, draws, side="right")]
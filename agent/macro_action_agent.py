@@ -0,0 +1,122 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from agent.agent import Agent
+from agent.placement_agent import PlacementAgent
+from element.placement import Placement, get_placements
+from element.tetris_blocks import BLOCK_TYPES
+from game.action import Action
+from game.state import GameState
+
+
+class MacroActionAgent(Agent):
+    """
+    Play a PlacementAgent at the keystroke level. The placement agent is asked for a target once per block, and the
+    keystrokes that reach it are then issued one per call, so the game's timing (and the number of keystrokes a
+    human would have needed) is unchanged while the placement agent makes a single decision per block.
+
+    The path to the target found with the target is followed as long as the block is where the path expects it. It
+    is re-planned from the block's current location when it is not, e.g. after gravity moved the block. A new target
+    is asked for when the target is locked or no longer reachable.
+    """
+
+    def __init__(self, agent: PlacementAgent):
+        """
+        Initialize the agent
+
+        :param agent: placement agent to pick the target of each block
+        """
+
+        self.agent = agent
+        # cells covered by the current target, and the settled board it was picked on
+        self._target: Optional[Tuple[Tuple[int, int], ...]] = None
+        self._board: Optional[np.ndarray] = None
+        # remaining keystrokes to the target, and the (x, y, rotation state) they expect the block to start from
+        self._path: List[Action] = []
+        self._expected: Optional[Tuple[int, int, int]] = None
+
+        # number of times the placement agent was queried
+        self.num_decisions = 0
+
+    def get_action(self, observation: np.ndarray, state: Optional[GameState] = None) -> Action:
+        assert state is not None, "Placements are found on the game state"
+        # the settled board only changes when a block locks, which may happen under gravity before the hard drop
+        if self._target is not None and not np.array_equal(state.board, self._board):
+            self._target = None
+        if self._target is not None and (state.x, state.y, state.rotation_state) == self._expected:
+            return self._step()
+
+        placements = self._get_placements(state)
+        if self._target is not None:
+            for placement in placements:
+                if placement.cells == self._target:
+                    return self._follow(placement, state)
+
+        if not placements and not state.can_save:
+            # nowhere to go - the block is about to lock
+            return Action.MOVE_TO_BOTTOM
+
+        self.num_decisions += 1
+        placement_idx = self.agent.get_placement(observation, state, placements)
+        if placement_idx is None:
+            assert state.can_save, "The active block cannot be swapped"
+            self._target = None
+            return Action.SAVE_BLOCK
+
+        self._target = placements[placement_idx].cells
+        self._board = state.board.copy()
+
+        return self._follow(placements[placement_idx], state)
+
+    def _follow(self, placement: Placement, state: GameState) -> Action:
+        """
+        Start following the path to a placement from the block's current location
+        """
+
+        self._path = list(reversed(placement.actions))
+        self._expected = (state.x, state.y, state.rotation_state)
+
+        return self._step()
+
+    def _step(self) -> Action:
+        """
+        Take the next keystroke of the path, forgetting the target once it is locked
+        """
+
+        action = self._path.pop()
+        x, y, rotation_state = self._expected
+        match action:
+            case Action.MOVE_LEFT:
+                self._expected = (x - 1, y, rotation_state)
+            case Action.MOVE_RIGHT:
+                self._expected = (x + 1, y, rotation_state)
+            case Action.MOVE_DOWN:
+                self._expected = (x, y + 1, rotation_state)
+            case Action.ROTATE:
+                # rotations keep the anchor, as in get_placements
+                self._expected = (x, y, (rotation_state + 1) % 4)
+            case Action.MOVE_TO_BOTTOM:
+                self._target = None
+                self._expected = None
+
+        return action
+
+    @staticmethod
+    def _get_placements(state: GameState) -> List[Placement]:
+        """
+        :return: resting placements reachable by the active block from its current location
+        """
+
+        height, width = state.board.shape
+        rows = (state.board @ (1 << np.arange(width, dtype=np.int64))).tolist()
+
+        return get_placements(
+            rows=rows,
+            width=width,
+            height=height,
+            orientations=BLOCK_TYPES[state.block_type].ORIENTATIONS,
+            rotation_state=state.rotation_state,
+            x=state.x,
+            y=state.y,
+        )
@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+import numpy as np
+
+from element.placement import Placement
+from game.state import GameState
+
+
+class PlacementAgent(ABC):
+    """
+    Agent that decides once per block where it should end up, rather than one keystroke at a time. Play it through
+    agent.macro_action_agent.MacroActionAgent, which issues the keystrokes that reach the chosen placement.
+    """
+
+    @abstractmethod
+    def get_placement(self, observation: np.ndarray, state: GameState, placements: List[Placement]) -> Optional[int]:
+        """
+        Get a target placement for the active block
+
+        :param observation: Observation numpy array
+        :param state: structured game state (settled board, active and saved blocks)
+        :param placements: resting placements reachable by the active block from its current location
+        :return: index into placements, or None to swap the active block with the saved block (only when
+            state.can_save) - the agent is then asked again for the block swapped in
+        """
+
+        raise NotImplementedError()
@@ -1,15 +1,38 @@
 import random
+from typing import List, Optional, Sequence
 import numpy as np
 from agent.agent import Agent
+from agent.placement_agent import PlacementAgent
+from element.placement import Placement
 from game.action import Action
+from game.state import GameState
 
 
-class RandomAgent(Agent):
+class RandomAgent(Agent, PlacementAgent):
     """
-    Act by selecting a random action with equal probability.
+    Act by selecting a random action with equal probability. As a PlacementAgent, select a random reachable
+    placement (or swapping the active block, when allowed) with equal probability.
     """
 
     ACTIONS = list(Action)
+    CODES = np.array([action.value for action in ACTIONS], dtype=np.int64)
 
-    def get_action(self, observation: np.ndarray) -> Action: 
+    def __init__(self):
+        # generator for batched decisions - created on first use from the global RNG, so that seeding random
+        # seeds it too without changing the draws of get_action
+        self._rng: Optional[np.random.Generator] = None
+
+    def get_action(self, observation: np.ndarray, state: Optional[GameState] = None) -> Action: 
         return random.choice(self.ACTIONS)
+
+    def get_actions(self, observations: np.ndarray, states: Optional[Sequence[GameState]] = None) -> np.ndarray:
+        if self._rng is None:
+            self._rng = np.random.default_rng(random.getrandbits(64))
+
+        return self.CODES[self._rng.integers(len(self.CODES), size=len(observations))]
+
+    def get_placement(self, observation: np.ndarray, state: GameState, placements: List[Placement]) -> Optional[int]:
+        # the last option is swapping the active block
+        placement_idx = random.randrange(len(placements) + state.can_save)
+
+        return placement_idx if placement_idx < len(placements) else None
@@ -0,0 +1,182 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def get_row_dtype(width: int) -> np.dtype:
+    """
+    :param width: width of the board
+    :return: smallest unsigned integer type that holds a row as a bitmask
+    """
+
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if width <= np.iinfo(dtype).bits:
+            return np.dtype(dtype)
+
+    raise ValueError(f"Boards wider than 64 columns are not supported: {width}")
+
+
+class ReplayBuffer:
+    """
+    Fixed-capacity ring buffer of (observation, action, reward, next observation, done) transitions for RL
+    training. Boards are stored as one bitmask per row with bit x set if column x is occupied, as in Grid.get_rows,
+    which takes 2 bytes per row of a 10 wide board instead of 10. Once full, new transitions overwrite the oldest.
+    """
+
+    def __init__(self, capacity: int, height: int, width: int):
+        """
+        Initialize the buffer - all memory is allocated up front
+
+        :param capacity: maximum number of transitions
+        :param height: height of the board
+        :param width: width of the board
+        """
+
+        self.capacity = capacity
+        self.height = height
+        self.width = width
+
+        row_dtype = get_row_dtype(width)
+        self._bits = (1 << np.arange(width)).astype(row_dtype)
+        self._observations = np.zeros((capacity, height), dtype=row_dtype)
+        self._next_observations = np.zeros((capacity, height), dtype=row_dtype)
+        self._actions = np.zeros(capacity, dtype=np.uint8)
+        self._rewards = np.zeros(capacity, dtype=np.float32)
+        self._dones = np.zeros(capacity, dtype=np.bool_)
+
+        # index the next transition is written to
+        self._pos = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """
+        :return: memory taken by the stored transitions in bytes
+        """
+
+        return sum(array.nbytes for array in (
+            self._observations, self._next_observations, self._actions, self._rewards, self._dones,
+        ))
+
+    def add(
+            self,
+            observation: np.ndarray,
+            action: int,
+            reward: float,
+            next_observation: np.ndarray,
+            done: bool,
+        ) -> None:
+        """
+        Add a transition
+
+        :param observation: (H, W) bool board the action was taken on
+        :param action: Action value (NO_ACTION for none)
+        :param reward: reward for the transition
+        :param next_observation: (H, W) bool board after the action
+        :param done: whether the game ended with the transition
+        """
+
+        pos = self._pos
+        self._observations[pos] = self.pack(observation)
+        self._next_observations[pos] = self.pack(next_observation)
+        self._actions[pos] = action
+        self._rewards[pos] = reward
+        self._dones[pos] = done
+
+        self._pos = (pos + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def add_batch(
+            self,
+            observations: np.ndarray,
+            actions: np.ndarray,
+            rewards: np.ndarray,
+            next_observations: np.ndarray,
+            dones: np.ndarray,
+        ) -> None:
+        """
+        Add a batch of transitions, e.g. one step of a VectorGame
+
+        :param observations: (N, H, W) bool boards
+        :param actions: (N,) Action values
+        :param rewards: (N,) rewards
+        :param next_observations: (N, H, W) bool boards after the actions
+        :param dones: (N,) done flags
+        """
+
+        num_transitions = len(actions)
+        start = self._pos
+        if num_transitions > self.capacity:
+            # only the last capacity transitions would survive - write them where they would have ended up
+            num_dropped = num_transitions - self.capacity
+            observations, actions, rewards, next_observations, dones = (
+                array[num_dropped:] for array in (observations, actions, rewards, next_observations, dones)
+            )
+            start = (start + num_dropped) % self.capacity
+            num_transitions = self.capacity
+
+        indices = (start + np.arange(num_transitions)) % self.capacity
+        self._observations[indices] = self.pack(observations)
+        self._next_observations[indices] = self.pack(next_observations)
+        self._actions[indices] = actions
+        self._rewards[indices] = rewards
+        self._dones[indices] = dones
+
+        self._pos = (start + num_transitions) % self.capacity
+        self._size = min(self._size + num_transitions, self.capacity)
+
+    def sample(
+            self,
+            batch_size: int,
+            rng: Optional[np.random.Generator] = None,
+        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Sample transitions uniformly with replacement
+
+        :param batch_size: number of transitions
+        :param rng: random generator (a fresh unseeded one if not provided)
+        :return: (B, H, W) bool observations, (B,) actions, (B,) rewards, (B, H, W) bool next observations and (B,)
+            done flags
+        """
+
+        assert self._size > 0, "Cannot sample from an empty buffer"
+        if rng is None:
+            rng = np.random.default_rng()
+        indices = rng.integers(0, self._size, size=batch_size)
+
+        return self.get(indices)
+
+    def get(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get stored transitions by slot
+
+        :param indices: (B,) slots in [0, len(self))
+        :return: transitions as returned by sample
+        """
+
+        return (
+            self.unpack(self._observations[indices]),
+            self._actions[indices],
+            self._rewards[indices],
+            self.unpack(self._next_observations[indices]),
+            self._dones[indices],
+        )
+
+    def pack(self, observations: np.ndarray) -> np.ndarray:
+        """
+        :param observations: (..., H, W) bool boards
+        :return: (..., H) row bitmasks
+        """
+
+        return observations @ self._bits
+
+    def unpack(self, rows: np.ndarray) -> np.ndarray:
+        """
+        :param rows: (..., H) row bitmasks
+        :return: (..., H, W) bool boards
+        """
+
+        return (rows[..., None] & self._bits) != 0
@@ -1,7 +1,12 @@
 from enum import Enum
+from typing import Type
 from agent.agent import Agent
 from agent.random_agent import RandomAgent
 from agent.biased_random_agent import BiasedRandomAgent
+from agent.beam_search_agent import BeamSearchAgent
+from agent.macro_action_agent import MacroActionAgent
+from agent.placement_agent import PlacementAgent
+from game.action import ActionSpace
 
 
 class AgentType(Enum):
@@ -11,18 +16,54 @@ class AgentType(Enum):
 
     RANDOM = 0
     BIASED_RANDOM = 1
+    BEAM_SEARCH = 2
 
 
-def get_agent(agent_type: AgentType) -> Agent:
+def get_agent_class(agent_type: AgentType) -> Type[Agent]:
     """
-    Get an agent instance given an agent type
+    Get the agent class of an agent type
+
+    :param agent_type: type of agent
+    :return: agent class
     """
 
     match agent_type:
         case AgentType.RANDOM:
-            return RandomAgent()
+            return RandomAgent
         case AgentType.BIASED_RANDOM:
-            return BiasedRandomAgent()
+            return BiasedRandomAgent
+        case AgentType.BEAM_SEARCH:
+            return BeamSearchAgent
         case _:
             raise ValueError(f"Unsupported agent type: {agent_type}")
 
+
+def supports_action_space(agent_type: AgentType, action_space: ActionSpace) -> bool:
+    """
+    Check whether an agent type can play in an action space, without building an agent
+
+    :param agent_type: type of agent
+    :param action_space: action space
+    :return: whether get_agent can build the agent type for the action space
+    """
+
+    return action_space != ActionSpace.PLACEMENT or issubclass(get_agent_class(agent_type), PlacementAgent)
+
+
+def get_agent(agent_type: AgentType, action_space: ActionSpace = ActionSpace.KEYSTROKE, **agent_kwargs) -> Agent:
+    """
+    Get an agent instance given an agent type
+
+    :param agent_type: type of agent
+    :param action_space: what the agent decides on - agents that pick placements are wrapped in a MacroActionAgent
+    :param agent_kwargs: optional keyword arguments for the agent's constructor (e.g. beam_width for BEAM_SEARCH)
+    """
+
+    if not supports_action_space(agent_type, action_space):
+        raise ValueError(f"Agent type {agent_type.name} does not support the {action_space.name} action space")
+
+    agent = get_agent_class(agent_type)(**agent_kwargs)
+    if action_space == ActionSpace.PLACEMENT:
+        return MacroActionAgent(agent)
+
+    return agent
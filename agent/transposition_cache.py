@@ -0,0 +1,109 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+
+class TranspositionCache:
+    """
+    Bounded memo of board evaluations for lookahead agents, keyed by (board hash, piece, hold).
+
+    Boards are keyed by their Zobrist hash (Grid.get_hash or element.zobrist.hash_observations); the piece and
+    hold can be any hashable description, e.g. block type indices. When full, the least recently used entry is
+    evicted.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize the cache
+
+        :param capacity: maximum number of entries
+        """
+
+        assert capacity > 0, "Capacity must be positive"
+
+        self.capacity = capacity
+        self._entries: OrderedDict[Tuple[int, Hashable, Hashable], Any] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        :return: fraction of lookups that were hits, 0 before any lookup
+        """
+
+        num_lookups = self.hits + self.misses
+
+        return self.hits / num_lookups if num_lookups else 0.0
+
+    def get(self, board_hash: int, piece: Hashable, hold: Hashable = None) -> Optional[Any]:
+        """
+        Look up an evaluation
+
+        :param board_hash: Zobrist hash of the board
+        :param piece: active piece
+        :param hold: held piece, if any
+        :return: cached value, or None on a miss
+        """
+
+        key = (int(board_hash), piece, hold)
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+
+        return value
+
+    def put(self, board_hash: int, piece: Hashable, hold: Hashable, value: Any) -> None:
+        """
+        Store an evaluation, evicting the least recently used entry if the cache is full
+
+        :param board_hash: Zobrist hash of the board
+        :param piece: active piece
+        :param hold: held piece, if any
+        :param value: evaluation to store - must not be None
+        """
+
+        assert value is not None, "None is reserved for cache misses"
+
+        key = (int(board_hash), piece, hold)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_compute(self, board_hash: int, piece: Hashable, hold: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Look up an evaluation, computing and storing it on a miss
+
+        :param board_hash: Zobrist hash of the board
+        :param piece: active piece
+        :param hold: held piece, if any
+        :param fn: computes the evaluation
+        :return: cached or computed value
+        """
+
+        value = self.get(board_hash, piece, hold)
+        if value is None:
+            value = fn()
+            self.put(board_hash, piece, hold, value)
+
+        return value
+
+    def clear(self) -> None:
+        """
+        Drop all entries and reset the counters
+        """
+
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
@@ -0,0 +1,107 @@
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from configs import config
+from element.block import Block
+from element.grid import Grid
+from element.point import Point
+from element.tetris_blocks import BLOCK_TYPES
+from gui.null_canvas import NullCanvas
+
+
+# Default benchmark parameters
+DEFAULT_NUM_PIECES = 5000
+DEFAULT_NUM_CLEARS = 2000
+DEFAULT_SEED = 0
+
+
+def create_grid() -> Grid:
+    return Grid(NullCanvas(height=config.HEIGHT, width=config.WIDTH))
+
+
+def bench_placement(num_pieces: int, seed: int) -> float:
+    """
+    Time block placement: each piece is spawned, moved around randomly and dropped to the bottom
+
+    :param num_pieces: number of pieces to place
+    :param seed: seed for the random moves
+    :return: seconds per block move
+    """
+
+    rng = random.Random(seed)
+    moves: List[Callable[[Block], bool]] = [
+        lambda block: block.rotate(),
+        lambda block: block.translate(dx=-1, dy=0),
+        lambda block: block.translate(dx=1, dy=0),
+    ]
+
+    grid = create_grid()
+    num_moves = 0
+    start = time.perf_counter()
+    for _ in range(num_pieces):
+        block = rng.choice(BLOCK_TYPES)(grid)
+        if not block.activate():
+            # board topped out, start over on a fresh board
+            grid = create_grid()
+            block = rng.choice(BLOCK_TYPES)(grid)
+            block.activate()
+
+        for _ in range(rng.randint(0, 8)):
+            rng.choice(moves)(block)
+            num_moves += 1
+
+        while block.translate(dx=0, dy=1):
+            num_moves += 1
+        num_moves += 1
+
+        grid.clear_full_rows()
+
+    return (time.perf_counter() - start) / num_moves
+
+
+def bench_clear(num_clears: int, num_full_rows: int, seed: int) -> float:
+    """
+    Time clearing full rows at the bottom of a board with a ragged stack above them
+
+    :param num_clears: number of clears to time
+    :param num_full_rows: number of full rows to clear each time
+    :param seed: seed for the stack above the full rows
+    :return: seconds per clear
+    """
+
+    rng = random.Random(seed)
+    elapsed = 0.0
+    for _ in range(num_clears):
+        grid = create_grid()
+        for y in range(grid.height - num_full_rows, grid.height):
+            for x in range(grid.width):
+                grid.add_point(Point(x=x, y=y, color="black"))
+
+        # half full rows above the cleared ones
+        for y in range(grid.height // 2, grid.height - num_full_rows):
+            for x in rng.sample(range(grid.width), grid.width // 2):
+                grid.add_point(Point(x=x, y=y, color="black"))
+
+        start = time.perf_counter()
+        assert grid.clear_full_rows() == num_full_rows
+        elapsed += time.perf_counter() - start
+
+    return elapsed / num_clears
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark for grid placement and row clears")
+    parser.add_argument("--num_pieces", type=int, help="number of pieces to place", default=DEFAULT_NUM_PIECES)
+    parser.add_argument("--num_clears", type=int, help="number of clears to time per row count", default=DEFAULT_NUM_CLEARS)
+    parser.add_argument("--seed", type=int, help="seed for the benchmark fixtures", default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    print(f"placement: {bench_placement(args.num_pieces, args.seed) * 1e6:.2f} us/move")
+    for num_full_rows in range(1, 5):
+        print(f"clear {num_full_rows} rows: {bench_clear(args.num_clears, num_full_rows, args.seed) * 1e6:.2f} us/clear")
+
+
+if __name__ == "__main__":
+    main()
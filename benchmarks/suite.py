@@ -0,0 +1,514 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tkinter as tk
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from agent.agent import Agent
+from agent.biased_random_agent import BiasedRandomAgent
+from agent.random_agent import RandomAgent
+from configs import config
+from element.grid import Grid
+from element.point import Point
+from element.tetris_blocks import BLOCK_TYPES, LineBlock, TBlock
+from game.action import NO_ACTION, Action
+from game.env import TetrisEnv
+from game.game import Game
+from game.mode import Mode
+from game.state import GameState
+from gui.canvas import Canvas
+from gui.null_canvas import NullCanvas
+
+
+# Default suite parameters
+DEFAULT_SEED = 0
+# each benchmark is run this many times, each run right after a calibration run, and the medians are reported
+DEFAULT_REPEAT = 7
+# run-to-run noise of the relative timings is around 5-20% (and of the raw timings up to 60%), so only slowdowns
+# well beyond it count
+DEFAULT_MAX_REGRESSION_PCT = 50.0
+# timings are machine-specific: regressions are judged on timings relative to the calibration loop, which carry
+# over between machines only roughly - regenerate the baseline with --update_baseline on the machine that compares
+DEFAULT_BASELINE_FPATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# iterations of the calibration loop
+NUM_CALIBRATION_ITERATIONS = 20000
+
+# duration of the games in the headless game benchmark, in game seconds
+GAME_DURATION = 60
+# number of games decided on at once in the batched agent benchmarks
+NUM_BATCHED_GAMES = 4096
+
+
+def bench_calibration(seed: int) -> float:
+    """
+    :return: seconds per run of a fixed pure Python loop of dict and integer operations, like the engine's hot paths,
+        that the other benchmarks are timed relative to
+    """
+
+    cells = {}
+    start = time.perf_counter()
+    for idx in range(NUM_CALIBRATION_ITERATIONS):
+        key = (idx * 7 + seed) % 211
+        cells[key] = cells.get(key, 0) + (idx & 15)
+
+    return time.perf_counter() - start
+
+
+def create_grid() -> Grid:
+    return Grid(NullCanvas(height=config.HEIGHT, width=config.WIDTH))
+
+
+def create_fixture_grid(seed: int, num_full_rows: int = 0, canvas: Optional[Canvas] = None) -> Grid:
+    """
+    Create a board with full rows at the bottom and a ragged, half full stack above them, leaving the top of
+    the board free for blocks to move in
+
+    :param seed: seed for the stack
+    :param num_full_rows: number of full rows at the bottom
+    :param canvas: canvas to draw the board on (draws nothing if not provided)
+    :return: grid
+    """
+
+    rng = random.Random(seed)
+    grid = create_grid() if canvas is None else Grid(canvas)
+    for y in range(grid.height - num_full_rows, grid.height):
+        for x in range(grid.width):
+            grid.add_point(Point(x=x, y=y, color="black"))
+
+    for y in range(grid.height // 2, grid.height - num_full_rows):
+        for x in rng.sample(range(grid.width), grid.width // 2):
+            grid.add_point(Point(x=x, y=y, color="black"))
+
+    return grid
+
+
+def bench_can_place(seed: int) -> float:
+    """
+    :return: seconds per Grid.can_place call, over every cell of a fixture board and just outside it
+    """
+
+    grid = create_fixture_grid(seed)
+    cells = [(x, y) for y in range(-1, grid.height + 1) for x in range(-1, grid.width + 1)] * 20
+
+    start = time.perf_counter()
+    for x, y in cells:
+        grid.can_place(x, y)
+
+    return (time.perf_counter() - start) / len(cells)
+
+
+def bench_batch_translate(seed: int) -> float:
+    """
+    :return: seconds per Grid.batch_translate call, moving a four point block back and forth
+    """
+
+    grid = create_fixture_grid(seed)
+    points = [Point(x=x, y=1, color="black") for x in range(3, 7)]
+    for point in points:
+        grid.add_point(point)
+    left = {point: (-1, 0) for point in points}
+    right = {point: (1, 0) for point in points}
+
+    num_calls = 2000
+    start = time.perf_counter()
+    for _ in range(num_calls // 2):
+        grid.batch_translate(left)
+        grid.batch_translate(right)
+
+    return (time.perf_counter() - start) / num_calls
+
+
+def bench_clear_full_rows(seed: int, num_full_rows: int) -> float:
+    """
+    :return: seconds per Grid.clear_full_rows call clearing num_full_rows rows below a ragged stack
+    """
+
+    num_calls = 200
+    elapsed = 0.0
+    for idx in range(num_calls):
+        grid = create_fixture_grid(seed + idx, num_full_rows=num_full_rows)
+
+        start = time.perf_counter()
+        grid.clear_full_rows()
+        elapsed += time.perf_counter() - start
+
+    return elapsed / num_calls
+
+
+def bench_canvas_clear_full_rows(seed: int, num_full_rows: int) -> float:
+    """
+    :return: seconds per Grid.clear_full_rows call clearing num_full_rows rows below a ragged stack drawn on a Tk
+        canvas, including the Tk calls to remove and shift the rectangles
+    """
+
+    root = tk.Tk()
+    canvas = Canvas(root, height=config.HEIGHT, width=config.WIDTH, cell_size=config.CELL_SIZE, padding=config.PADDING)
+
+    num_calls = 50
+    elapsed = 0.0
+    for idx in range(num_calls):
+        grid = create_fixture_grid(seed + idx, num_full_rows=num_full_rows, canvas=canvas)
+        root.update_idletasks()
+
+        start = time.perf_counter()
+        grid.clear_full_rows()
+        root.update_idletasks()
+        elapsed += time.perf_counter() - start
+
+        # return the rectangles to the canvas pool for the next board
+        for y in range(grid.height):
+            for x in range(grid.width):
+                point = grid.get_point(x, y)
+                if point is not None:
+                    grid.remove(point)
+
+    root.destroy()
+
+    return elapsed / num_calls
+
+
+def bench_canvas_add_remove_block(seed: int) -> float:
+    """
+    :return: seconds per four point block added to and removed from a board drawn on a Tk canvas
+    """
+
+    root = tk.Tk()
+    canvas = Canvas(root, height=config.HEIGHT, width=config.WIDTH, cell_size=config.CELL_SIZE, padding=config.PADDING)
+    grid = create_fixture_grid(seed, canvas=canvas)
+    colors = [block_type.COLOR for block_type in BLOCK_TYPES]
+
+    num_blocks = 1000
+    start = time.perf_counter()
+    for idx in range(num_blocks):
+        points = [Point(x=x, y=1, color=colors[idx % len(colors)]) for x in range(3, 7)]
+        for point in points:
+            grid.add_point(point)
+        for point in points:
+            grid.remove(point)
+        root.update_idletasks()
+    elapsed = time.perf_counter() - start
+
+    root.destroy()
+
+    return elapsed / num_blocks
+
+
+def bench_get_observation(seed: int) -> float:
+    """
+    :return: seconds per Grid.get_observation call
+    """
+
+    grid = create_fixture_grid(seed)
+
+    num_calls = 20000
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        grid.get_observation()
+
+    return (time.perf_counter() - start) / num_calls
+
+
+def bench_rotate(seed: int) -> float:
+    """
+    :return: seconds per Block.rotate call, for a T block and a line block in open space
+    """
+
+    num_calls = 2000
+    elapsed = 0.0
+    for block_type in (TBlock, LineBlock):
+        block = block_type(create_fixture_grid(seed))
+        block.activate()
+        block.translate(dx=0, dy=2)
+
+        start = time.perf_counter()
+        for _ in range(num_calls):
+            block.rotate()
+        elapsed += time.perf_counter() - start
+
+    return elapsed / (2 * num_calls)
+
+
+class _HardDropAgent(Agent):
+    """
+    Hard drops every block at a random column
+    """
+
+    ACTIONS = [Action.MOVE_LEFT, Action.MOVE_RIGHT, Action.ROTATE, Action.MOVE_TO_BOTTOM]
+
+    def __init__(self, seed: int):
+        self._random = random.Random(seed)
+
+    def get_action(self, observation: np.ndarray, state: GameState) -> Action:
+        return self._random.choice(self.ACTIONS)
+
+
+def bench_move_to_bottom(seed: int) -> float:
+    """
+    :return: seconds per hard drop (Game._move_to_bottom, including settling, clearing and spawning), timed inside
+        headless games
+    """
+
+    elapsed = 0.0
+    num_calls = 0
+    game_seed = seed
+    while num_calls < 500:
+        game = Game(
+            mode=Mode.SIMULATION,
+            id="benchmark",
+            duration=GAME_DURATION,
+            agent=_HardDropAgent(game_seed),
+            simulation_delta_t=0.1,
+            headless=True,
+            seed=game_seed,
+            record_results=False,
+        )
+
+        # time only the hard drop handler
+        move_to_bottom = game._action_handlers[Action.MOVE_TO_BOTTOM]
+
+        def timed_move_to_bottom(event):
+            nonlocal elapsed, num_calls
+            start = time.perf_counter()
+            move_to_bottom(event)
+            elapsed += time.perf_counter() - start
+            num_calls += 1
+
+        game._action_handlers[Action.MOVE_TO_BOTTOM] = timed_move_to_bottom
+        game.run()
+        game_seed += 1
+
+    return elapsed / num_calls
+
+
+def bench_headless_game(seed: int) -> float:
+    """
+    :return: seconds per headless game of GAME_DURATION game seconds with a random agent
+    """
+
+    num_games = 3
+    start = time.perf_counter()
+    for game_seed in range(seed, seed + num_games):
+        random.seed(game_seed)
+        game = Game(
+            mode=Mode.SIMULATION,
+            id="benchmark",
+            duration=GAME_DURATION,
+            agent=RandomAgent(),
+            simulation_delta_t=0.1,
+            headless=True,
+            seed=game_seed,
+            record_results=False,
+        )
+        game.run()
+
+    return (time.perf_counter() - start) / num_games
+
+
+def bench_no_action_episode(seed: int) -> float:
+    """
+    :return: seconds per TetrisEnv episode that takes no actions, so that gravity stacks blocks until the board fills up
+    """
+
+    num_episodes = 3
+    start = time.perf_counter()
+    for episode_seed in range(seed, seed + num_episodes):
+        env = TetrisEnv()
+        env.reset(seed=episode_seed)
+        done = False
+        while not done:
+            _, _, done, _ = env.step(NO_ACTION)
+
+    return (time.perf_counter() - start) / num_episodes
+
+
+def bench_get_actions(seed: int, agent: Agent) -> float:
+    """
+    :return: seconds per Agent.get_actions call over NUM_BATCHED_GAMES observations
+    """
+
+    random.seed(seed)
+    observations = np.random.default_rng(seed).random((NUM_BATCHED_GAMES, config.HEIGHT, config.WIDTH)) < 0.3
+
+    num_calls = 100
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        agent.get_actions(observations)
+
+    return (time.perf_counter() - start) / num_calls
+
+
+# benchmark name to function of the seed returning seconds per operation
+BENCHMARKS: Dict[str, Callable[[int], float]] = {
+    "grid.can_place": bench_can_place,
+    "grid.batch_translate": bench_batch_translate,
+    **{
+        f"grid.clear_full_rows.{num_full_rows}": (
+            lambda seed, num_full_rows=num_full_rows: bench_clear_full_rows(seed, num_full_rows)
+        )
+        for num_full_rows in range(1, 5)
+    },
+    "grid.get_observation": bench_get_observation,
+    "block.rotate": bench_rotate,
+    "game.move_to_bottom": bench_move_to_bottom,
+    "game.headless_game": bench_headless_game,
+    "env.no_action_episode": bench_no_action_episode,
+    "agent.random.get_actions": lambda seed: bench_get_actions(seed, RandomAgent()),
+    "agent.biased_random.get_actions": lambda seed: bench_get_actions(seed, BiasedRandomAgent()),
+    # these need a display
+    "canvas.add_remove_block": bench_canvas_add_remove_block,
+    **{
+        f"canvas.clear_full_rows.{num_full_rows}": (
+            lambda seed, num_full_rows=num_full_rows: bench_canvas_clear_full_rows(seed, num_full_rows)
+        )
+        for num_full_rows in range(1, 5)
+    },
+}
+# prefix of the benchmarks that need a display
+GUI_BENCHMARK_PREFIX = "canvas."
+
+
+def has_display() -> bool:
+    """
+    :return: whether Tk can open a window, which the GUI benchmarks need
+    """
+
+    try:
+        tk.Tk().destroy()
+    except tk.TclError:
+        return False
+
+    return True
+
+
+def run_suite(names: List[str], seed: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Run benchmarks. Each run is preceded by a run of bench_calibration, so that the relative timing cancels out
+    the speed of the machine and slow drifts in it (e.g. frequency scaling).
+
+    :param names: names of the benchmarks to run
+    :param seed: seed for the board fixtures and games
+    :param repeat: number of runs per benchmark - the medians are reported
+    :return: map from benchmark name to its seconds per operation, operations per second and seconds per operation
+        relative to the calibration loop
+    """
+
+    results = {}
+    for name in names:
+        seconds = []
+        relative = []
+        for _ in range(repeat):
+            calibration_seconds = bench_calibration(seed)
+            seconds.append(BENCHMARKS[name](seed))
+            relative.append(seconds[-1] / calibration_seconds)
+
+        median_seconds = float(np.median(seconds))
+        results[name] = {
+            "seconds": median_seconds,
+            "ops_per_second": 1 / median_seconds,
+            "relative": float(np.median(relative)),
+        }
+
+    return results
+
+
+def get_change_pct(result: Dict[str, float], baseline_result: Dict[str, float]) -> float:
+    """
+    :param result: result of a benchmark
+    :param baseline_result: baseline result of the benchmark
+    :return: slowdown against the baseline in percent, on the relative timings when both have them
+    """
+
+    key = "relative" if "relative" in result and "relative" in baseline_result else "seconds"
+
+    return 100 * (result[key] / baseline_result[key] - 1)
+
+
+def write_results(fpath: str, results: Dict[str, Dict[str, float]]) -> None:
+    """
+    Write results as JSON
+    """
+
+    with open(fpath, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def find_regressions(
+        results: Dict[str, Dict[str, float]],
+        baseline: Dict[str, Dict[str, float]],
+        max_regression_pct: float,
+    ) -> List[str]:
+    """
+    Compare results against a baseline
+
+    :param results: results of run_suite
+    :param baseline: earlier results of run_suite
+    :param max_regression_pct: allowed slowdown in percent before a benchmark counts as regressed
+    :return: descriptions of the regressed benchmarks
+    """
+
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        change_pct = get_change_pct(result, baseline[name])
+        if change_pct > max_regression_pct:
+            regressions.append(f"{name}: {change_pct:+.1f}% (limit {max_regression_pct:+.1f}%)")
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark suite for the engine hot paths")
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), help="benchmarks to run (default: all, skipping the GUI benchmarks without a display)", default=None)
+    parser.add_argument("--seed", type=int, help="seed for the board fixtures and games", default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, help="runs per benchmark, the medians are reported", default=DEFAULT_REPEAT)
+    parser.add_argument("--output", type=str, help="path to write the results to as JSON", required=False)
+    parser.add_argument("--baseline", type=str, help="baseline results to compare against; timings are machine-specific, so regenerate it with --update_baseline on the machine that compares", default=DEFAULT_BASELINE_FPATH)
+    parser.add_argument("--max_regression_pct", type=float, help="allowed slowdown of the timings relative to the calibration loop against the baseline in percent", default=DEFAULT_MAX_REGRESSION_PCT)
+    parser.add_argument("--update_baseline", action="store_true", help="merge these results into the baseline instead of comparing, keeping the benchmarks that did not run", default=False)
+    args = parser.parse_args(argv)
+
+    names = args.benchmarks
+    if names is None:
+        names = list(BENCHMARKS)
+        if not has_display():
+            print("No display found, skipping the GUI benchmarks")
+            names = [name for name in names if not name.startswith(GUI_BENCHMARK_PREFIX)]
+
+    results = run_suite(names, args.seed, args.repeat)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    for name, result in results.items():
+        line = f"{name}: {result['seconds'] * 1e6:.2f} us ({result['ops_per_second']:.1f}/s)"
+        if baseline is not None and name in baseline:
+            line += f" [{get_change_pct(result, baseline[name]):+.1f}% vs baseline]"
+        print(line)
+
+    if args.output is not None:
+        write_results(args.output, results)
+
+    if args.update_baseline:
+        write_results(args.baseline, {**(baseline or {}), **results})
+        return 0
+
+    if baseline is None:
+        print(f"No baseline found at {args.baseline}")
+        return 0
+
+    regressions = find_regressions(results, baseline, args.max_regression_pct)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+
+    return 1 if regressions else 0
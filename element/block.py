@@ -1,17 +1,32 @@
-from abc import ABC, abstractmethod
-
-from typing import Tuple, List
+from typing import Tuple
 
 from element.grid import Grid
 from element.point import Point
+from element.shape import Shape, build_orientations
 
 
-class Block(ABC):
+class Block:
     """
     The Block class represents a tetris block that we can move
     Each block consists of underlying points and belongs to a grid.
+
+    A block's state is its rotation state plus the (x, y) of its anchor; the cells it covers are looked up in
+    the orientation table precomputed for each block type. Subclasses define:
+        COLOR: hex color of the block
+        SPAWN_OFFSETS: (dx, dy) offsets of the cells from the anchor at spawn
+        ROTATION_DELTAS: per rotation state, translation deltas for each cell after rotating by 90 degrees
     """
 
+    COLOR: str = None
+    SPAWN_OFFSETS: Tuple[Tuple[int, int], ...] = None
+    ROTATION_DELTAS: Tuple[Tuple[Tuple[int, int], ...], ...] = None
+    # shapes of the four orientations, indexed by rotation state - built once per block type
+    ORIENTATIONS: Tuple[Shape, ...] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.ORIENTATIONS = build_orientations(cls.SPAWN_OFFSETS, cls.ROTATION_DELTAS)
+
     def __init__(self, grid: Grid):
         """
         Initializes the block
@@ -19,30 +34,56 @@ class Block(ABC):
         """
 
         self._grid = grid
-        self._color = self.get_color()
-        # list of points in the block
-        self._points = []
+        # points in the block, in the order of the orientation cells
+        self._points = [Point(0, 0, self.COLOR) for _ in self.SPAWN_OFFSETS]
         # rotation state modulo 4 (across four possible rotations)
         self._rotation_state = 0
+        # anchor location
+        self._x = 0
+        self._y = 0
         self._init_state()
 
+    @property
+    def rotation_state(self) -> int:
+        return self._rotation_state
+
+    @property
+    def x(self) -> int:
+        return self._x
+
+    @property
+    def y(self) -> int:
+        return self._y
+
+    @property
+    def shape(self) -> Shape:
+        return self.ORIENTATIONS[self._rotation_state]
+
+    @staticmethod
+    def get_spawn_location(width: int) -> Tuple[int, int]:
+        """
+        Get the anchor location a block spawns at - the top center of the grid
+        :param width: width of the grid
+        :return: anchor (x, y)
+        """
+
+        return width // 2, 0
+
     def activate(self) -> bool:
         """
         Activate the block if possible
         :return: bool flag indicating success
         """
 
-        # iterate through the points and exit if we cannot place any of the points
-        for point in self._points:
-            if not self._grid.can_place(point.x, point.y):
-                return False
-        
+        if not self._grid.can_place_shape(self.ORIENTATIONS[self._rotation_state], self._x, self._y):
+            return False
+
         # now add all the points
         for point in self._points:
             self._grid.add_point(point)
-        
+
         return True
-    
+
     def reset(self):
         """
         Reset this block back to its initial state (unactivated)
@@ -58,11 +99,7 @@ class Block(ABC):
         :return: bool indicating translation success
         """
 
-        point_deltas = {
-            point: (dx, dy) for point in self._points
-        }
-
-        return self._grid.batch_translate(point_deltas)
+        return self._move(self._rotation_state, self._x + dx, self._y + dy)
 
     def rotate(self) -> bool:
         """
@@ -70,14 +107,7 @@ class Block(ABC):
         :return: bool indicating rotation success
         """
 
-        deltas = self.get_rotation_deltas()
-        assert len(deltas) == len(self._points)
-        point_deltas = {
-            point: delta for point, delta in zip(self._points, deltas)
-        }
-
-        if self._grid.batch_translate(point_deltas):
-            self._rotation_state = (self._rotation_state + 1) % 4
+        return self._move((self._rotation_state + 1) % 4, self._x, self._y)
 
     def remove(self) -> None:
         """
@@ -87,41 +117,31 @@ class Block(ABC):
         for point in self._points:
             self._grid.remove(point)
 
-    @abstractmethod
-    def get_init_point_locations(self) -> List[Tuple[int, int]]:
+    def _move(self, rotation_state: int, x: int, y: int) -> bool:
         """
-        Get the initial point locations for this block
-        :return: List of tuples containing point coordinates
+        Move the block to a rotation state and anchor location if the resulting cells are free
+        :param rotation_state: rotation state to move to
+        :param x: anchor x coord to move to
+        :param y: anchor y coord to move to
+        :return: bool indicating move success
         """
 
-        raise NotImplementedError()
-
-    @abstractmethod
-    def get_rotation_deltas(self) -> List[Tuple[int, int]]:
-        """
-        Get translation deltas for each block after rotating by 90 degrees
-        :return: List of dx, dy
-        """
+        if not self._grid.move_points_to_shape(self._points, self.ORIENTATIONS[rotation_state], x, y):
+            return False
 
-        raise NotImplementedError()
+        self._rotation_state = rotation_state
+        self._x = x
+        self._y = y
 
-    @abstractmethod
-    def get_color(self) -> str:
-        """
-        Return the hex color of the block
-        :return: hex color
-        """
+        return True
 
-        raise NotImplementedError()
-    
     def _init_state(self):
         """
         Helper function to initialize block state.
         """
 
-        self._points.clear()
-        for point_loc in self.get_init_point_locations():
-            x, y = point_loc
-            self._points.append(Point(x, y, self._color))
-
         self._rotation_state = 0
+        self._x, self._y = self.get_spawn_location(self._grid.width)
+        for point, (dx, dy) in zip(self._points, self.ORIENTATIONS[0].cells):
+            point.x = self._x + dx
+            point.y = self._y + dy
@@ -0,0 +1,78 @@
+import numpy as np
+
+
+# layout of the board feature vector returned by Grid.get_features and compute_features
+FEATURE_NAMES = (
+    # sum of the column heights
+    "aggregate_height",
+    # height of the tallest column
+    "max_height",
+    # empty cells with an occupied cell somewhere above them in the same column
+    "holes",
+    # sum of absolute height differences between adjacent columns
+    "bumpiness",
+    # occupied/empty changes along each row, counting the walls as occupied
+    "row_transitions",
+    # sum over columns of how far each column sits below both its neighbors (walls count as full height)
+    "well_depth",
+)
+NUM_FEATURES = len(FEATURE_NAMES)
+
+
+def compute_column_heights(observations: np.ndarray) -> np.ndarray:
+    """
+    Compute column heights from scratch
+
+    :param observations: (..., H, W) bool boards
+    :return: (..., W) height of each column, 0 for an empty column
+    """
+
+    height = observations.shape[-2]
+    filled = observations.any(axis=-2)
+    top = observations.argmax(axis=-2)
+
+    return np.where(filled, height - top, 0)
+
+
+def compute_well_depths(column_heights: np.ndarray, height: int) -> np.ndarray:
+    """
+    Compute how far each column sits below both of its neighbors
+
+    :param column_heights: (..., W) column heights
+    :param height: height of the board - the walls count as columns of this height
+    :return: (..., W) well depth of each column
+    """
+
+    walls = np.full(column_heights.shape[:-1] + (1,), height, dtype=column_heights.dtype)
+    padded = np.concatenate([walls, column_heights, walls], axis=-1)
+    neighbor_heights = np.minimum(padded[..., :-2], padded[..., 2:])
+
+    return np.maximum(neighbor_heights - column_heights, 0)
+
+
+def compute_features(observations: np.ndarray) -> np.ndarray:
+    """
+    Compute the board feature vector from scratch (see FEATURE_NAMES). This is O(H * W) per board; Grid keeps the
+    same features up to date incrementally.
+
+    :param observations: (..., H, W) bool boards
+    :return: (..., NUM_FEATURES) int features
+    """
+
+    height = observations.shape[-2]
+    column_heights = compute_column_heights(observations)
+    holes = column_heights.sum(axis=-1) - observations.sum(axis=(-2, -1))
+    bumpiness = np.abs(np.diff(column_heights, axis=-1)).sum(axis=-1)
+
+    walls = np.ones(observations.shape[:-1] + (1,), dtype=bool)
+    padded = np.concatenate([walls, observations, walls], axis=-1)
+    row_transitions = (padded[..., 1:] != padded[..., :-1]).sum(axis=(-2, -1))
+
+    return np.stack([
+        column_heights.sum(axis=-1),
+        column_heights.max(axis=-1),
+        holes,
+        bumpiness,
+        row_transitions,
+        compute_well_depths(column_heights, height).sum(axis=-1),
+    ], axis=-1).astype(np.int64)
@@ -1,5 +1,7 @@
 from gui.canvas import Canvas
 from element.point import Point
+from element.shape import Shape
+from element.zobrist import get_zobrist_table, hash_rows
 import numpy as np
 from typing import Optional, Callable, List, Dict, Tuple
 
@@ -20,13 +22,40 @@ class Grid:
 
         # container for points at a location (H x W matrix)
         self._points: List[List[Optional[Point]]] = []
-        # row counts
-        self._row_counts: List[int] = []
+        # occupancy bitboard: one integer per row where bit x is set if (x, y) is occupied
+        self._rows: List[int] = []
+        # bitmask of a full row
+        self._full_row_mask = (1 << self.width) - 1
 
         for _ in range(self.height):
-            self._row_counts.append(0)
+            self._rows.append(0)
             self._points.append([None] * self.width)
 
+        # occupancy matrix kept in sync with the points, handed out to agents as a read-only view
+        self._observation = np.zeros((self.height, self.width), dtype=bool)
+        self._observation_view = self._observation.view()
+        self._observation_view.flags.writeable = False
+
+        # board features, updated lazily for the columns and rows touched since they were last read
+        # column bitboard: one integer per column where bit y is set if (x, y) is occupied
+        self._columns: List[int] = [0] * self.width
+        # whether the column bitboard must be rebuilt from the rows (after clearing rows)
+        self._columns_stale = False
+        self._column_heights: List[int] = [0] * self.width
+        self._column_holes: List[int] = [0] * self.width
+        self._num_holes = 0
+        # an empty row has two transitions, against the walls on either side
+        self._row_transitions: List[int] = [2] * self.height
+        self._num_row_transitions = 2 * self.height
+        # bitmasks of the columns and rows whose features are stale
+        self._dirty_columns = 0
+        self._dirty_rows = 0
+
+        # Zobrist hash of the occupied cells, XORed as cells change and recomputed after clearing rows
+        self._zobrist_table = get_zobrist_table(self.height, self.width)
+        self._hash = 0
+        self._hash_stale = False
+
     def add_point(self, point: Point) -> bool:
         """
         Adds a point to the grid
@@ -111,6 +140,40 @@ class Grid:
         
         return True
 
+    def move_points_to_shape(self, points: List[Point], shape: Shape, x: int, y: int) -> bool:
+        """
+        Move points onto the cells of a shape anchored at (x, y). The i-th point moves to the i-th cell of the
+        shape, and cells currently held by the points themselves count as free.
+
+        :param points: points to move
+        :param shape: shape to move the points onto
+        :param x: anchor x coord
+        :param y: anchor y coord
+        :return: success flag
+        """
+
+        # vacate the points' own cells while checking the shape against the bitboard
+        rows = self._rows
+        for point in points:
+            rows[point.y] &= ~(1 << point.x)
+        fits = shape.fits(rows, self.width, self.height, x, y)
+        for point in points:
+            rows[point.y] |= 1 << point.x
+
+        if not fits:
+            return False
+
+        for point in points:
+            self._remove_occupancy(point)
+
+        for point, (dx, dy) in zip(points, shape.cells):
+            point.x = x + dx
+            point.y = y + dy
+            self._add_occupancy(point)
+            self._canvas.move_point(point, point.x, point.y)
+
+        return True
+
     def clear_full_rows(self) -> int:
         """
         Clear any full rows on the board
@@ -118,25 +181,38 @@ class Grid:
         :return: number of rows cleared
         """
 
-        # Iterate bottom up - if we detect a full row, clear it; shift
-        # subsequent rows down
+        full_rows = [row_idx for row_idx, row in enumerate(self._rows) if row == self._full_row_mask]
+        if not full_rows:
+            return 0
+
+        # remove the full rows and shift the rows above them on the canvas in one go
+        self._canvas.clear_rows(full_rows)
+
+        # Iterate bottom up - every remaining row shifts down by the number of full rows below it
         num_rows_cleared = 0
         for row_idx in range(self.height - 1, -1, -1):
-            if self._row_counts[row_idx] >= self.width:
-                # full row, clear and increment shift amt
-                for point in self._points[row_idx]:
-                    if point is not None:
-                        self.remove(point)
-                
+            if self._rows[row_idx] == self._full_row_mask:
                 num_rows_cleared += 1
-            elif num_rows_cleared > 0:
-                # we need to shift this row
-                point_deltas = dict()
+            elif num_rows_cleared > 0 and self._rows[row_idx]:
                 for point in self._points[row_idx]:
                     if point is not None:
-                        point_deltas[point] = (0, num_rows_cleared)
-                self.batch_translate(point_deltas)
-        
+                        point.y += num_rows_cleared
+
+        # splice the full rows out of the occupancy structures and pad with empty rows at the top
+        kept_rows = [row_idx for row_idx, row in enumerate(self._rows) if row != self._full_row_mask]
+        self._rows = [0] * num_rows_cleared + [self._rows[row_idx] for row_idx in kept_rows]
+        self._points = [[None] * self.width for _ in range(num_rows_cleared)] + \
+            [self._points[row_idx] for row_idx in kept_rows]
+        self._observation[num_rows_cleared:] = self._observation[kept_rows]
+        self._observation[:num_rows_cleared] = False
+
+        # every column and row shifted, so their features are recomputed on the next read - this also keeps the
+        # hole and transition totals consistent without splicing the per-column and per-row values
+        self._columns_stale = True
+        self._dirty_columns = self._full_row_mask
+        self._dirty_rows = (1 << self.height) - 1
+        self._hash_stale = True
+
         return num_rows_cleared
 
     def bind_key_listener(self, key: str, fn: Callable) -> None:
@@ -158,23 +234,101 @@ class Grid:
         :return: can place flag
         """
 
-        return self._canvas.is_inbounds(x, y) and self.get_point(x, y) is None
+        return 0 <= x < self.width and 0 <= y < self.height and not (self._rows[y] >> x) & 1
     
-    def get_observation(self) -> np.ndarray:
+    def get_rows(self) -> List[int]:
+        """
+        Get a copy of the occupancy bitboard
+
+        :return: one bitmask per row where bit x is set if (x, y) is occupied
+        """
+
+        return list(self._rows)
+
+    def get_column_heights(self) -> np.ndarray:
+        """
+        Get the height of each column, i.e. the number of rows from its highest occupied cell to the bottom
+
+        :return: (W,) column heights, 0 for an empty column
+        """
+
+        self._update_column_features()
+
+        return np.array(self._column_heights)
+
+    def get_features(self) -> np.ndarray:
+        """
+        Get the board feature vector, laid out as element.features.FEATURE_NAMES. Features are maintained
+        incrementally, so this only revisits the columns and rows changed since the last call.
+
+        :return: (NUM_FEATURES,) int features
+        """
+
+        self._update_column_features()
+        self._update_row_features()
+
+        heights = self._column_heights
+        bumpiness = 0
+        well_depth = 0
+        # the walls count as columns of full height
+        left_height = self.height
+        for x, height in enumerate(heights):
+            right_height = heights[x + 1] if x + 1 < self.width else self.height
+            if x + 1 < self.width:
+                bumpiness += abs(height - right_height)
+            well_depth += max(min(left_height, right_height) - height, 0)
+            left_height = height
+
+        return np.array([
+            sum(heights),
+            max(heights),
+            self._num_holes,
+            bumpiness,
+            self._num_row_transitions,
+            well_depth,
+        ], dtype=np.int64)
+
+    def get_hash(self) -> int:
+        """
+        Get the Zobrist hash of the occupied cells (including any active block), see element.zobrist
+
+        :return: 64-bit hash
+        """
+
+        if self._hash_stale:
+            self._hash = hash_rows(self._rows, self.width)
+            self._hash_stale = False
+
+        return self._hash
+
+    def can_place_shape(self, shape: Shape, x: int, y: int) -> bool:
+        """
+        Determine if we can place a shape anchored at (x, y), i.e. are all its cells in bounds and not occupied
+
+        :param shape: shape to place
+        :param x: anchor x coord
+        :param y: anchor y coord
+        :return: can place flag
+        """
+
+        return shape.fits(self._rows, self.width, self.height, x, y)
+
+    def get_observation(self, copy: bool = False) -> np.ndarray:
         """
         Get the observation of the grid
         An observation is a binary matrix of size H x W where a value of 1 indicates that the cell is occupied
 
+        By default this is a read-only view of the grid's occupancy which reflects later changes to the grid;
+        request a copy to keep a snapshot.
+
+        :param copy: return a writeable snapshot instead of the live view
         :return: observation
         """
 
-        observation = np.zeros((self.height, self.width), dtype=bool)
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.get_point(x, y) is not None:
-                    observation[y, x] = True
-        
-        return observation
+        if copy:
+            return self._observation.copy()
+
+        return self._observation_view
     
     def _add_occupancy(self, point: Point) -> None:
         """
@@ -184,7 +338,12 @@ class Grid:
         """
 
         self._points[point.y][point.x] = point
-        self._row_counts[point.y] += 1
+        self._rows[point.y] |= 1 << point.x
+        self._columns[point.x] |= 1 << point.y
+        self._observation[point.y, point.x] = True
+        self._dirty_columns |= 1 << point.x
+        self._dirty_rows |= 1 << point.y
+        self._hash ^= self._zobrist_table[point.y][point.x]
 
     def _remove_occupancy(self, point: Point) -> None:
         """
@@ -194,7 +353,63 @@ class Grid:
         """
 
         self._points[point.y][point.x] = None
-        self._row_counts[point.y] -= 1
+        self._rows[point.y] &= ~(1 << point.x)
+        self._columns[point.x] &= ~(1 << point.y)
+        self._observation[point.y, point.x] = False
+        self._dirty_columns |= 1 << point.x
+        self._dirty_rows |= 1 << point.y
+        self._hash ^= self._zobrist_table[point.y][point.x]
+
+    def _update_column_features(self) -> None:
+        """
+        Recompute the height and holes of the columns changed since the last update
+        """
+
+        if self._columns_stale:
+            self._columns = [0] * self.width
+            for row_idx, row in enumerate(self._rows):
+                while row:
+                    lowest = row & -row
+                    self._columns[lowest.bit_length() - 1] |= 1 << row_idx
+                    row ^= lowest
+            self._columns_stale = False
+
+        dirty = self._dirty_columns
+        while dirty:
+            lowest = dirty & -dirty
+            dirty ^= lowest
+            x = lowest.bit_length() - 1
+
+            column = self._columns[x]
+            # the highest occupied cell is the lowest set bit
+            height = self.height - (column & -column).bit_length() + 1 if column else 0
+            holes = height - column.bit_count()
+            self._num_holes += holes - self._column_holes[x]
+            self._column_heights[x] = height
+            self._column_holes[x] = holes
+
+        self._dirty_columns = 0
+
+    def _update_row_features(self) -> None:
+        """
+        Recompute the transitions of the rows changed since the last update
+        """
+
+        # walls on both sides count as occupied
+        walls = 1 | (1 << (self.width + 1))
+        transition_mask = (1 << (self.width + 1)) - 1
+        dirty = self._dirty_rows
+        while dirty:
+            lowest = dirty & -dirty
+            dirty ^= lowest
+            y = lowest.bit_length() - 1
+
+            row = (self._rows[y] << 1) | walls
+            transitions = ((row ^ (row >> 1)) & transition_mask).bit_count()
+            self._num_row_transitions += transitions - self._row_transitions[y]
+            self._row_transitions[y] = transitions
+
+        self._dirty_rows = 0
     
     def _batch_move_update(self, point_locations: Dict[Point, Tuple[int, int]]) -> bool:
         """
@@ -206,30 +421,32 @@ class Grid:
         :return: success flag
         """
 
-        # validate uniqueness of point locations
-        assert len(set(point_locations.items())) == len(point_locations), \
-            f"Passed in point locations contains duplicates: {point_locations.items()}"
-        
+        # per row bitmasks of the cells being vacated and claimed
+        vacated: Dict[int, int] = {}
+        for point in point_locations:
+            vacated[point.y] = vacated.get(point.y, 0) | (1 << point.x)
+
+        claimed: Dict[int, int] = {}
+        for x, y in point_locations.values():
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                return False
+
+            mask = claimed.get(y, 0)
+            # validate uniqueness of point locations
+            assert not (mask >> x) & 1, \
+                f"Passed in point locations contains duplicates: {point_locations.items()}"
+            claimed[y] = mask | (1 << x)
+
+        # verify we can place all the points - cells vacated by the moving points themselves are free
+        for y, mask in claimed.items():
+            if self._rows[y] & ~vacated.get(y, 0) & mask:
+                return False
+
         # otherwise, we can move!
         # first, remove from old locations
         for point in point_locations:
             self._remove_occupancy(point)
-        
-        # next, verify we can place all the points
-        invalid = False
-        for loc in point_locations.values():
-            x, y = loc
-            if not self.can_place(x, y):
-                invalid = True
-                break
-        
-        if invalid:
-            # add back all the points
-            for point in point_locations:
-                self._add_occupancy(point)
 
-            return False
-        
         # now, add to the new locations and execute the move
         for point, loc in point_locations.items():
             point.x, point.y = loc
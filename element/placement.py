@@ -0,0 +1,315 @@
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from element.block import Block
+from element.grid import Grid
+from element.shape import Shape
+from game.action import Action
+
+
+class Placement(NamedTuple):
+    """
+    A final resting placement of a block along with the shortest action sequence that reaches and locks it
+    """
+
+    rotation_state: int
+    # anchor location
+    x: int
+    y: int
+    # absolute (x, y) cells covered by the block
+    cells: Tuple[Tuple[int, int], ...]
+    actions: Tuple[Action, ...]
+
+
+def get_block_placements(grid: Grid, block: Block) -> List[Placement]:
+    """
+    Get every resting placement reachable by an active block on a grid
+
+    :param grid: grid the block is active on
+    :param block: active block
+    :return: placements, one per distinct set of covered cells
+    """
+
+    # the block's own cells are not obstacles
+    rows = grid.get_rows()
+    for dx, dy in block.shape.cells:
+        rows[block.y + dy] &= ~(1 << (block.x + dx))
+
+    return get_placements(
+        rows=rows,
+        width=grid.width,
+        height=grid.height,
+        orientations=block.ORIENTATIONS,
+        rotation_state=block.rotation_state,
+        x=block.x,
+        y=block.y,
+    )
+
+
+def get_placements(
+        rows: Sequence[int],
+        width: int,
+        height: int,
+        orientations: Sequence[Shape],
+        rotation_state: int,
+        x: int,
+        y: int,
+    ) -> List[Placement]:
+    """
+    Get every resting placement reachable from a block state with the rotate, left, right and down actions
+    followed by a hard drop. Gravity is not modelled. Placements covering the same cells (e.g. rotations of a
+    square) are reported once, with the shortest action sequence.
+
+    Every path to anchor y uses exactly y - y0 down actions, so states are searched in layers of the number of
+    left, right and rotate actions needed, with down moves free within a layer. The search is bit-parallel: for
+    every (rotation state, anchor x) the set of anchor y values is a bitmask, so a whole column of states is
+    expanded with a few shifts and ANDs.
+
+    :param rows: occupancy bitboard of the settled cells, one bitmask per row
+    :param width: width of the board
+    :param height: height of the board
+    :param orientations: shapes of the block indexed by rotation state
+    :param rotation_state: current rotation state of the block
+    :param x: current anchor x
+    :param y: current anchor y
+    :return: placements sorted by rotation state, x then y
+    """
+
+    # column bitboard: bit y of columns[x] is set if (x, y) is occupied
+    columns = [0] * width
+    for row_idx, row in enumerate(rows):
+        while row:
+            lowest = row & -row
+            columns[lowest.bit_length() - 1] |= 1 << row_idx
+            row ^= lowest
+
+    # anchor x values covered by any orientation
+    x_min = min(-shape.min_dx for shape in orientations)
+    x_max = max(width - 1 - shape.max_dx for shape in orientations)
+    num_x = x_max - x_min + 1
+
+    # fits[r * num_x + x - x_min] is the bitmask of anchor y values where orientation r fits at anchor x
+    fits = [0] * (4 * num_x)
+    for rot, shape in enumerate(orientations):
+        span = shape.max_dy - shape.min_dy
+        # positions with the top of the shape at row s = 0 .. height - 1 - span
+        inbounds = (1 << (height - span)) - 1
+        # a cell dy below the top row collides at top row s if its column is occupied at s + dy
+        cell_offsets = [(dx, dy - shape.min_dy) for dx, dy in shape.cells]
+
+        for anchor_x in range(-shape.min_dx, width - shape.max_dx):
+            blocked = 0
+            for dx, bit in cell_offsets:
+                blocked |= columns[anchor_x + dx] >> bit
+
+            fit = inbounds & ~blocked
+            # convert top row s to anchor y = s - min_dy
+            fits[rot * num_x + anchor_x - x_min] = fit >> shape.min_dy if shape.min_dy >= 0 else fit << -shape.min_dy
+
+    start_idx = rotation_state * num_x + x - x_min
+    if not (0 <= x - x_min < num_x and (fits[start_idx] >> y) & 1):
+        return []
+
+    neighbors = _get_neighbor_table(num_x)
+
+    # layered 0-1 BFS - layers[d] maps state index to the y bitmask of states first reached with d left, right or
+    # rotate actions (and any number of down actions)
+    visited = [0] * (4 * num_x)
+    frontier = {start_idx: _fill_down(1 << y, fits[start_idx])}
+    visited[start_idx] = frontier[start_idx]
+    layers = [frontier]
+    while frontier:
+        next_frontier: Dict[int, int] = {}
+        for idx, states in frontier.items():
+            for neighbor_idx in neighbors[idx]:
+                reached = states & fits[neighbor_idx] & ~visited[neighbor_idx]
+                if reached:
+                    next_frontier[neighbor_idx] = next_frontier.get(neighbor_idx, 0) | reached
+
+        for idx, states in next_frontier.items():
+            states = _fill_down(states, fits[idx]) & ~visited[idx]
+            visited[idx] |= states
+            next_frontier[idx] = states
+
+        frontier = next_frontier
+        if frontier:
+            layers.append(frontier)
+
+    predecessors = _get_predecessor_table(num_x)
+    paths: Dict[Tuple[int, int, int], Tuple[Action, ...]] = {}
+    placements: Dict[int, Placement] = {}
+    for idx in range(4 * num_x):
+        fit = fits[idx]
+        if not visited[idx]:
+            continue
+
+        rot, x_idx = divmod(idx, num_x)
+        shape = orientations[rot]
+        anchor_x = x_idx + x_min
+        # a resting anchor y fits but cannot move down
+        resting = fit & ~(fit >> 1)
+        while resting:
+            rest_y = (resting & -resting).bit_length() - 1
+            resting &= resting - 1
+
+            # every state in the contiguous run of fitting y values above rest_y hard drops to rest_y
+            top_y = (~fit & ((1 << rest_y) - 1)).bit_length()
+            run = ((1 << (rest_y + 1)) - 1) & ~((1 << top_y) - 1)
+            if not visited[idx] & run:
+                continue
+
+            # cheapest state to hard drop from: (drop_y - y) down actions plus the layer's other actions
+            num_actions = None
+            for depth, layer in enumerate(layers):
+                states = layer.get(idx, 0) & run
+                if states:
+                    candidate_y = (states & -states).bit_length() - 1
+                    if num_actions is None or candidate_y - y + depth < num_actions:
+                        num_actions = candidate_y - y + depth
+                        drop_depth, drop_y = depth, candidate_y
+
+            cells = tuple((anchor_x + dx, rest_y + dy) for dx, dy in shape.cells)
+            key = 0
+            for cell_x, cell_y in cells:
+                key |= 1 << (cell_y * width + cell_x)
+
+            if key in placements and len(placements[key].actions) <= num_actions + 1:
+                continue
+
+            actions = _reconstruct_actions(layers, predecessors, paths, drop_depth, idx, drop_y, y) + \
+                (Action.MOVE_TO_BOTTOM,)
+            placements[key] = Placement(
+                rotation_state=rot,
+                x=anchor_x,
+                y=rest_y,
+                cells=cells,
+                actions=actions,
+            )
+
+    return sorted(placements.values(), key=lambda placement: (placement.rotation_state, placement.x, placement.y))
+
+
+def _fill_down(states: int, fit: int) -> int:
+    """
+    Extend a set of anchor y values with every position reachable from them by moving down
+
+    :param states: bitmask of anchor y values
+    :param fit: bitmask of anchor y values where the block fits
+    :return: bitmask of reachable anchor y values
+    """
+
+    # Kogge-Stone style occluded fill towards higher bits, propagating only through fitting positions
+    states &= fit
+    states |= fit & (states << 1)
+    fit &= fit << 1
+    states |= fit & (states << 2)
+    fit &= fit << 2
+    states |= fit & (states << 4)
+    fit &= fit << 4
+    states |= fit & (states << 8)
+    fit &= fit << 8
+    states |= fit & (states << 16)
+    fit &= fit << 16
+    states |= fit & (states << 32)
+
+    return states
+
+
+@lru_cache(maxsize=None)
+def _get_neighbor_table(num_x: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Get, for every state index, the state indices one left, right or rotate action away
+
+    :param num_x: number of anchor x values per rotation state
+    :return: neighboring state indices indexed by state index (rotation state * num_x + x index)
+    """
+
+    return tuple(
+        tuple(neighbor_idx for neighbor_idx, _ in _get_successors(idx, num_x))
+        for idx in range(4 * num_x)
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_predecessor_table(num_x: int) -> Tuple[Tuple[Tuple[int, Action], ...], ...]:
+    """
+    Get, for every state index, the state indices one left, right or rotate action before it
+
+    :param num_x: number of anchor x values per rotation state
+    :return: (state index, action) pairs indexed by state index (rotation state * num_x + x index)
+    """
+
+    table = [[] for _ in range(4 * num_x)]
+    for idx in range(4 * num_x):
+        for successor_idx, action in _get_successors(idx, num_x):
+            table[successor_idx].append((idx, action))
+
+    return tuple(tuple(predecessors) for predecessors in table)
+
+
+def _get_successors(idx: int, num_x: int) -> List[Tuple[int, Action]]:
+    """
+    Get the state indices one left, right or rotate action away from a state index
+
+    :param idx: state index (rotation state * num_x + x index)
+    :param num_x: number of anchor x values per rotation state
+    :return: (state index, action) pairs
+    """
+
+    rot, x_idx = divmod(idx, num_x)
+    successors = []
+    if x_idx > 0:
+        successors.append((idx - 1, Action.MOVE_LEFT))
+    if x_idx < num_x - 1:
+        successors.append((idx + 1, Action.MOVE_RIGHT))
+    successors.append(((rot + 1) % 4 * num_x + x_idx, Action.ROTATE))
+
+    return successors
+
+
+def _reconstruct_actions(
+        layers: List[Dict[int, int]],
+        predecessors: Tuple[Tuple[Tuple[int, Action], ...], ...],
+        paths: Dict[Tuple[int, int, int], Tuple[Action, ...]],
+        depth: int,
+        idx: int,
+        y: int,
+        start_y: int,
+    ) -> Tuple[Action, ...]:
+    """
+    Walk back through the BFS layers to recover the actions that first reach a state
+
+    :param layers: BFS layers mapping state index to y bitmask
+    :param predecessors: for every state index, the state indices and actions that lead to it
+    :param paths: memo of already reconstructed paths keyed by (depth, state index, y)
+    :param depth: layer the state was first reached in
+    :param idx: state index (rotation state * num_x + x index)
+    :param y: anchor y of the state
+    :param start_y: anchor y of the start state
+    :return: actions from the start state to the state
+    """
+
+    key = (depth, idx, y)
+    if key in paths:
+        return paths[key]
+
+    if depth == 0:
+        path = (Action.MOVE_DOWN,) * (y - start_y)
+    else:
+        # the state was reached by moving down from where the last non-down action entered this layer
+        layer = layers[depth][idx]
+        prev_layer = layers[depth - 1]
+        path = None
+        entry_y = y
+        while path is None:
+            assert (layer >> entry_y) & 1, "State must be reached by moving down within its layer"
+            for prev_idx, action in predecessors[idx]:
+                if (prev_layer.get(prev_idx, 0) >> entry_y) & 1:
+                    path = _reconstruct_actions(layers, predecessors, paths, depth - 1, prev_idx, entry_y, start_y) + \
+                        (action,) + (Action.MOVE_DOWN,) * (y - entry_y)
+                    break
+            entry_y -= 1
+
+    paths[key] = path
+
+    return path
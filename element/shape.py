@@ -0,0 +1,100 @@
+from typing import List, NamedTuple, Sequence, Tuple
+
+
+class Shape(NamedTuple):
+    """
+    Immutable description of one orientation of a block. Cells are offsets from the block's anchor, in the same
+    order as the block's points.
+    """
+
+    # (dx, dy) offsets of the cells from the anchor
+    cells: Tuple[Tuple[int, int], ...]
+    # bounding box of the offsets
+    min_dx: int
+    max_dx: int
+    min_dy: int
+    max_dy: int
+    # one bitmask per row from min_dy to max_dy, bit i set if the cell at dx = min_dx + i is filled
+    row_masks: Tuple[int, ...]
+    # for every column from min_dx to max_dx, the largest dy filled in that column
+    column_bottoms: Tuple[int, ...]
+
+    def fits(self, rows: List[int], width: int, height: int, x: int, y: int) -> bool:
+        """
+        Check whether the shape anchored at (x, y) is in bounds and does not overlap occupied cells
+
+        :param rows: occupancy bitboard, one bitmask per row
+        :param width: width of the board
+        :param height: height of the board
+        :param x: anchor x coord
+        :param y: anchor y coord
+        :return: fits flag
+        """
+
+        left = x + self.min_dx
+        top = y + self.min_dy
+        if left < 0 or x + self.max_dx >= width or top < 0 or y + self.max_dy >= height:
+            return False
+
+        for row_idx, mask in enumerate(self.row_masks, top):
+            if rows[row_idx] & (mask << left):
+                return False
+
+        return True
+
+
+def build_shape(cells: Sequence[Tuple[int, int]]) -> Shape:
+    """
+    Build the shape table entry for a set of cell offsets
+
+    :param cells: (dx, dy) offsets from the anchor
+    :return: shape
+    """
+
+    cells = tuple((dx, dy) for dx, dy in cells)
+    min_dx = min(dx for dx, _ in cells)
+    max_dx = max(dx for dx, _ in cells)
+    min_dy = min(dy for _, dy in cells)
+    max_dy = max(dy for _, dy in cells)
+
+    row_masks = [0] * (max_dy - min_dy + 1)
+    column_bottoms = [min_dy - 1] * (max_dx - min_dx + 1)
+    for dx, dy in cells:
+        row_masks[dy - min_dy] |= 1 << (dx - min_dx)
+        column_bottoms[dx - min_dx] = max(column_bottoms[dx - min_dx], dy)
+
+    return Shape(
+        cells=cells,
+        min_dx=min_dx,
+        max_dx=max_dx,
+        min_dy=min_dy,
+        max_dy=max_dy,
+        row_masks=tuple(row_masks),
+        column_bottoms=tuple(column_bottoms),
+    )
+
+
+def build_orientations(
+        spawn_offsets: Sequence[Tuple[int, int]],
+        rotation_deltas: Sequence[Sequence[Tuple[int, int]]],
+    ) -> Tuple[Shape, ...]:
+    """
+    Build the shapes of the four orientations of a block by applying its rotation deltas to its spawn offsets
+
+    :param spawn_offsets: (dx, dy) offsets of the cells from the anchor at spawn
+    :param rotation_deltas: for each rotation state, translation deltas for each cell when rotating by 90 degrees
+    :return: shapes indexed by rotation state
+    """
+
+    assert len(rotation_deltas) == 4, "Expected rotation deltas for each of the four rotation states"
+
+    orientations = []
+    cells = list(spawn_offsets)
+    for deltas in rotation_deltas:
+        assert len(deltas) == len(cells)
+        orientations.append(build_shape(cells))
+        cells = [(dx + ddx, dy + ddy) for (dx, dy), (ddx, ddy) in zip(cells, deltas)]
+
+    assert cells == list(spawn_offsets), "Rotating four times must return a block to its spawn offsets"
+
+    return tuple(orientations)
@@ -1,248 +1,208 @@
 from element.block import Block
-from typing import List, Tuple
+
+
+# Spawn offsets are relative to the anchor at the top center of the grid (x = width // 2, y = 0).
+# Rotation deltas are indexed by rotation state and translate each cell when rotating by 90 degrees.
 
 
 class LBlock(Block):
-    def get_init_point_locations(self) -> List[Tuple[int, int]]:
-        half_width = self._grid.width // 2
-
-        return [
-            (half_width - 2, 0),
-            (half_width - 2, 1),
-            (half_width - 1, 1),
-            (half_width, 1),
-        ]
-
-    def get_rotation_deltas(self) -> List[Tuple[int, int]]:
-        if self._rotation_state == 0:
-            return [
-                (2, 0),
-                (1, -1),
-                (0, 0),
-                (-1, 1),
-            ]
-        elif self._rotation_state == 1:
-            return [
-                (0, 2),
-                (1, 1),
-                (0, 0),
-                (-1, -1),
-            ]
-        elif self._rotation_state == 2:
-            return [
-                (-2, 0),
-                (-1, 1),
-                (0, 0),
-                (1, -1)
-            ]
-        elif self._rotation_state == 3:
-            return [
-                (0, -2),
-                (-1, -1),
-                (0, 0),
-                (1, 1),
-            ]
-
-    def get_color(self) -> str:
-        return "#0000FF"
+    COLOR = "#0000FF"
+    SPAWN_OFFSETS = (
+        (-2, 0),
+        (-2, 1),
+        (-1, 1),
+        (0, 1),
+    )
+    ROTATION_DELTAS = (
+        (
+            (2, 0),
+            (1, -1),
+            (0, 0),
+            (-1, 1),
+        ),
+        (
+            (0, 2),
+            (1, 1),
+            (0, 0),
+            (-1, -1),
+        ),
+        (
+            (-2, 0),
+            (-1, 1),
+            (0, 0),
+            (1, -1),
+        ),
+        (
+            (0, -2),
+            (-1, -1),
+            (0, 0),
+            (1, 1),
+        ),
+    )
 
 
 class LineBlock(Block):
-    def get_init_point_locations(self) -> List[Tuple[int, int]]:
-        half_width = self._grid.width // 2
-
-        return [
-            (half_width - 2, 1),
-            (half_width - 1, 1),
-            (half_width, 1),
-            (half_width + 1, 1),
-        ]
-
-    def get_rotation_deltas(self) -> List[Tuple[int, int]]:
-        if self._rotation_state == 0 or self._rotation_state == 2:
-            return [
-                (2, -2),
-                (1, -1),
-                (0, 0),
-                (-1, 1),
-            ]
-        else:
-            return [
-                (-2, 2),
-                (-1, 1),
-                (0, 0),
-                (1, -1),
-            ]
-
-    def get_color(self) -> str:
-        return "#00FFFF"
+    COLOR = "#00FFFF"
+    SPAWN_OFFSETS = (
+        (-2, 1),
+        (-1, 1),
+        (0, 1),
+        (1, 1),
+    )
+    ROTATION_DELTAS = (
+        (
+            (2, -2),
+            (1, -1),
+            (0, 0),
+            (-1, 1),
+        ),
+        (
+            (-2, 2),
+            (-1, 1),
+            (0, 0),
+            (1, -1),
+        ),
+    ) * 2
 
 
 class RBlock(Block):
-    def get_init_point_locations(self) -> List[Tuple[int, int]]:
-        half_width = self._grid.width // 2
-
-        return [
-            (half_width - 2, 1),
-            (half_width - 1, 1),
-            (half_width, 1),
-            (half_width, 0),
-        ]
-
-    def get_rotation_deltas(self) -> List[Tuple[int, int]]:
-        if self._rotation_state == 0:
-            return [
-                (1, -1),
-                (0, 0),
-                (-1, 1),
-                (0, 2),
-            ]
-        elif self._rotation_state == 1:
-            return [
-                (1, 1),
-                (0, 0),
-                (-1, -1),
-                (-2, 0),
-            ]
-        elif self._rotation_state == 2:
-            return [
-                (-1, 1),
-                (0, 0),
-                (1, -1),
-                (0, -2),
-            ]
-        elif self._rotation_state == 3:
-            return [
-                (-1, -1),
-                (0, 0),
-                (1, 1),
-                (2, 0),
-            ]
-
-    def get_color(self) -> str:
-        return "#FF7F00"
+    COLOR = "#FF7F00"
+    SPAWN_OFFSETS = (
+        (-2, 1),
+        (-1, 1),
+        (0, 1),
+        (0, 0),
+    )
+    ROTATION_DELTAS = (
+        (
+            (1, -1),
+            (0, 0),
+            (-1, 1),
+            (0, 2),
+        ),
+        (
+            (1, 1),
+            (0, 0),
+            (-1, -1),
+            (-2, 0),
+        ),
+        (
+            (-1, 1),
+            (0, 0),
+            (1, -1),
+            (0, -2),
+        ),
+        (
+            (-1, -1),
+            (0, 0),
+            (1, 1),
+            (2, 0),
+        ),
+    )
 
 
 class SBlock(Block):
-    def get_init_point_locations(self) -> List[Tuple[int, int]]:
-        half_width = self._grid.width // 2
-
-        return [
-            (half_width - 2, 1),
-            (half_width - 1, 1),
-            (half_width - 1, 0),
-            (half_width, 0),
-        ]
-
-    def get_rotation_deltas(self) -> List[Tuple[int, int]]:
-        if self._rotation_state == 0 or self._rotation_state == 2:
-            return [
-                (1, -2),
-                (0, -1),
-                (1, 0),
-                (0, 1),
-            ]
-        else:
-            return [
-                (-1, 2),
-                (0, 1),
-                (-1, 0),
-                (0, -1),
-            ]
-
-    def get_color(self) -> str:
-        return "#00FF00"
+    COLOR = "#00FF00"
+    SPAWN_OFFSETS = (
+        (-2, 1),
+        (-1, 1),
+        (-1, 0),
+        (0, 0),
+    )
+    ROTATION_DELTAS = (
+        (
+            (1, -2),
+            (0, -1),
+            (1, 0),
+            (0, 1),
+        ),
+        (
+            (-1, 2),
+            (0, 1),
+            (-1, 0),
+            (0, -1),
+        ),
+    ) * 2
 
 
 class SquareBlock(Block):
-    def get_init_point_locations(self) -> List[Tuple[int, int]]:
-        half_width = self._grid.width // 2
-
-        return [
-            (half_width - 1, 0),
-            (half_width, 0),
-            (half_width - 1, 1),
-            (half_width, 1),
-        ]
-
-    def get_rotation_deltas(self) -> List[Tuple[int, int]]:
-        return [(0, 0)] * 4
-
-    def get_color(self) -> str:
-        return "#FFFF00"
+    COLOR = "#FFFF00"
+    SPAWN_OFFSETS = (
+        (-1, 0),
+        (0, 0),
+        (-1, 1),
+        (0, 1),
+    )
+    ROTATION_DELTAS = (((0, 0),) * 4,) * 4
 
 
 class TBlock(Block):
-    def get_init_point_locations(self) -> List[Tuple[int, int]]:
-        half_width = self._grid.width // 2
-
-        return [
-            (half_width - 2, 1),
-            (half_width - 1, 1),
-            (half_width - 1, 0),
-            (half_width, 1),
-        ]
-
-    def get_rotation_deltas(self) -> List[Tuple[int, int]]:
-        if self._rotation_state == 0:
-            return [
-                (1, -1),
-                (0, 0),
-                (1, 1),
-                (-1, 1),
-            ]
-        elif self._rotation_state == 1:
-            return [
-                (1, 1),
-                (0, 0),
-                (-1, 1),
-                (-1, -1),
-            ]
-        elif self._rotation_state == 2:
-            return [
-                (-1, 1),
-                (0, 0),
-                (-1, -1),
-                (1, -1),
-            ]
-        elif self._rotation_state == 3:
-            return [
-                (-1, -1),
-                (0, 0),
-                (1, -1),
-                (1, 1),
-            ]
-
-    def get_color(self) -> str:
-        return "#800080"
+    COLOR = "#800080"
+    SPAWN_OFFSETS = (
+        (-2, 1),
+        (-1, 1),
+        (-1, 0),
+        (0, 1),
+    )
+    ROTATION_DELTAS = (
+        (
+            (1, -1),
+            (0, 0),
+            (1, 1),
+            (-1, 1),
+        ),
+        (
+            (1, 1),
+            (0, 0),
+            (-1, 1),
+            (-1, -1),
+        ),
+        (
+            (-1, 1),
+            (0, 0),
+            (-1, -1),
+            (1, -1),
+        ),
+        (
+            (-1, -1),
+            (0, 0),
+            (1, -1),
+            (1, 1),
+        ),
+    )
 
 
 class TwoBlock(Block):
-    def get_init_point_locations(self) -> List[Tuple[int, int]]:
-        half_width = self._grid.width // 2
-
-        return [
-            (half_width - 2, 0),
-            (half_width - 1, 0),
-            (half_width - 1, 1),
-            (half_width, 1),
-        ]
-
-    def get_rotation_deltas(self) -> List[Tuple[int, int]]:
-        if self._rotation_state == 0 or self._rotation_state == 2:
-            return [
-                (2, -1),
-                (1, 0),
-                (0, -1),
-                (-1, 0),
-            ]
-        else:
-            return [
-                (-2, 1),
-                (-1, 0),
-                (0, 1),
-                (1, 0),
-            ]
-
-    def get_color(self) -> str:
-        return "#FF0000"
+    COLOR = "#FF0000"
+    SPAWN_OFFSETS = (
+        (-2, 0),
+        (-1, 0),
+        (-1, 1),
+        (0, 1),
+    )
+    ROTATION_DELTAS = (
+        (
+            (2, -1),
+            (1, 0),
+            (0, -1),
+            (-1, 0),
+        ),
+        (
+            (-2, 1),
+            (-1, 0),
+            (0, 1),
+            (1, 0),
+        ),
+    ) * 2
+
+
+# all block types, in the order blocks are drawn from when spawning
+BLOCK_TYPES = [
+    SquareBlock,
+    LBlock,
+    LineBlock,
+    RBlock,
+    SBlock,
+    TBlock,
+    TwoBlock,
+]
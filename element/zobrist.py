@@ -0,0 +1,67 @@
+import random
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+# fixed seed so hashes are stable across processes and runs
+ZOBRIST_SEED = 0x7E7215
+
+
+@lru_cache(maxsize=None)
+def get_zobrist_table(height: int, width: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Get the random 64-bit key of every cell. The hash of a board is the XOR of the keys of its occupied cells.
+
+    :param height: height of the board
+    :param width: width of the board
+    :return: keys indexed by [y][x]
+    """
+
+    rng = random.Random(ZOBRIST_SEED)
+
+    return tuple(tuple(rng.getrandbits(64) for _ in range(width)) for _ in range(height))
+
+
+@lru_cache(maxsize=None)
+def _get_zobrist_array(height: int, width: int) -> np.ndarray:
+    """
+    :return: (H, W) uint64 array of the keys from get_zobrist_table
+    """
+
+    return np.array(get_zobrist_table(height, width), dtype=np.uint64)
+
+
+def hash_rows(rows: Sequence[int], width: int) -> int:
+    """
+    Compute the hash of an occupancy bitboard from scratch
+
+    :param rows: one bitmask per row where bit x is set if (x, y) is occupied
+    :param width: width of the board
+    :return: 64-bit hash
+    """
+
+    table = get_zobrist_table(len(rows), width)
+    board_hash = 0
+    for keys, row in zip(table, rows):
+        while row:
+            lowest = row & -row
+            board_hash ^= keys[lowest.bit_length() - 1]
+            row ^= lowest
+
+    return board_hash
+
+
+def hash_observations(observations: np.ndarray) -> np.ndarray:
+    """
+    Compute the hashes of a stack of boards, matching hash_rows and Grid.get_hash
+
+    :param observations: (..., H, W) bool boards
+    :return: (...) uint64 hashes
+    """
+
+    table = _get_zobrist_array(*observations.shape[-2:])
+    keys = np.where(observations, table, np.uint64(0))
+
+    return np.bitwise_xor.reduce(keys.reshape(observations.shape[:-2] + (-1,)), axis=-1)
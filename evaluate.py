@@ -0,0 +1,317 @@
+import argparse
+import math
+import multiprocessing
+import os
+import sys
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agent.repository import AgentType, supports_action_space
+from game.action import ActionSpace
+from game.results import RESULT_COLUMNS, write_npz_results
+from launch import DEFAULT_SIMULATION_DELTA_T, run_simulation
+
+
+# Default tournament parameters
+DEFAULT_NUM_GAMES = 100
+# as long as the games of the human benchmark
+DEFAULT_DURATION = 100
+DEFAULT_SEED = 0
+DEFAULT_NUM_WORKERS = os.cpu_count() or 1
+
+# quantiles of the scores reported per agent
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+# constructor arguments that make each agent's decisions independent of machine load, so that a leaderboard is
+# reproducible - a wall clock time budget would search less deeply when the workers compete for cores
+AGENT_KWARGS: Dict[AgentType, Dict[str, Any]] = {
+    AgentType.BEAM_SEARCH: {"time_budget": None},
+}
+# two-sided normal quantile for the 95% confidence interval of paired score differences
+Z_95 = 1.959963984540054
+
+
+class Entrant(NamedTuple):
+    """
+    An agent taking part in a tournament
+    """
+
+    agent_type: AgentType
+    action_space: ActionSpace
+
+    @property
+    def name(self) -> str:
+        if self.action_space == ActionSpace.KEYSTROKE:
+            return self.agent_type.name
+
+        return f"{self.agent_type.name}:{self.action_space.name}"
+
+
+class Comparison(NamedTuple):
+    """
+    Paired comparison of two entrants over games played on the same seeds
+    """
+
+    # mean score difference (first minus second) and its 95% confidence interval
+    mean_diff: float
+    ci_low: float
+    ci_high: float
+    # number of games the first entrant scored more, the same and less in
+    wins: int
+    ties: int
+    losses: int
+    # two-sided sign test p-value of the first entrant scoring more as often as less
+    p_value: float
+
+
+def get_entrants(agent_types: Sequence[AgentType], action_spaces: Sequence[ActionSpace]) -> List[Entrant]:
+    """
+    Get every combination of agent type and action space the agent type supports
+
+    :param agent_types: agent types to enter
+    :param action_spaces: action spaces to enter each agent type in
+    :return: entrants
+    """
+
+    return [
+        Entrant(agent_type, action_space)
+        for agent_type in agent_types
+        for action_space in action_spaces
+        if supports_action_space(agent_type, action_space)
+    ]
+
+
+def _run_game(args: Tuple[int, int, Entrant, float, float, int]) -> Tuple[int, int, Dict[str, Any]]:
+    """
+    Play one tournament game - module level so that it can be shipped to worker processes
+
+    :param args: entrant index, game index, entrant, duration, simulation delta t and seed
+    :return: entrant index, game index and the game's result record
+    """
+
+    entrant_idx, game_idx, entrant, duration, simulation_delta_t, seed = args
+    _, record = run_simulation(
+        id=entrant.name,
+        duration=duration,
+        agent_type=entrant.agent_type,
+        simulation_delta_t=simulation_delta_t,
+        headless=True,
+        seed=seed,
+        action_space=entrant.action_space,
+        agent_kwargs=AGENT_KWARGS.get(entrant.agent_type),
+    )
+
+    return entrant_idx, game_idx, record
+
+
+def run_tournament(
+        entrants: Sequence[Entrant],
+        num_games: int = DEFAULT_NUM_GAMES,
+        duration: float = DEFAULT_DURATION,
+        simulation_delta_t: float = DEFAULT_SIMULATION_DELTA_T,
+        seed: int = DEFAULT_SEED,
+        num_workers: int = DEFAULT_NUM_WORKERS,
+    ) -> List[List[Dict[str, Any]]]:
+    """
+    Play num_games headless games per entrant. Game i of every entrant is seeded with seed + i, so all entrants
+    face the same block sequences and their scores can be compared game by game.
+
+    :param entrants: entrants to play
+    :param num_games: number of games per entrant
+    :param duration: duration of each game in game seconds
+    :param simulation_delta_t: game seconds between agent actions
+    :param seed: seed of the first game
+    :param num_workers: number of worker processes to play the games on
+    :return: result records of each entrant's games, in game order
+    """
+
+    tasks = [
+        (entrant_idx, game_idx, entrant, duration, simulation_delta_t, seed + game_idx)
+        for game_idx in range(num_games)
+        for entrant_idx, entrant in enumerate(entrants)
+    ]
+    records = [[None] * num_games for _ in entrants]
+
+    if num_workers == 1:
+        results = map(_run_game, tasks)
+        for entrant_idx, game_idx, record in results:
+            records[entrant_idx][game_idx] = record
+    else:
+        with multiprocessing.Pool(processes=num_workers) as pool:
+            # games take very different times per agent, so hand them out one at a time
+            for entrant_idx, game_idx, record in pool.imap_unordered(_run_game, tasks, chunksize=1):
+                records[entrant_idx][game_idx] = record
+
+    return records
+
+
+def summarize(scores: np.ndarray) -> Dict[str, float]:
+    """
+    :param scores: scores of an entrant's games
+    :return: mean, standard deviation, min, QUANTILES (keyed p10, p25, ...) and max of the scores
+    """
+
+    summary = {
+        "mean": float(np.mean(scores)),
+        "std": float(np.std(scores, ddof=1)) if len(scores) > 1 else 0.0,
+        "min": float(np.min(scores)),
+    }
+    for quantile, value in zip(QUANTILES, np.quantile(scores, QUANTILES)):
+        summary[f"p{round(100 * quantile)}"] = float(value)
+    summary["max"] = float(np.max(scores))
+
+    return summary
+
+
+def sign_test(wins: int, losses: int) -> float:
+    """
+    Exact two-sided sign test, ignoring ties
+
+    :param wins: number of positive differences
+    :param losses: number of negative differences
+    :return: probability of a split at least this uneven if both signs were equally likely
+    """
+
+    num_trials = wins + losses
+    if num_trials == 0:
+        return 1.0
+
+    tail = sum(math.comb(num_trials, k) for k in range(min(wins, losses) + 1))
+
+    return min(1.0, 2 * tail / 2 ** num_trials)
+
+
+def compare(scores: np.ndarray, other_scores: np.ndarray) -> Comparison:
+    """
+    Compare the scores of two entrants on the same seeds
+
+    :param scores: scores of the first entrant, in game order
+    :param other_scores: scores of the second entrant, in game order
+    :return: comparison of the first entrant against the second
+    """
+
+    diffs = np.asarray(scores, dtype=np.float64) - np.asarray(other_scores, dtype=np.float64)
+    mean_diff = float(np.mean(diffs))
+    half_width = Z_95 * float(np.std(diffs, ddof=1)) / math.sqrt(len(diffs)) if len(diffs) > 1 else math.inf
+    wins = int((diffs > 0).sum())
+    losses = int((diffs < 0).sum())
+
+    return Comparison(
+        mean_diff=mean_diff,
+        ci_low=mean_diff - half_width,
+        ci_high=mean_diff + half_width,
+        wins=wins,
+        ties=len(diffs) - wins - losses,
+        losses=losses,
+        p_value=sign_test(wins, losses),
+    )
+
+
+def read_scores(results_fpath: str) -> np.ndarray:
+    """
+    Read the scores of a legacy results file (e.g. data/results_human_benchmark.csv)
+
+    :param results_fpath: path of the results file
+    :return: score of every row
+    """
+
+    with open(results_fpath) as f:
+        return np.array([int(line.split(",")[0]) for line in f if line.strip()], dtype=np.int64)
+
+
+def format_report(scores_by_name: Dict[str, np.ndarray], reference_scores_by_name: Dict[str, np.ndarray]) -> str:
+    """
+    Format a leaderboard, best mean score first, followed by the paired comparisons of every two entrants
+
+    :param scores_by_name: scores of each entrant, in game order
+    :param reference_scores_by_name: scores of unpaired references (e.g. humans), only summarized
+    :return: report
+    """
+
+    names = sorted(scores_by_name, key=lambda name: -np.mean(scores_by_name[name]))
+    all_scores = {**scores_by_name, **reference_scores_by_name}
+    name_width = max(len(name) for name in all_scores) + 1
+    columns = list(summarize(np.zeros(1)))
+
+    lines = [f"{'agent':<{name_width}}{'games':>7}" + "".join(f"{column:>9}" for column in columns)]
+    for name in names + sorted(reference_scores_by_name):
+        summary = summarize(all_scores[name])
+        marker = "" if name in scores_by_name else " (reference)"
+        lines.append(
+            f"{name:<{name_width}}{len(all_scores[name]):>7}"
+            + "".join(f"{summary[column]:>9.1f}" for column in columns)
+            + marker
+        )
+
+    if len(names) > 1:
+        lines.append("")
+        lines.append("paired comparisons (same seeds): mean difference [95% CI], wins-ties-losses, sign test p")
+        for idx, name in enumerate(names):
+            for other_name in names[idx + 1:]:
+                comparison = compare(scores_by_name[name], scores_by_name[other_name])
+                lines.append(
+                    f"{name} vs {other_name}: {comparison.mean_diff:+.1f} "
+                    f"[{comparison.ci_low:+.1f}, {comparison.ci_high:+.1f}], "
+                    f"{comparison.wins}-{comparison.ties}-{comparison.losses}, p={comparison.p_value:.3g}"
+                )
+
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Play every agent on the same seeded games and compare their scores")
+    parser.add_argument("--agent_types", type=str, nargs="+", help="agents to enter (default: all)", choices=[agent_type.name for agent_type in AgentType], default=[agent_type.name for agent_type in AgentType])
+    parser.add_argument("--action_spaces", type=str, nargs="+", help="action spaces to enter each agent in, skipping those an agent does not support", choices=[action_space.name for action_space in ActionSpace], default=[ActionSpace.KEYSTROKE.name])
+    parser.add_argument("--num_games", type=int, help="number of games per agent", default=DEFAULT_NUM_GAMES)
+    parser.add_argument("--duration", type=float, help="duration of each game in game seconds", default=DEFAULT_DURATION)
+    parser.add_argument("--simulation_delta_t", type=float, help="game seconds between agent actions", default=DEFAULT_SIMULATION_DELTA_T)
+    parser.add_argument("--seed", type=int, help="seed of the first game; game i is seeded with seed + i for every agent", default=DEFAULT_SEED)
+    parser.add_argument("--workers", type=int, help="number of worker processes to play the games on", default=DEFAULT_NUM_WORKERS)
+    parser.add_argument("--reference", type=str, nargs="+", help="legacy results files to summarize alongside the agents as NAME=PATH, e.g. human=data/results_human_benchmark.csv", default=[])
+    parser.add_argument("--output", type=str, help="path to write the result record of every game to as a NumPy archive (see game.results)", required=False)
+    args = parser.parse_args(argv)
+
+    if args.num_games < 1:
+        parser.error("--num_games must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    references = {}
+    for reference in args.reference:
+        name, sep, fpath = reference.partition("=")
+        if not sep:
+            parser.error(f"--reference should be NAME=PATH: {reference}")
+        references[name] = read_scores(fpath)
+
+    entrants = get_entrants(
+        [AgentType[agent_type] for agent_type in args.agent_types],
+        [ActionSpace[action_space] for action_space in args.action_spaces],
+    )
+    if not entrants:
+        parser.error("None of the agents support the given action spaces")
+
+    records = run_tournament(
+        entrants,
+        num_games=args.num_games,
+        duration=args.duration,
+        simulation_delta_t=args.simulation_delta_t,
+        seed=args.seed,
+        num_workers=min(args.workers, len(entrants) * args.num_games),
+    )
+
+    if args.output is not None:
+        write_npz_results(args.output, {
+            name: [record[name] for entrant_records in records for record in entrant_records]
+            for name, _ in RESULT_COLUMNS
+        })
+
+    scores_by_name = {
+        entrant.name: np.array([record["score"] for record in entrant_records])
+        for entrant, entrant_records in zip(entrants, records)
+    }
+    print(format_report(scores_by_name, references))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
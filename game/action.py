@@ -1,6 +1,10 @@
 from enum import Enum
 
 
+# action code for taking no action (action codes start at 1)
+NO_ACTION = 0
+
+
 class Action(Enum):
     ROTATE = 1
     MOVE_DOWN = 2
@@ -12,3 +16,14 @@ class Action(Enum):
     @property
     def binding(self):
         return f"<<{self.name}>>"
+
+
+class ActionSpace(Enum):
+    """
+    What an agent decides on each time it is queried
+    """
+
+    # one Action per simulation_delta_t
+    KEYSTROKE = 0
+    # a target placement per block, reached with one Action per simulation_delta_t (see agent.macro_action_agent)
+    PLACEMENT = 1
@@ -0,0 +1,68 @@
+from typing import List, NamedTuple, Optional, Type
+
+import numpy as np
+
+from element.block import Block
+from element.placement import Placement, get_placements
+from game.game import Game
+from game.vector_game import clear_full_rows_batch
+
+
+class Afterstates(NamedTuple):
+    """
+    Every board that can result from dropping one block, stacked for batched evaluation
+    """
+
+    placements: List[Placement]
+    # (P, H, W) settled boards after locking each placement and clearing full rows
+    boards: np.ndarray
+    # (P,) number of rows cleared by each placement
+    num_rows_cleared: np.ndarray
+    # (P,) points gained by each placement, per Game.POINTS
+    points: np.ndarray
+
+
+def get_afterstates(
+        board: np.ndarray,
+        block_type: Type[Block],
+        rotation_state: int = 0,
+        x: Optional[int] = None,
+        y: Optional[int] = None,
+    ) -> Afterstates:
+    """
+    Get every resting board reachable by a block on a board of settled cells
+
+    :param board: (H, W) bool board of settled cells (the block must not be on it)
+    :param block_type: type of the block to drop
+    :param rotation_state: rotation state of the block
+    :param x: anchor x of the block, defaults to the spawn location
+    :param y: anchor y of the block, defaults to the spawn location
+    :return: afterstates, empty if the block does not fit at its location
+    """
+
+    height, width = board.shape
+    spawn_x, spawn_y = block_type.get_spawn_location(width)
+    rows = (board @ (1 << np.arange(width, dtype=np.int64))).tolist()
+    placements = get_placements(
+        rows=rows,
+        width=width,
+        height=height,
+        orientations=block_type.ORIENTATIONS,
+        rotation_state=rotation_state,
+        x=spawn_x if x is None else x,
+        y=spawn_y if y is None else y,
+    )
+
+    boards = np.repeat(board[None], len(placements), axis=0)
+    if placements:
+        # (P, 4, 2) absolute (x, y) cells of every placement
+        cells = np.array([placement.cells for placement in placements], dtype=np.int64)
+        boards[np.arange(len(placements))[:, None], cells[..., 1], cells[..., 0]] = True
+    num_rows_cleared = clear_full_rows_batch(boards)
+
+    return Afterstates(
+        placements=placements,
+        boards=boards,
+        num_rows_cleared=num_rows_cleared,
+        points=np.array(Game.POINTS)[num_rows_cleared],
+    )
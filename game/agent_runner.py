@@ -0,0 +1,172 @@
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from enum import Enum
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from agent.agent import Agent
+from game.action import Action
+from game.state import GameState
+
+
+class Fallback(Enum):
+    """
+    What to do when an agent misses its decision deadline
+    """
+
+    # take no action
+    NOOP = 0
+    # repeat the last action that was taken
+    REPEAT_LAST = 1
+    # take the agent's DEFAULT_ACTION (no action if it has none)
+    AGENT_DEFAULT = 2
+
+
+class DeadlineAgentRunner:
+    """
+    Holds an agent's decisions to a deadline so that a slow agent cannot stretch the action interval. On a miss
+    the fallback action is taken instead and the late decision is discarded. While the agent is still busy with a
+    late decision on the worker thread, later decisions miss immediately.
+
+    Without a clock, decisions run on a worker thread. get_action waits at most the deadline in wall clock time for
+    each; on the Tk thread, request a decision and poll for it instead, so that waiting never blocks rendering and
+    input. With a clock (a headless game's virtual clock), decisions run synchronously and the time they take is
+    measured on that clock, so results do not depend on machine load and nothing waits in real time.
+    """
+
+    def __init__(self, agent: Agent, deadline: float, fallback: Fallback, clock: Optional[Callable[[], float]] = None):
+        """
+        Initialize the runner
+
+        :param agent: agent to run
+        :param deadline: seconds each decision may take
+        :param fallback: what to do when the deadline is missed
+        :param clock: clock to measure decisions on synchronously, None to wait for them on a worker thread
+        """
+
+        self._agent = agent
+        self._deadline = deadline
+        self._fallback = fallback
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="agent") if clock is None else None
+        self._pending: Optional[Future] = None
+        # whether the pending decision was requested and has neither been polled nor missed yet
+        self._awaiting = False
+        self._last_action: Optional[Action] = None
+
+        self.num_decisions = 0
+        self.num_missed = 0
+
+    def get_action(self, observation: np.ndarray, state: Optional[GameState] = None) -> Optional[Action]:
+        """
+        Get the agent's action within the deadline
+
+        :param observation: observation - copied, since the worker reads it while the game moves on
+        :param state: game state
+        :return: action to take, None for no action
+        """
+
+        if self._clock is None:
+            if not self.request(observation, state):
+                return self.miss()
+            try:
+                self._pending.result(timeout=self._deadline)
+            except TimeoutError:
+                return self.miss()
+            return self.poll()[1]
+
+        self.num_decisions += 1
+        start = self._clock()
+        action = self._agent.get_action(observation, state)
+        if self._clock() - start > self._deadline:
+            self.num_missed += 1
+            return self._get_fallback_action()
+
+        return self._take(action)
+
+    def request(self, observation: np.ndarray, state: Optional[GameState] = None) -> bool:
+        """
+        Start a decision on the worker thread without waiting for it. Follow up with poll until it is done, or with
+        miss once its deadline has passed.
+
+        :param observation: observation - copied, since the worker reads it while the game moves on
+        :param state: game state
+        :return: whether the decision started - the worker may still be busy with a late decision, in which case
+            the decision is missed right away
+        """
+
+        assert self._executor is not None, "Only runners without a clock run decisions on a worker thread"
+        assert not self._awaiting, "The previous decision is still awaited"
+
+        self.num_decisions += 1
+        if self._pending is not None and not self._pending.done():
+            return False
+
+        self._pending = self._executor.submit(self._agent.get_action, observation.copy(), state)
+        self._awaiting = True
+
+        return True
+
+    def poll(self) -> Tuple[bool, Optional[Action]]:
+        """
+        Check on the requested decision without waiting
+
+        :return: whether it is done, and its action (None for no action)
+        """
+
+        assert self._awaiting, "No decision was requested"
+
+        if not self._pending.done():
+            return False, None
+
+        self._awaiting = False
+        action = self._pending.result()
+        self._pending = None
+
+        return True, self._take(action)
+
+    def miss(self) -> Optional[Action]:
+        """
+        Give up on the requested decision - it is discarded when it finishes, and the worker counts as busy until then
+
+        :return: fallback action to take in its place
+        """
+
+        self._awaiting = False
+        self.num_missed += 1
+
+        return self._get_fallback_action()
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker without waiting for a pending decision
+        """
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _take(self, action: Optional[Action]) -> Optional[Action]:
+        """
+        :param action: action of a decision made within the deadline
+        :return: the action, remembered for Fallback.REPEAT_LAST
+        """
+
+        if action is not None:
+            self._last_action = action
+
+        return action
+
+    def _get_fallback_action(self) -> Optional[Action]:
+        """
+        :return: action to take in place of a missed decision
+        """
+
+        match self._fallback:
+            case Fallback.NOOP:
+                return None
+            case Fallback.REPEAT_LAST:
+                return self._last_action
+            case Fallback.AGENT_DEFAULT:
+                return self._agent.DEFAULT_ACTION
+            case _:
+                raise ValueError(f"Unsupported fallback: {self._fallback}")
@@ -0,0 +1,41 @@
+import time
+
+
+class WallClock:
+    """
+    Clock backed by the system's monotonic clock, so it never jumps with wall clock adjustments.
+    """
+
+    def time(self) -> float:
+        """
+        :return: current time in seconds (only differences are meaningful)
+        """
+
+        return time.monotonic()
+
+
+class VirtualClock:
+    """
+    Deterministic logical clock used to drive headless games. Time only advances when told to, so a game
+    runs as fast as the CPU allows while events keep the same relative timing as in real time.
+    """
+
+    def __init__(self):
+        self._time = 0.0
+
+    def time(self) -> float:
+        """
+        :return: current logical time in seconds
+        """
+
+        return self._time
+
+    def advance_to(self, t: float) -> None:
+        """
+        Advance the clock to logical time t
+
+        :param t: time to advance to, must not be in the past
+        """
+
+        assert t >= self._time, f"Cannot move the clock backwards from {self._time} to {t}"
+        self._time = t
@@ -0,0 +1,94 @@
+import random
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from game.action import NO_ACTION, Action
+from game.game import Game
+from game.mode import Mode
+from game.state import GameState
+
+
+# default time between actions in game seconds, as in launch.py
+DEFAULT_SIMULATION_DELTA_T = 0.1
+
+
+class TetrisEnv:
+    """
+    Synchronous reset/step environment over a headless Game, for RL loops. No Tk root or display is involved.
+
+    Each step applies one action. Gravity is applied every MOVE_DOWN_TIME / simulation_delta_t steps, in the same
+    order as a headless game with an agent: a tick at the start, then that many actions, then the next tick.
+    """
+
+    def __init__(self, simulation_delta_t: float = DEFAULT_SIMULATION_DELTA_T, max_steps: Optional[int] = None):
+        """
+        Initialize the environment - call reset before stepping
+
+        :param simulation_delta_t: game seconds between actions, which sets how many steps a gravity tick takes
+        :param max_steps: number of steps after which episodes are cut off, if any
+        """
+
+        self.steps_per_gravity = max(round(Game.MOVE_DOWN_TIME / simulation_delta_t), 1)
+        self.max_steps = max_steps
+        self._game: Optional[Game] = None
+        self._num_steps = 0
+
+    def reset(self, seed: Optional[int] = None) -> np.ndarray:
+        """
+        Start a new episode
+
+        :param seed: seed for the block sequence (random if not provided)
+        :return: (H, W) bool observation
+        """
+
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self._game = Game(mode=Mode.SIMULATION, id="env", headless=True, seed=seed, record_results=False)
+        self._game.start()
+        self._num_steps = 0
+        self._game.apply_gravity()
+
+        return self._game.get_observation(copy=True)
+
+    def step(self, action: Union[Action, int]) -> Tuple[np.ndarray, int, bool, Dict[str, Any]]:
+        """
+        Apply an action, followed by a gravity tick if one is due
+
+        :param action: action to apply, as an Action or its value (NO_ACTION for none)
+        :return: (H, W) bool observation, points scored, whether the episode is over and info with the score, the
+            number of steps and whether the episode was cut off by max_steps
+        """
+
+        game = self._game
+        assert game is not None and not game.is_over, "Call reset before stepping"
+
+        score = game.score
+        if not isinstance(action, Action):
+            action = None if action == NO_ACTION else Action(action)
+        if action is not None:
+            game.apply_action(action)
+
+        self._num_steps += 1
+        if self._num_steps % self.steps_per_gravity == 0 and not game.is_over:
+            game.apply_gravity()
+
+        truncated = False
+        if self.max_steps is not None and self._num_steps >= self.max_steps and not game.is_over:
+            game.terminate()
+            truncated = True
+
+        info = {
+            "score": game.score,
+            "num_steps": self._num_steps,
+            "truncated": truncated,
+        }
+
+        return game.get_observation(copy=True), game.score - score, game.is_over, info
+
+    def get_state(self) -> GameState:
+        """
+        :return: structured state of the current episode, as handed to agents
+        """
+
+        return self._game.get_state()
@@ -1,24 +1,28 @@
 from agent.agent import Agent
+from agent.macro_action_agent import MacroActionAgent
 from gui.canvas import Canvas
+from gui.null_canvas import NullCanvas
+from gui.timed_canvas import TimedCanvas
 from element.grid import Grid
 from element.block import Block
-from element.tetris_blocks import (
-    SquareBlock,
-    LBlock,
-    LineBlock,
-    RBlock,
-    SBlock,
-    TBlock,
-    TwoBlock,
-)
-from typing import Callable, Optional
+from element.tetris_blocks import BLOCK_TYPES
+from typing import Any, Callable, Dict, Optional, Tuple
 from configs import config
 from game.mode import Mode
 from game.action import Action
-
+from game.agent_runner import DeadlineAgentRunner, Fallback
+from game.clock import VirtualClock, WallClock
+from game.instrumentation import SUMMARY_COLUMNS, Instrumentation, LatencyHistogram, Phase
+from game.replay import GRAVITY_CODE, Replay, ReplayRecorder, write_replay
+from game.results import ResultsWriter
+from game.scheduler import TkScheduler
+from game.state import GameState
+from game.trajectory import TrajectoryWriter
+
+import numpy as np
 import tkinter as tk
+import math
 import random
-import threading
 import time
 import os
 
@@ -31,25 +35,22 @@ class Game:
     GAME_TITLE = "Tetris"
 
     # instantiation functions for blocks
-    BLOCK_BUILDERS = [
-        lambda grid: SquareBlock(grid),
-        lambda grid: LBlock(grid),
-        lambda grid: LineBlock(grid),
-        lambda grid: RBlock(grid),
-        lambda grid: SBlock(grid),
-        lambda grid: TBlock(grid),
-        lambda grid: TwoBlock(grid),
-    ]
+    BLOCK_BUILDERS = BLOCK_TYPES
 
     # array of points gotten for number of rows cleared
     POINTS = [0, 1, 3, 5, 8]
 
     # seconds to move the active block down
     MOVE_DOWN_TIME = 1
-
-    # event name for periodic events
-    PERIODIC_EVENT = "<<periodic>>"
-    END_EVENT = "<<end>>"
+    # seconds between checks on an agent decision running on the worker thread in the GUI
+    AGENT_POLL_TIME = 0.005
+
+    # scheduler task names
+    GRAVITY_TASK = "gravity"
+    AGENT_TASK = "agent"
+    AGENT_POLL_TASK = "agent_poll"
+    END_TASK = "end"
+    REPLAY_TASK = "replay"
     # binding names for arrow keys during human gameplay
     UP_EVENT = "<Up>"
     DOWN_EVENT = "<Down>"
@@ -62,6 +63,9 @@ class Game:
     OUT_DIR = "out/"
     KEYSTROKE_DELTA_FPATH = os.path.join(OUT_DIR, "keystroke_delta_{0}.csv")
     RESULTS_PATH = os.path.join(OUT_DIR, "results_{0}.csv")
+    NPZ_RESULTS_PATH = os.path.join(OUT_DIR, "results_{0}.npz")
+    TRAJECTORY_DIR = os.path.join(OUT_DIR, "trajectories", "{0}")
+    REPLAY_PATH = os.path.join(OUT_DIR, "replays", "{0}", "{1}.replay")
 
 
     def __init__(self, 
@@ -70,50 +74,129 @@ class Game:
                  duration: Optional[float] = None,
                  agent: Optional[Agent] = None, 
                  simulation_delta_t: Optional[float] = None,
-                 log_keystroke_delta: bool = False):
+                 log_keystroke_delta: bool = False,
+                 headless: bool = False,
+                 seed: Optional[int] = None,
+                 record_results: bool = True,
+                 instrument: bool = False,
+                 agent_fallback: Optional[Fallback] = None,
+                 record_replay: bool = False,
+                 replay: Optional[Replay] = None,
+                 replay_speed: float = 1.0,
+                 results_writer: Optional[ResultsWriter] = None,
+                 trajectory_writer: Optional[TrajectoryWriter] = None):
         """
         Initialize the game
 
         :param mode: mode to launch tetris
         :param id: id for the game used in outputting metrics
         :param duration: optional time period to run the game for (applicable to both modes)
+        :param seed: optional seed for the block sequence
+        :param record_results: whether to append the game result to the results file when the game ends
+        :param results_writer: writer to hand the result to when record_results is set, instead of appending it to
+            the results file right away
+        :param instrument: record per-phase latency histograms, reporting their percentiles in the result record
+        :param record_replay: write a replay of the game to REPLAY_PATH when the game ends
+        :param log_keystroke_delta: log the time between keystrokes (the player's key presses or the agent's actions)
+            to KEYSTROKE_DELTA_FPATH when the game ends, appending to the deltas of earlier games
 
         SIMULATION MODE REQUIRED ARGUMENTS:
             :param agent: agent to play the game - only applicable in simulation mode and required in simulation mode
             :param simulation_delta_t: time period to wait between simulation actions
-
-        HUMAN MODE OPTIONAL ARGUMENTS:
-            :param log_keystroke_delta: whether to log the keystroke delta
-        """
-
-        # input validation for simulation mode
+            :param headless: run without a GUI against a virtual clock (as fast as possible)
+            :param agent_fallback: hold the agent to a deadline of simulation_delta_t per decision, taking this
+                fallback when the deadline is missed. The number of missed decisions is reported in the result
+                record. Headless games measure decisions on the virtual clock, on which they take no time. GUI
+                games run them on a worker thread and poll for them, so a slow agent does not block the Tk thread.
+            :param trajectory_writer: writer to record every decision of the agent to, with the points scored until
+                the next decision as its reward
+
+        REPLAY MODE ARGUMENTS:
+            :param replay: recorded game to re-execute - required in replay mode
+            :param headless: re-execute as fast as possible without a GUI
+            :param replay_speed: speed multiplier when rendering the replay in the GUI
+        """
+
+        # input validation for simulation mode - an agent is only required to run the game, since a headless game
+        # can also be stepped by the caller (see game.env.TetrisEnv)
         if mode == Mode.SIMULATION:
-            assert agent is not None, "Agent is required in simulation mode"
-            assert simulation_delta_t is not None, "Simulation delta time is required in simulation mode"
+            assert agent is not None or headless, "Agent is required in simulation mode"
+            assert simulation_delta_t is not None or agent is None, "Simulation delta time is required in simulation mode"
+        if mode == Mode.REPLAY:
+            assert replay is not None, "Replay is required in replay mode"
+        assert not headless or mode != Mode.HUMAN, "Headless is not supported in human mode"
 
         # Attribute variables
         self._mode = mode 
         self._id = id
         self._duration = duration
+        self._headless = headless
+        self._agent_fallback = agent_fallback
+        if seed is None and record_replay:
+            seed = random.randrange(2 ** 32)
+        self._seed = seed
+        self._random = random.Random(seed)
+        self._instrumentation = Instrumentation() if instrument else None
 
         # Simulation mode attributes
         self._agent = agent
         self._simulation_delta_t = simulation_delta_t
+        self._agent_runner = None
+        self._trajectory_writer = trajectory_writer
+        if agent_fallback is not None:
+            assert mode == Mode.SIMULATION, "Agent fallback is only supported in simulation mode"
+
+        # Replay attributes - a replayed game draws the recorded blocks instead of random ones
+        self._replay = replay
+        self._replay_speed = replay_speed
+        self._replay_block_types = iter(replay.block_types) if replay is not None else None
+        self._replay_recorder = ReplayRecorder(id, seed) if record_replay else None
 
         # Game grid attributes
-        self._root = tk.Tk()
-        self._root.title(self.GAME_TITLE)
-        self._canvas = Canvas(
-            root=self._root,
-            height=config.HEIGHT,
-            width=config.WIDTH,
-            cell_size=config.CELL_SIZE,
-            padding=config.PADDING,
-        )
+        if headless:
+            self._clock = VirtualClock()
+            self._root = None
+            self._scheduler = None
+            self._canvas = NullCanvas(height=config.HEIGHT, width=config.WIDTH)
+        else:
+            self._clock = WallClock()
+            self._root = tk.Tk()
+            self._root.title(self.GAME_TITLE)
+            self._canvas = Canvas(
+                root=self._root,
+                height=config.HEIGHT,
+                width=config.WIDTH,
+                cell_size=config.CELL_SIZE,
+                padding=config.PADDING,
+            )
+        if agent_fallback is not None:
+            # headless games measure decisions on their virtual clock, so that their results stay deterministic
+            self._agent_runner = DeadlineAgentRunner(
+                agent,
+                deadline=simulation_delta_t,
+                fallback=agent_fallback,
+                clock=self._clock.time if headless else None,
+            )
+        if self._instrumentation is not None:
+            self._canvas = TimedCanvas(self._canvas, self._instrumentation)
+        if not headless:
+            # gravity and agent actions run on the Tk thread
+            self._scheduler = TkScheduler(self._root, self._clock, self._instrumentation)
         self._grid = Grid(self._canvas)
 
         # Game state attributes
         self._score = 0
+        # number of times 1, 2, 3 and 4 rows were cleared at once, indexed by the number of rows
+        self._num_clears = [0] * len(self.POINTS)
+        self._num_pieces_placed = 0
+        # number of actions applied, and of times the agent was queried for one
+        self._num_keystrokes = 0
+        self._num_agent_steps = 0
+        # observation and request time of the decision awaited from the worker thread in the GUI, if any
+        self._awaited_observation = None
+        self._awaited_since = None
+        # whether a poll for an awaited decision is scheduled
+        self._agent_polling = False
         self._active = False
         # state variable to check if saved block is active (this can only occur once before a new block is spawned)
         self._saved_block_active = False
@@ -135,13 +218,29 @@ class Game:
             self._keystroke_delta_fpath = self.KEYSTROKE_DELTA_FPATH.format(self._id)
 
         # results attributes
-        self._results_fpath = self.RESULTS_PATH.format(self._id)
-
-        # key bindings
-        self._bind_keys()
-
-        # event bindings
-        self._bind_periodic_events()
+        self._results_fpath = self.RESULTS_PATH.format(self._id) if record_results else None
+        self._results_writer = results_writer
+        self._result = None
+        self._result_record = None
+
+        # handlers to apply each action to the active block
+        self._action_handlers = {
+            Action.ROTATE: self._rotate,
+            Action.MOVE_DOWN: self._move_down,
+            Action.MOVE_LEFT: self._move_left,
+            Action.MOVE_RIGHT: self._move_right,
+            Action.MOVE_TO_BOTTOM: self._move_to_bottom,
+            Action.SAVE_BLOCK: self._save_block,
+        }
+        if self._instrumentation is not None:
+            self._action_handlers = {
+                action: self._instrumentation.timed(Phase.MOVE, handler)
+                for action, handler in self._action_handlers.items()
+            }
+
+        if not headless and mode == Mode.HUMAN:
+            # key bindings
+            self._bind_keys()
     
     def run(self) -> bool:
         """
@@ -150,109 +249,384 @@ class Game:
         :return: bool indicating if the game should be relaunched (reset button invoked)
         """
 
+        assert self._mode != Mode.SIMULATION or self._agent is not None, "Agent is required to run a simulation"
+        self.start()
+
+        if self._headless:
+            if self._mode == Mode.REPLAY:
+                self._run_replay_headless()
+            else:
+                self._run_headless()
+            return self._reset_invoked
+
+        if self._mode == Mode.REPLAY:
+            self._schedule_replay_event(0)
+            self._root.mainloop()
+            return self._reset_invoked
+
+        # deadlines are absolute, matching the headless cadence: gravity at k * MOVE_DOWN_TIME and agent actions at
+        # k * simulation_delta_t after the start
+        self._scheduler.schedule_periodic(self.GRAVITY_TASK, self._start_time, self.MOVE_DOWN_TIME, self.apply_gravity)
+        if self._mode == Mode.SIMULATION:
+            self._scheduler.schedule_periodic(
+                self.AGENT_TASK, self._start_time, self._simulation_delta_t, self._agent_step)
+        if self._duration is not None:
+            self._scheduler.schedule_once(self.END_TASK, self._start_time + self._duration, self.terminate)
+
+        self._root.mainloop()
+        return self._reset_invoked
+    
+    def start(self) -> None:
+        """
+        Start the game without running it, for callers that apply gravity and actions themselves
+        """
+
         self._active = True
         self._active_block.activate()
  
         if self._last_keystroke_time is not None:
             # set last keystroke time to current time
-            self._last_keystroke_time = time.time()
+            self._last_keystroke_time = self._clock.time()
 
-        self._start_time = time.time()
+        self._start_time = self._clock.time()
 
-        # start thread to move down the active block periodically
-        self._periodic_thread = threading.Thread(target=self._periodic_move_down)
-        self._periodic_thread.daemon = True
-        self._periodic_thread.start()
+    @property
+    def score(self) -> int:
+        """
+        :return: current score
+        """
 
-        # start simulation thread
-        if self._mode == Mode.SIMULATION:
-            self._simulation_thread = threading.Thread(target=self._run_simulation)
-            self._simulation_thread.daemon = True
-            self._simulation_thread.start()
+        return self._score
+
+    @property
+    def is_over(self) -> bool:
+        """
+        :return: whether the game has ended
+        """
+
+        return self._result is not None
+
+    @property
+    def result(self) -> Optional[Tuple[float, ...]]:
+        """
+        :return: score and elapsed game time once the game has ended, None before that - the legacy results row.
+            Missed decisions, latency percentiles and the other metrics are in result_record.
+        """
+
+        return self._result
+
+    @property
+    def result_record(self) -> Optional[Dict[str, Any]]:
+        """
+        :return: typed result of the game keyed by game.results.RESULT_COLUMNS once the game has ended, None before
+        """
+
+        return self._result_record
+
+    @property
+    def tick_jitter(self) -> Dict[str, LatencyHistogram]:
+        """
+        :return: how late each scheduled task (gravity, agent, end) ran relative to its deadline, keyed by task
+            name - empty for headless games, which run on a virtual clock
+        """
+
+        return {} if self._scheduler is None else self._scheduler.jitter
+
+    @property
+    def instrumentation(self) -> Optional[Instrumentation]:
+        """
+        :return: latency histograms if the game is instrumented
+        """
+
+        return self._instrumentation
+
+    def get_observation(self, copy: bool = False) -> np.ndarray:
+        """
+        Get the occupancy of the board, including the active block
+
+        :param copy: return a copy rather than a read-only view that changes with the game
+        :return: (H, W) bool observation
+        """
+
+        return self._grid.get_observation(copy=copy)
+
+    def get_state(self) -> GameState:
+        """
+        Get the structured state of the game for agents
+
+        :return: game state
+        """
+
+        block = self._active_block
+        board = self._grid.get_observation(copy=True)
+        for dx, dy in block.shape.cells:
+            board[block.y + dy, block.x + dx] = False
+
+        return GameState(
+            board=board,
+            block_type=self.BLOCK_BUILDERS.index(type(block)),
+            rotation_state=block.rotation_state,
+            x=block.x,
+            y=block.y,
+            saved_block_type=self.BLOCK_BUILDERS.index(type(self._saved_block)) if self._saved_block is not None else None,
+            can_save=not self._saved_block_active,
+        )
+
+    @staticmethod
+    def write_result(results_fpath: str, result: Tuple[float, ...]) -> None:
+        """
+        Append a game result to a results file
+
+        :param results_fpath: path of the results file
+        :param result: score and elapsed game time
+        """
+
+        os.makedirs(os.path.dirname(results_fpath), exist_ok=True)
+        with open(results_fpath, "a") as f:
+            f.write(", ".join(str(value) for value in result) + "\n")
 
-        self._root.mainloop()
-        return self._reset_invoked
-    
     def terminate(self) -> None:
         """
         Terminate the game
         """
 
         self._end_game_state()
-        self._shutdown_gui()
+        if not self._headless:
+            self._shutdown_gui()
     
-    def _periodic_move_down(self) -> None:
-        while self._active:
-            self._root.event_generate(self.PERIODIC_EVENT, when="tail")
+    def apply_action(self, action: Action) -> None:
+        """
+        Apply an action to the active block, recording it for the replay
 
-            if self._duration is not None:
-                if time.time() - self._start_time >= self._duration:
-                    self._root.event_generate(self.END_EVENT, when="tail")
-            
-            time.sleep(self.MOVE_DOWN_TIME)
-    
-    def _run_simulation(self) -> None:
+        :param action: action to apply
+        """
+
+        if self._replay_recorder is not None and self._active:
+            self._replay_recorder.record_event(self._clock.time() - self._start_time, action.value)
+        if self._last_keystroke_time is not None:
+            self._record_keystroke_delta()
+        self._num_keystrokes += 1
+        self._action_handlers[action](None)
+
+    def apply_gravity(self) -> None:
+        """
+        Move the active block down one row
+        """
+
+        if self._replay_recorder is not None and self._active:
+            self._replay_recorder.record_event(self._clock.time() - self._start_time, GRAVITY_CODE)
+        if self._instrumentation is None:
+            self._move_down(None)
+        else:
+            self._instrumentation.time(Phase.MOVE, self._move_down, None)
+
+    def _agent_step(self) -> None:
+        """
+        Query the agent and apply its action
+        """
+
+        if self._agent_runner is not None and not self._headless:
+            self._request_agent_action()
+            return
+
+        observation = self._grid.get_observation()
+        self._apply_agent_action(observation, self._get_agent_action())
+
+    def _apply_agent_action(self, observation: np.ndarray, action: Optional[Action]) -> None:
         """
-        Run the simulation
+        Apply the action the agent decided on
+
+        :param observation: observation the agent decided on
+        :param action: action, None to take no action
+        """
+
+        self._num_agent_steps += 1
+        if self._trajectory_writer is not None:
+            self._trajectory_writer.record(observation, action, self._score)
+        if action is not None:
+            self.apply_action(action)
+
+    def _request_agent_action(self) -> None:
+        """
+        Start a decision on the agent runner's worker thread and poll for it, so that the Tk thread keeps rendering
+        and handling input while the agent decides. A decision still awaited at the next agent step has missed its
+        deadline of simulation_delta_t.
         """
 
-        t = time.time()
-        action = self._agent.get_action(self._grid.get_observation())
+        if self._awaited_observation is not None:
+            self._resolve_agent_action(self._agent_runner.miss())
+
+        start = time.perf_counter()
+        observation = self._grid.get_observation(copy=True)
+        state = self.get_state()
+        if self._instrumentation is not None:
+            self._instrumentation.record(Phase.OBSERVATION, time.perf_counter() - start)
+
+        if not self._agent_runner.request(observation, state):
+            # the worker is still busy with a late decision
+            self._apply_agent_action(observation, self._agent_runner.miss())
+            return
+
+        self._awaited_observation = observation
+        self._awaited_since = time.perf_counter()
+        if not self._agent_polling:
+            self._schedule_agent_poll()
+
+    def _schedule_agent_poll(self) -> None:
+        """
+        Check on the awaited decision after AGENT_POLL_TIME
+        """
+
+        self._agent_polling = True
+        self._scheduler.schedule_once(
+            self.AGENT_POLL_TASK, self._clock.time() + self.AGENT_POLL_TIME, self._poll_agent_action)
+
+    def _poll_agent_action(self) -> None:
+        """
+        Apply the awaited decision if it is done, and check again later otherwise
+        """
+
+        self._agent_polling = False
+        if self._awaited_observation is None:
+            # missed at an agent step that ran first
+            return
+
+        done, action = self._agent_runner.poll()
+        if done:
+            self._resolve_agent_action(action)
+        else:
+            self._schedule_agent_poll()
+
+    def _resolve_agent_action(self, action: Optional[Action]) -> None:
+        """
+        Apply the action that ends the awaited decision - the agent's, or the fallback on a miss
+
+        :param action: action, None to take no action
+        """
+
+        if self._instrumentation is not None:
+            self._instrumentation.record(Phase.AGENT, time.perf_counter() - self._awaited_since)
+        observation = self._awaited_observation
+        self._awaited_observation = None
+        self._awaited_since = None
+        self._apply_agent_action(observation, action)
+
+    def _run_headless(self) -> None:
+        """
+        Run the simulation on the virtual clock. Gravity ticks and agent actions are interleaved in logical time
+        at the same cadence as the GUI scheduler (MOVE_DOWN_TIME vs simulation_delta_t), without sleeping.
+        """
+
+        num_ticks = 0
+        num_actions = 0
         while self._active:
-            self._root.event_generate(action.binding, when="tail")
-            t = time.time()
-            action = self._agent.get_action(self._grid.get_observation())
-            # wait until the time period has elapsed since the last action was executed
-            time.sleep(max(self._simulation_delta_t - (time.time() - t), 0))
+            # use integer counters so that event times do not accumulate floating point drift
+            tick_time = num_ticks * self.MOVE_DOWN_TIME
+            action_time = num_actions * self._simulation_delta_t
+            if tick_time <= action_time:
+                self._clock.advance_to(tick_time)
+                self.apply_gravity()
+                num_ticks += 1
+
+                if self._duration is not None and self._active and tick_time >= self._duration:
+                    self.terminate()
+            else:
+                self._clock.advance_to(action_time)
+                self._agent_step()
+                num_actions += 1
+
+    def _apply_replay_event(self, code: int) -> None:
+        """
+        Apply a recorded gravity tick or action
+        """
+
+        if code == GRAVITY_CODE:
+            self.apply_gravity()
+        else:
+            self.apply_action(Action(code))
+
+    def _run_replay_headless(self) -> None:
+        """
+        Re-execute the replay on the virtual clock, without sleeping
+        """
+
+        for t, code in self._replay.events:
+            if not self._active:
+                break
+            self._clock.advance_to(t)
+            self._apply_replay_event(code)
+
+        if self._active:
+            self.terminate()
+
+    def _schedule_replay_event(self, event_idx: int) -> None:
+        """
+        Schedule the next recorded event in the GUI, ending the game after the last one
+        """
+
+        if event_idx == len(self._replay.events):
+            self._scheduler.schedule_once(self.END_TASK, self._clock.time(), self.terminate)
+            return
+
+        t, code = self._replay.events[event_idx]
+
+        def apply_event():
+            self._apply_replay_event(code)
+            if self._active:
+                self._schedule_replay_event(event_idx + 1)
+
+        self._scheduler.schedule_once(self.REPLAY_TASK, self._start_time + t / self._replay_speed, apply_event)
+
+    def _get_agent_action(self) -> Optional[Action]:
+        """
+        Query the agent for its next action
+
+        :return: action, None to take no action (a missed deadline)
+        """
+
+        agent = self._agent if self._agent_runner is None else self._agent_runner
+        if self._instrumentation is None:
+            return agent.get_action(self._grid.get_observation(), self.get_state())
+
+        start = time.perf_counter()
+        observation = self._grid.get_observation()
+        state = self.get_state()
+        decision_start = time.perf_counter()
+        action = agent.get_action(observation, state)
+        end = time.perf_counter()
+        self._instrumentation.record(Phase.OBSERVATION, decision_start - start)
+        self._instrumentation.record(Phase.AGENT, end - decision_start)
+
+        return action
 
     def _bind_keys(self) -> None:
         """
-        Helper method to bind keys
+        Helper method to bind keys - the player's key listeners in human mode
         """
 
-        if self._mode == Mode.HUMAN:
-            def wrap(fn: Callable):
-                if self._last_keystroke_time is None:
-                    return fn
-
-                def wrapped_fn(event: tk.Event):
-                    self._record_keystroke_delta()
-                    fn(event)
-            
-                return wrapped_fn
-
-            self._grid.bind_key_listener(self.UP_EVENT, wrap(self._rotate))
-            self._grid.bind_key_listener(self.DOWN_EVENT, wrap(self._move_down))
-            self._grid.bind_key_listener(self.LEFT_EVENT, wrap(self._move_left))
-            self._grid.bind_key_listener(self.RIGHT_EVENT, wrap(self._move_right))
-            self._grid.bind_key_listener(self.SPACE_EVENT, wrap(self._move_to_bottom))
-            self._grid.bind_key_listener(self.SHIFT_EVENT, wrap(self._save_block))
-        else:  # sim
-            self._root.bind(Action.ROTATE.binding, self._rotate)
-            self._root.bind(Action.MOVE_DOWN.binding, self._move_down)
-            self._root.bind(Action.MOVE_LEFT.binding, self._move_left)
-            self._root.bind(Action.MOVE_RIGHT.binding, self._move_right)
-            self._root.bind(Action.MOVE_TO_BOTTOM.binding, self._move_to_bottom)
-            self._root.bind(Action.SAVE_BLOCK.binding, self._save_block)
+        def wrap(action: Action):
+            def key_listener(event: tk.Event):
+                self.apply_action(action)
+        
+            return key_listener
+
+        self._grid.bind_key_listener(self.UP_EVENT, wrap(Action.ROTATE))
+        self._grid.bind_key_listener(self.DOWN_EVENT, wrap(Action.MOVE_DOWN))
+        self._grid.bind_key_listener(self.LEFT_EVENT, wrap(Action.MOVE_LEFT))
+        self._grid.bind_key_listener(self.RIGHT_EVENT, wrap(Action.MOVE_RIGHT))
+        self._grid.bind_key_listener(self.SPACE_EVENT, wrap(Action.MOVE_TO_BOTTOM))
+        self._grid.bind_key_listener(self.SHIFT_EVENT, wrap(Action.SAVE_BLOCK))
     
     def _record_keystroke_delta(self) -> None:
         """
         Record the keystroke delta
         """
 
-        curr_time = time.time()
+        curr_time = self._clock.time()
         delta = curr_time - self._last_keystroke_time
         self._keystroke_deltas.append(delta)
         self._last_keystroke_time = curr_time
 
-    def _bind_periodic_events(self) -> None:
-        """
-        Helper method to bind periodic events in the game
-        """
-
-        self._root.bind(self.PERIODIC_EVENT, self._move_down)
-        self._root.bind(self.END_EVENT, lambda _: self.terminate())
-
     def _rotate(self, event: tk.Event) -> None:
         """
         Rotate the active block
@@ -332,15 +706,22 @@ class Game:
             self._active_block = curr_saved_block
 
             # activate the block
-            self._active_block.activate()
+            if not self._active_block.activate() and self._active:
+                # no room to swap in the saved block - game is over
+                self._game_over()
     
     def _settle_block(self) -> None:
         """
         Settle the block after being placed
         """
 
-        num_rows_cleared = self._grid.clear_full_rows()
+        if self._instrumentation is None:
+            num_rows_cleared = self._grid.clear_full_rows()
+        else:
+            num_rows_cleared = self._instrumentation.time(Phase.CLEAR, self._grid.clear_full_rows)
         self._score += self.POINTS[num_rows_cleared]
+        self._num_clears[num_rows_cleared] += 1
+        self._num_pieces_placed += 1
 
         self._next_block_state()
 
@@ -359,15 +740,6 @@ class Game:
         if self._mode == Mode.HUMAN:
             self._end_game_state()
 
-            # dump keystroke deltas to file
-            if self._keystroke_deltas is not None:
-                # Create the output directory if it doesn't exist
-                os.makedirs(self.OUT_DIR, exist_ok=True)
-                
-                with open(self._keystroke_delta_fpath, "w") as f:
-                    for delta in self._keystroke_deltas:
-                        f.write(f"{delta}\n")
-
             def on_start_over_clicked():
                 self._reset_invoked = True
                 self._shutdown_gui()
@@ -384,15 +756,85 @@ class Game:
         """
 
         self._active = False
-        elapsed_game_time = time.time() - self._start_time
-        self._periodic_thread.join()
-        if self._mode == Mode.SIMULATION:
-            self._simulation_thread.join()
+        elapsed_game_time = self._clock.time() - self._start_time
+        if self._scheduler is not None:
+            # stops gravity and agent actions before the next tick, even when called from inside one
+            self._scheduler.cancel()
 
         # append score, elapsed time to metrics file
-        with open(self._results_fpath, "a") as f:
-            f.write(f"{self._score}, {elapsed_game_time}\n")
+        self._result = (self._score, elapsed_game_time)
+        if self._agent_runner is not None:
+            self._agent_runner.shutdown()
+        if self._trajectory_writer is not None:
+            self._trajectory_writer.end_game(self._score)
+        self._result_record = self._get_result_record(elapsed_game_time)
+        if self._results_fpath is not None:
+            if self._results_writer is not None:
+                self._results_writer.write(self._result, self._result_record)
+            else:
+                self.write_result(self._results_fpath, self._result)
+        if self._keystroke_deltas is not None:
+            # append the game's keystroke deltas in a single unbuffered write, so that the games of a session (and
+            # of parallel workers) all end up in the file without interleaving
+            os.makedirs(os.path.dirname(self._keystroke_delta_fpath) or ".", exist_ok=True)
+            with open(self._keystroke_delta_fpath, "ab", buffering=0) as f:
+                f.write("".join(f"{delta}\n" for delta in self._keystroke_deltas).encode())
+        if self._replay_recorder is not None:
+            replay = self._replay_recorder.finish(self._score, elapsed_game_time)
+            write_replay(self.REPLAY_PATH.format(self._id, f"{time.time_ns()}_{replay.seed}"), replay)
     
+    def _get_result_record(self, elapsed_game_time: float) -> Dict[str, Any]:
+        """
+        :param elapsed_game_time: elapsed game time
+        :return: typed result of the game keyed by game.results.RESULT_COLUMNS
+        """
+
+        summary = self._instrumentation.summary_dict() if self._instrumentation is not None else {}
+
+        return {
+            "id": self._id,
+            "mode": self._mode.name,
+            "agent": self._get_agent_name(),
+            "seed": self._seed if self._seed is not None else -1,
+            "score": self._score,
+            "elapsed": elapsed_game_time,
+            **{f"lines_cleared_{num_rows}": self._num_clears[num_rows] for num_rows in range(1, len(self.POINTS))},
+            "pieces_placed": self._num_pieces_placed,
+            "keystrokes": self._num_keystrokes,
+            "decisions": self._get_num_decisions(),
+            "duration": self._duration if self._duration is not None else math.nan,
+            "simulation_delta_t": self._simulation_delta_t if self._simulation_delta_t is not None else math.nan,
+            "headless": self._headless,
+            "agent_fallback": self._agent_fallback.name if self._agent_fallback is not None else "",
+            "num_missed": self._agent_runner.num_missed if self._agent_runner is not None else -1,
+            **{column: summary.get(column, math.nan) for column in SUMMARY_COLUMNS},
+        }
+
+    def _get_agent_name(self) -> str:
+        """
+        :return: class name of the agent, with that of the placement agent for a MacroActionAgent ("" without one)
+        """
+
+        if self._agent is None:
+            return ""
+        if isinstance(self._agent, MacroActionAgent):
+            return f"{type(self._agent).__name__}({type(self._agent.agent).__name__})"
+
+        return type(self._agent).__name__
+
+    def _get_num_decisions(self) -> int:
+        """
+        :return: number of decisions the agent made - one per block target for a MacroActionAgent and one per query
+            otherwise (-1 without an agent)
+        """
+
+        if self._agent is None:
+            return -1
+        if isinstance(self._agent, MacroActionAgent):
+            return self._agent.num_decisions
+
+        return self._num_agent_steps
+
     def _shutdown_gui(self) -> None:
         """
         Shutdown the GUI
@@ -405,4 +847,11 @@ class Game:
         Get a random block instance
         """
 
-        return random.choice(self.BLOCK_BUILDERS)(self._grid)
+        if self._replay_block_types is not None:
+            block_type = next(self._replay_block_types)
+        else:
+            block_type = self._random.randrange(len(self.BLOCK_BUILDERS))
+        if self._replay_recorder is not None:
+            self._replay_recorder.record_block(block_type)
+
+        return self.BLOCK_BUILDERS[block_type](self._grid)
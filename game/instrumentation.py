@@ -0,0 +1,162 @@
+import math
+import threading
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, Tuple
+
+
+class Phase(Enum):
+    """
+    Phases of the game loop that are timed
+    """
+
+    # Agent.get_action - from request until done or missed when the GUI polls a worker thread for it
+    AGENT = 0
+    # building the observation and game state handed to the agent
+    OBSERVATION = 1
+    # applying an action or gravity tick to the active block (includes the row clearing and rendering it triggers)
+    MOVE = 2
+    # Grid.clear_full_rows
+    CLEAR = 3
+    # canvas calls
+    RENDER = 4
+    # how late scheduled gravity ticks and agent actions run relative to their deadlines (GUI only)
+    TICK_JITTER = 5
+
+
+class LatencyHistogram:
+    """
+    Fixed-size histogram of durations with logarithmically spaced buckets, so recording is O(1) and memory does
+    not grow with the number of samples. Percentiles are accurate to within one bucket (~19%).
+    """
+
+    # bucket i covers [MIN_SECONDS * 2 ** (i / BUCKETS_PER_DOUBLING), MIN_SECONDS * 2 ** ((i + 1) / BUCKETS_PER_DOUBLING)),
+    # with shorter and longer durations clamped into the first and last buckets
+    MIN_SECONDS = 1e-7
+    BUCKETS_PER_DOUBLING = 4
+    NUM_BUCKETS = 120
+
+    def __init__(self):
+        self._counts = [0] * self.NUM_BUCKETS
+        self._log_min = math.log2(self.MIN_SECONDS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        Record a duration
+
+        :param seconds: duration in seconds
+        """
+
+        if seconds > self.MIN_SECONDS:
+            bucket = int((math.log2(seconds) - self._log_min) * self.BUCKETS_PER_DOUBLING)
+            bucket = min(bucket, self.NUM_BUCKETS - 1)
+        else:
+            bucket = 0
+        self._counts[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Get a percentile of the recorded durations
+
+        :param percentile: percentile in [0, 100]
+        :return: geometric midpoint of the bucket holding the percentile in seconds, nan if nothing was recorded
+        """
+
+        if self.count == 0:
+            return math.nan
+
+        rank = percentile / 100 * self.count
+        cumulative = 0
+        for bucket, count in enumerate(self._counts):
+            cumulative += count
+            if cumulative >= rank and count > 0:
+                return min(2 ** (self._log_min + (bucket + 0.5) / self.BUCKETS_PER_DOUBLING), self.max)
+
+        return self.max
+
+
+# percentiles reported per phase
+SUMMARY_PERCENTILES = (50, 90, 99)
+# names of the values returned by Instrumentation.summary, in order - percentiles are in microseconds
+SUMMARY_COLUMNS = tuple(
+    f"{phase.name.lower()}_p{percentile}_us" for phase in Phase for percentile in SUMMARY_PERCENTILES
+)
+
+
+class Instrumentation:
+    """
+    Collects per-phase latency histograms for a game. Games only create one when instrumentation is enabled, so
+    disabled instrumentation costs a None check on the few call sites that are not wrapped up front.
+    """
+
+    def __init__(self):
+        self._histograms = {phase: LatencyHistogram() for phase in Phase}
+        self._lock = threading.Lock()
+
+    def get_histogram(self, phase: Phase) -> LatencyHistogram:
+        return self._histograms[phase]
+
+    def record(self, phase: Phase, seconds: float) -> None:
+        """
+        Record the duration of a phase
+
+        :param phase: phase
+        :param seconds: duration in seconds
+        """
+
+        with self._lock:
+            self._histograms[phase].record(seconds)
+
+    def time(self, phase: Phase, fn: Callable, *args) -> Any:
+        """
+        Call a function and record its duration
+
+        :param phase: phase the call belongs to
+        :param fn: function to call
+        :param args: arguments to the function
+        :return: return value of the function
+        """
+
+        start = time.perf_counter()
+        result = fn(*args)
+        self.record(phase, time.perf_counter() - start)
+
+        return result
+
+    def timed(self, phase: Phase, fn: Callable) -> Callable:
+        """
+        Wrap a function so that every call is recorded
+
+        :param phase: phase the calls belong to
+        :param fn: function to wrap
+        :return: wrapped function
+        """
+
+        def timed_fn(*args):
+            return self.time(phase, fn, *args)
+
+        return timed_fn
+
+    def summary(self) -> Tuple[float, ...]:
+        """
+        :return: percentiles of every phase in microseconds, laid out as SUMMARY_COLUMNS
+        """
+
+        with self._lock:
+            return tuple(
+                round(self._histograms[phase].percentile(percentile) * 1e6, 2)
+                for phase in Phase for percentile in SUMMARY_PERCENTILES
+            )
+
+    def summary_dict(self) -> Dict[str, float]:
+        """
+        :return: summary keyed by SUMMARY_COLUMNS
+        """
+
+        return dict(zip(SUMMARY_COLUMNS, self.summary()))
@@ -4,3 +4,5 @@ from enum import Enum
 class Mode(Enum):
     HUMAN = 1
     SIMULATION = 2
+    # re-execute a recorded game
+    REPLAY = 3
@@ -0,0 +1,317 @@
+import argparse
+import glob
+import os
+import struct
+import sys
+from typing import Iterator, List, NamedTuple, Optional, Set, Tuple
+
+
+# event code of a gravity tick - the other codes are Action values
+GRAVITY_CODE = 0
+# events are packed as (milliseconds since the previous event << CODE_BITS) | code
+CODE_BITS = 3
+CODE_MASK = (1 << CODE_BITS) - 1
+
+MAGIC = b"TRPL"
+# version 2 zigzag-encodes the seed, which can be negative
+VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)
+
+
+class Replay(NamedTuple):
+    """
+    Everything needed to re-execute a game: the blocks it drew and the timestamped gravity ticks and actions
+    """
+
+    # id of the game, as used for its results file
+    id: str
+    # seed of the game's block sequence
+    seed: int
+    # index into Game.BLOCK_BUILDERS of every block drawn, in order
+    block_types: List[int]
+    # (seconds since the start of the game, event code) of every gravity tick and action, in order
+    events: List[Tuple[float, int]]
+    # final score
+    score: int
+    # elapsed game time, as written to the results file
+    elapsed: float
+
+
+class ReplayRecorder:
+    """
+    Collects the blocks and events of a game as it is played
+    """
+
+    def __init__(self, id: str, seed: int):
+        """
+        Initialize the recorder
+
+        :param id: id of the game
+        :param seed: seed of the game's block sequence
+        """
+
+        self._id = id
+        self._seed = seed
+        self._block_types: List[int] = []
+        self._events: List[Tuple[float, int]] = []
+
+    def record_block(self, block_type: int) -> None:
+        """
+        :param block_type: index into Game.BLOCK_BUILDERS of a drawn block
+        """
+
+        self._block_types.append(block_type)
+
+    def record_event(self, t: float, code: int) -> None:
+        """
+        :param t: seconds since the start of the game
+        :param code: GRAVITY_CODE or an Action value
+        """
+
+        self._events.append((t, code))
+
+    def finish(self, score: int, elapsed: float) -> Replay:
+        """
+        :param score: final score
+        :param elapsed: elapsed game time
+        :return: the recorded game
+        """
+
+        return Replay(self._id, self._seed, self._block_types, self._events, score, elapsed)
+
+
+def _encode_varint(value: int, out: bytearray) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _decode_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    # maps 0, -1, 1, -2, 2, ... to 0, 1, 2, 3, 4, ... so that small negative integers stay short varints
+    return 2 * value if value >= 0 else -2 * value - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def encode_replay(replay: Replay) -> bytes:
+    """
+    Encode a replay as bytes. Integers are varints (the seed zigzag-encoded) and event times are deltas in whole milliseconds, so a
+    typical event takes one or two bytes.
+
+    :param replay: replay to encode
+    :return: encoded replay
+    """
+
+    out = bytearray(MAGIC)
+    _encode_varint(VERSION, out)
+    id_bytes = replay.id.encode("utf-8")
+    _encode_varint(len(id_bytes), out)
+    out += id_bytes
+    _encode_varint(_zigzag(replay.seed), out)
+
+    _encode_varint(len(replay.block_types), out)
+    out += bytes(replay.block_types)
+
+    _encode_varint(len(replay.events), out)
+    prev_ms = 0
+    for t, code in replay.events:
+        # round absolute times so that rounding errors do not accumulate over the deltas
+        ms = max(round(t * 1000), prev_ms)
+        _encode_varint(((ms - prev_ms) << CODE_BITS) | code, out)
+        prev_ms = ms
+
+    _encode_varint(replay.score, out)
+    out += struct.pack("<d", replay.elapsed)
+
+    return bytes(out)
+
+
+def decode_replay(data: bytes) -> Replay:
+    """
+    Decode a replay encoded with encode_replay
+
+    :param data: encoded replay
+    :return: replay, with event times rounded to milliseconds
+    """
+
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a replay")
+    version, pos = _decode_varint(data, len(MAGIC))
+    if version not in SUPPORTED_VERSIONS:
+        raise ValueError(f"Unsupported replay version: {version}")
+
+    id_length, pos = _decode_varint(data, pos)
+    id = data[pos:pos + id_length].decode("utf-8")
+    pos += id_length
+    seed, pos = _decode_varint(data, pos)
+    if version >= 2:
+        seed = _unzigzag(seed)
+
+    num_blocks, pos = _decode_varint(data, pos)
+    block_types = list(data[pos:pos + num_blocks])
+    pos += num_blocks
+
+    num_events, pos = _decode_varint(data, pos)
+    events = []
+    ms = 0
+    for _ in range(num_events):
+        value, pos = _decode_varint(data, pos)
+        ms += value >> CODE_BITS
+        events.append((ms / 1000, value & CODE_MASK))
+
+    score, pos = _decode_varint(data, pos)
+    elapsed, = struct.unpack_from("<d", data, pos)
+
+    return Replay(id, seed, block_types, events, score, elapsed)
+
+
+def write_replay(fpath: str, replay: Replay) -> None:
+    """
+    Write a replay to a file
+
+    :param fpath: path of the file
+    :param replay: replay to write
+    """
+
+    os.makedirs(os.path.dirname(fpath), exist_ok=True)
+    with open(fpath, "wb") as f:
+        f.write(encode_replay(replay))
+
+
+def read_replay(fpath: str) -> Replay:
+    """
+    Read a replay from a file
+
+    :param fpath: path of the file
+    :return: replay
+    """
+
+    with open(fpath, "rb") as f:
+        return decode_replay(f.read())
+
+
+def read_results(results_fpath: str) -> Set[Tuple[int, float]]:
+    """
+    Read the (score, elapsed game time) pairs of a results file
+
+    :param results_fpath: path of the results file
+    :return: set of (score, elapsed game time)
+    """
+
+    results = set()
+    with open(results_fpath) as f:
+        for line in f:
+            values = line.split(", ")
+            results.add((int(values[0]), float(values[1])))
+
+    return results
+
+
+def run_replay(replay: Replay, headless: bool = True, speed: float = 1.0) -> Tuple[float, ...]:
+    """
+    Re-execute a replay
+
+    :param replay: replay to re-execute
+    :param headless: run on a virtual clock as fast as possible, otherwise render it in real time
+    :param speed: speed multiplier when rendering
+    :return: result of the replayed game
+    """
+
+    # imported here since the game records replays with this module
+    from game.game import Game
+    from game.mode import Mode
+
+    game = Game(
+        mode=Mode.REPLAY,
+        id=replay.id,
+        headless=headless,
+        record_results=False,
+        replay=replay,
+        replay_speed=speed,
+    )
+    game.run()
+
+    return game.result
+
+
+def verify_replay(replay: Replay, results: Optional[Set[Tuple[int, float]]] = None) -> List[str]:
+    """
+    Re-execute a replay headlessly and check that it reproduces the recorded score
+
+    :param replay: replay to verify
+    :param results: (score, elapsed game time) pairs from the results file the game was recorded in
+    :return: descriptions of the mismatches
+    """
+
+    problems = []
+    score = run_replay(replay)[0]
+    if score != replay.score:
+        problems.append(f"replayed score {score} does not match the recorded score {replay.score}")
+    if results is not None and (replay.score, replay.elapsed) not in results:
+        problems.append(f"no result with score {replay.score} and elapsed time {replay.elapsed}")
+
+    return problems
+
+
+def _iter_replay_fpaths(paths: List[str]) -> Iterator[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            yield from sorted(glob.glob(os.path.join(path, "**", "*.replay"), recursive=True))
+        else:
+            yield path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Verify or render recorded games")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    verify_parser = subparsers.add_parser("verify", help="re-execute replays headlessly and check their scores")
+    verify_parser.add_argument("paths", nargs="+", help="replay files or directories to search for them")
+    verify_parser.add_argument("--results", type=str, help="results file to check the scores against (default: the results file of each replay's id, if it exists)", required=False)
+    render_parser = subparsers.add_parser("render", help="render a replay in the GUI")
+    render_parser.add_argument("path", help="replay file")
+    render_parser.add_argument("--speed", type=float, help="speed multiplier", default=1.0)
+    args = parser.parse_args(argv)
+
+    if args.command == "render":
+        result = run_replay(read_replay(args.path), headless=False, speed=args.speed)
+        print(f"score: {result[0]}")
+        return 0
+
+    # imported here since the game records replays with this module
+    from game.game import Game
+
+    results_by_fpath = {}
+    num_failed = 0
+    for fpath in _iter_replay_fpaths(args.paths):
+        replay = read_replay(fpath)
+        results_fpath = args.results if args.results is not None else Game.RESULTS_PATH.format(replay.id)
+        if results_fpath not in results_by_fpath:
+            results_by_fpath[results_fpath] = read_results(results_fpath) if os.path.exists(results_fpath) else None
+
+        problems = verify_replay(replay, results_by_fpath[results_fpath])
+        if problems:
+            num_failed += 1
+            print(f"{fpath}: FAILED - {'; '.join(problems)}", file=sys.stderr)
+        else:
+            print(f"{fpath}: OK (score {replay.score})")
+
+    return 1 if num_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
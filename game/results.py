@@ -0,0 +1,218 @@
+import glob
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from game.instrumentation import SUMMARY_COLUMNS
+
+
+class ResultsFormat(Enum):
+    """
+    File formats results can be written in
+    """
+
+    # legacy text rows: score, elapsed game time
+    CSV = 0
+    # NumPy archive with one typed array per column of RESULT_COLUMNS
+    NPZ = 1
+
+
+# typed columns of a result record, in order. Missing values are -1 for integers, nan for floats and "" for
+# strings. The latency percentiles are nan unless the game was instrumented.
+RESULT_COLUMNS: Tuple[Tuple[str, type], ...] = (
+    ("id", np.str_),
+    ("mode", np.str_),
+    ("agent", np.str_),
+    ("seed", np.int64),
+    ("score", np.int64),
+    ("elapsed", np.float64),
+    *((f"lines_cleared_{num_rows}", np.int64) for num_rows in range(1, 5)),
+    ("pieces_placed", np.int64),
+    # actions applied (key presses or agent actions) and agent decisions, see Game._get_num_decisions
+    ("keystrokes", np.int64),
+    ("decisions", np.int64),
+    ("duration", np.float64),
+    ("simulation_delta_t", np.float64),
+    ("headless", np.bool_),
+    ("agent_fallback", np.str_),
+    ("num_missed", np.int64),
+    *((column, np.float64) for column in SUMMARY_COLUMNS),
+)
+
+# missing value of each column type
+MISSING_VALUES: Dict[type, Any] = {np.str_: "", np.int64: -1, np.float64: np.nan, np.bool_: False}
+
+# rows buffered before they are handed to the background thread
+DEFAULT_BATCH_SIZE = 256
+
+
+class ResultsWriter:
+    """
+    Buffers game results in memory and writes them in batches on a background thread, so that games do not wait on
+    file I/O. Rows are written in the order they were added.
+    """
+
+    def __init__(
+            self,
+            csv_fpath: Optional[str] = None,
+            npz_fpath: Optional[str] = None,
+            batch_size: int = DEFAULT_BATCH_SIZE,
+        ):
+        """
+        Initialize the writer
+
+        :param csv_fpath: legacy results file to append rows to, if any
+        :param npz_fpath: columnar results file to add rows to, if any - since archives cannot be appended to, every
+            batch is written to a shard of its own next to it (see get_shard_fpath), after the shards of earlier
+            sessions. read_npz_results reads the file and its shards as one.
+        :param batch_size: number of rows to buffer before writing them
+        """
+
+        self._csv_fpath = csv_fpath
+        self._npz_fpath = npz_fpath
+        self._batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="results")
+        self._writes: List[Future] = []
+
+        # rows buffered on the calling thread
+        self._rows: List[Tuple[float, ...]] = []
+        self._records: List[Dict[str, Any]] = []
+        # index of the next shard - only touched by the background thread after this
+        self._num_shards = len(get_shard_fpaths(npz_fpath)) if npz_fpath is not None else 0
+
+    def write(self, row: Tuple[float, ...], record: Dict[str, Any]) -> None:
+        """
+        Add the result of a game
+
+        :param row: legacy results row of score and elapsed game time (Game.result)
+        :param record: typed result record keyed by the names in RESULT_COLUMNS (Game.result_record)
+        """
+
+        self._rows.append(row)
+        self._records.append(record)
+        if len(self._rows) >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Hand the buffered rows to the background thread
+        """
+
+        if not self._rows:
+            return
+
+        self._writes.append(self._executor.submit(self._write_batch, self._rows, self._records))
+        self._rows = []
+        self._records = []
+        # drop finished writes, raising their errors here rather than losing them
+        while self._writes and self._writes[0].done():
+            self._writes.pop(0).result()
+
+    def close(self) -> None:
+        """
+        Write the remaining rows and wait for all writes to finish
+        """
+
+        self.flush()
+        self._executor.shutdown(wait=True)
+        for write in self._writes:
+            write.result()
+        self._writes = []
+
+    def __enter__(self) -> "ResultsWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _write_batch(self, rows: Sequence[Tuple[float, ...]], records: Sequence[Dict[str, Any]]) -> None:
+        if self._csv_fpath is not None:
+            _makedirs_for(self._csv_fpath)
+            with open(self._csv_fpath, "a") as f:
+                f.write("".join(", ".join(str(value) for value in row) + "\n" for row in rows))
+
+        if self._npz_fpath is not None:
+            columns = {name: [record[name] for record in records] for name, _ in RESULT_COLUMNS}
+            write_npz_results(get_shard_fpath(self._npz_fpath, self._num_shards), columns)
+            self._num_shards += 1
+
+
+def get_shard_fpath(npz_fpath: str, shard_idx: int) -> str:
+    """
+    :param npz_fpath: path of a results archive
+    :param shard_idx: index of the shard
+    :return: path of the shard, e.g. out/results_{id}.3.npz for out/results_{id}.npz
+    """
+
+    root, ext = os.path.splitext(npz_fpath)
+
+    return f"{root}.{shard_idx}{ext}"
+
+
+def get_shard_fpaths(npz_fpath: str) -> List[str]:
+    """
+    :param npz_fpath: path of a results archive
+    :return: paths of the archive's existing shards, in order
+    """
+
+    root, ext = os.path.splitext(npz_fpath)
+    pattern = re.compile(re.escape(root) + r"\.(\d+)" + re.escape(ext) + "$")
+    shard_idxs = []
+    for fpath in glob.glob(glob.escape(root) + ".*" + ext):
+        match = pattern.match(fpath)
+        if match is not None:
+            shard_idxs.append(int(match.group(1)))
+
+    return [get_shard_fpath(npz_fpath, shard_idx) for shard_idx in sorted(shard_idxs)]
+
+
+def write_npz_results(npz_fpath: str, columns: Dict[str, list]) -> None:
+    """
+    Write result columns to a NumPy archive, replacing any existing file at once so readers never see a partial one
+
+    :param npz_fpath: path of the archive
+    :param columns: values of each column of RESULT_COLUMNS
+    """
+
+    _makedirs_for(npz_fpath)
+    tmp_fpath = npz_fpath + ".tmp"
+    with open(tmp_fpath, "wb") as f:
+        np.savez(f, **{name: np.array(columns[name], dtype=dtype) for name, dtype in RESULT_COLUMNS})
+    os.replace(tmp_fpath, npz_fpath)
+
+
+def read_npz_results(npz_fpath: str) -> Dict[str, np.ndarray]:
+    """
+    Read results written by a ResultsWriter or write_npz_results: the archive if it exists, followed by its shards.
+    Columns an archive predates are filled with missing values.
+
+    :param npz_fpath: path of the archive
+    :return: map from column name to its values, for every column of RESULT_COLUMNS
+    """
+
+    fpaths = [npz_fpath] if os.path.exists(npz_fpath) else []
+    fpaths += get_shard_fpaths(npz_fpath)
+    if not fpaths:
+        raise FileNotFoundError(f"No results at {npz_fpath}")
+
+    parts: Dict[str, List[np.ndarray]] = {name: [] for name, _ in RESULT_COLUMNS}
+    for fpath in fpaths:
+        with np.load(fpath) as archive:
+            num_rows = len(archive[archive.files[0]]) if archive.files else 0
+            for name, dtype in RESULT_COLUMNS:
+                if name in archive.files:
+                    parts[name].append(archive[name])
+                else:
+                    parts[name].append(np.full(num_rows, MISSING_VALUES[dtype], dtype=dtype))
+
+    return {name: np.concatenate(parts[name]).astype(dtype, copy=False) for name, dtype in RESULT_COLUMNS}
+
+
+def _makedirs_for(fpath: str) -> None:
+    dirname = os.path.dirname(fpath)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
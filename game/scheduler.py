@@ -0,0 +1,124 @@
+import math
+from typing import Callable, Dict, List, Optional
+
+from game.clock import WallClock
+from game.instrumentation import Instrumentation, LatencyHistogram, Phase
+
+
+class _Task:
+    """
+    A periodic or one-shot callback with absolute deadlines
+    """
+
+    def __init__(self, name: str, start: float, period: Optional[float], callback: Callable[[], None]):
+        self.name = name
+        self.start = start
+        self.period = period
+        self.callback = callback
+        # number of times the task has fired
+        self.count = 0
+        self.after_id = None
+
+    @property
+    def deadline(self) -> float:
+        # computed from the start rather than accumulated, so late runs never push later deadlines back
+        return self.start if self.period is None else self.start + self.count * self.period
+
+
+class TkScheduler:
+    """
+    Runs periodic and one-shot callbacks on the Tk thread with root.after(). Deadlines are absolute times on a
+    monotonic clock, so a late run does not delay the runs after it. A task that falls behind catches up without
+    skipping runs, which keeps the number of runs by time t the same as in headless games.
+
+    How late each run fires (its jitter) is recorded per task.
+    """
+
+    def __init__(self, root, clock: WallClock, instrumentation: Optional[Instrumentation] = None):
+        """
+        Initialize the scheduler
+
+        :param root: Tk root (anything with after and after_cancel)
+        :param clock: monotonic clock the deadlines are on
+        :param instrumentation: optional instrumentation to record jitter in as Phase.TICK_JITTER
+        """
+
+        self._root = root
+        self._clock = clock
+        self._instrumentation = instrumentation
+        self._tasks: List[_Task] = []
+        self._cancelled = False
+
+        # jitter histogram per task name
+        self.jitter: Dict[str, LatencyHistogram] = {}
+
+    def schedule_periodic(self, name: str, start: float, period: float, callback: Callable[[], None]) -> None:
+        """
+        Run a callback at start, start + period, start + 2 * period, ...
+
+        :param name: name of the task for jitter reporting
+        :param start: time of the first run on the scheduler's clock
+        :param period: seconds between runs
+        :param callback: function to run
+        """
+
+        self._add(_Task(name, start, period, callback))
+
+    def schedule_once(self, name: str, at: float, callback: Callable[[], None]) -> None:
+        """
+        Run a callback once
+
+        :param name: name of the task for jitter reporting
+        :param at: time to run at on the scheduler's clock
+        :param callback: function to run
+        """
+
+        self._add(_Task(name, at, None, callback))
+
+    def cancel(self) -> None:
+        """
+        Cancel all tasks - takes effect immediately, including from inside a callback
+        """
+
+        self._cancelled = True
+        for task in self._tasks:
+            if task.after_id is not None:
+                self._root.after_cancel(task.after_id)
+                task.after_id = None
+
+    def _add(self, task: _Task) -> None:
+        self._tasks.append(task)
+        self.jitter.setdefault(task.name, LatencyHistogram())
+        self._arm(task)
+
+    def _arm(self, task: _Task) -> None:
+        """
+        Schedule the next run of a task
+        """
+
+        # round up to whole milliseconds so tasks never fire before their deadline
+        delay_ms = max(math.ceil((task.deadline - self._clock.time()) * 1000), 0)
+        task.after_id = self._root.after(delay_ms, lambda: self._fire(task))
+
+    def _fire(self, task: _Task) -> None:
+        """
+        Run a task and schedule its next run
+        """
+
+        task.after_id = None
+        if self._cancelled:
+            return
+
+        jitter = max(self._clock.time() - task.deadline, 0.0)
+        self.jitter[task.name].record(jitter)
+        if self._instrumentation is not None:
+            self._instrumentation.record(Phase.TICK_JITTER, jitter)
+
+        task.count += 1
+        if task.period is None:
+            # one-shot tasks such as agent polls come and go throughout the game
+            self._tasks.remove(task)
+        task.callback()
+
+        if task.period is not None and not self._cancelled:
+            self._arm(task)
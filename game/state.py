@@ -0,0 +1,21 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+class GameState(NamedTuple):
+    """
+    Structured view of a game for agents that plan, alongside the raw observation
+    """
+
+    # (H, W) bool board of the settled cells, without the active block
+    board: np.ndarray
+    # active block - index into BLOCK_TYPES, rotation state and anchor location
+    block_type: int
+    rotation_state: int
+    x: int
+    y: int
+    # index into BLOCK_TYPES of the saved block, None if no block is saved
+    saved_block_type: Optional[int]
+    # whether SAVE_BLOCK has an effect (a block can be saved once per spawned block)
+    can_save: bool
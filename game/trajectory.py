@@ -0,0 +1,211 @@
+import glob
+import json
+import os
+import time
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from game.action import NO_ACTION, Action
+
+
+# steps per shard - about 2 MB for a 21 x 10 board
+DEFAULT_SHARD_SIZE = 1 << 16
+
+SHARD_PATH = "{0}_{1:05d}.npy"
+INDEX_PATH = "{0}.json"
+
+
+def get_step_dtype(height: int, width: int) -> np.dtype:
+    """
+    :param height: height of the board
+    :param width: width of the board
+    :return: dtype of a step, with the board observation bit-packed row-major
+    """
+
+    return np.dtype([
+        ("observation", np.uint8, ((height * width + 7) // 8,)),
+        ("action", np.uint8),
+        ("reward", np.int16),
+        ("done", np.bool_),
+    ])
+
+
+class TrajectoryWriter:
+    """
+    Writes (observation, action, reward, done) steps of agent games to fixed-size shards of pre-allocated .npy files
+    that are memory-mapped while being filled. A new shard is started when the current one is full.
+
+    Shards are named after a prefix unique to the writer, so writers in several processes can share a directory. The
+    number of steps in each shard is kept in an index file next to them, updated at the end of every game.
+    """
+
+    def __init__(self, dirname: str, height: int, width: int, shard_size: int = DEFAULT_SHARD_SIZE):
+        """
+        Initialize the writer
+
+        :param dirname: directory to write the shards to
+        :param height: height of the board
+        :param width: width of the board
+        :param shard_size: number of steps per shard
+        """
+
+        self._dirname = dirname
+        self._height = height
+        self._width = width
+        self._shard_size = shard_size
+        self._dtype = get_step_dtype(height, width)
+        self._prefix = os.path.join(dirname, f"{time.time_ns()}_{os.getpid()}")
+
+        self._shard: Optional[np.memmap] = None
+        self._shard_fpaths: List[str] = []
+        self._shard_lengths: List[int] = []
+        # index of the next step in the current shard
+        self._pos = 0
+
+        # step waiting for its reward, which is only known at the next decision or at the end of the game
+        self._pending: Optional[Tuple[np.ndarray, int, int]] = None
+
+    def record(self, observation: np.ndarray, action: Optional[Action], score: int) -> None:
+        """
+        Record a decision
+
+        :param observation: observation the decision was made on
+        :param action: action taken, None for no action
+        :param score: score at the time of the decision
+        """
+
+        if self._pending is not None:
+            self._write_step(score, done=False)
+        self._pending = (
+            np.packbits(observation, axis=None),
+            action.value if action is not None else NO_ACTION,
+            score,
+        )
+
+    def end_game(self, score: int) -> None:
+        """
+        Mark the end of a game and make its steps visible to readers
+
+        :param score: final score
+        """
+
+        if self._pending is not None:
+            self._write_step(score, done=True)
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        Flush the current shard and update the index
+        """
+
+        if self._shard is None:
+            return
+
+        self._shard.flush()
+        self._shard_lengths[-1] = self._pos
+        index = {
+            "height": self._height,
+            "width": self._width,
+            "shards": [
+                {"fpath": os.path.basename(fpath), "length": length}
+                for fpath, length in zip(self._shard_fpaths, self._shard_lengths)
+            ],
+        }
+        index_fpath = INDEX_PATH.format(self._prefix)
+        with open(index_fpath + ".tmp", "w") as f:
+            json.dump(index, f)
+        os.replace(index_fpath + ".tmp", index_fpath)
+
+    def _write_step(self, score: int, done: bool) -> None:
+        if self._shard is None or self._pos == self._shard_size:
+            self._roll()
+
+        observation, action, prev_score = self._pending
+        step = self._shard[self._pos]
+        step["observation"] = observation
+        step["action"] = action
+        step["reward"] = score - prev_score
+        step["done"] = done
+        self._pos += 1
+        self._pending = None
+
+    def _roll(self) -> None:
+        """
+        Start a new shard
+        """
+
+        if self._shard is not None:
+            self.flush()
+            del self._shard
+
+        os.makedirs(self._dirname, exist_ok=True)
+        fpath = SHARD_PATH.format(self._prefix, len(self._shard_fpaths))
+        self._shard = np.lib.format.open_memmap(fpath, mode="w+", dtype=self._dtype, shape=(self._shard_size,))
+        self._shard_fpaths.append(fpath)
+        self._shard_lengths.append(0)
+        self._pos = 0
+
+
+class TrajectoryDataset:
+    """
+    All the steps written to a directory by TrajectoryWriters, indexed as one sequence. Shards are memory-mapped on
+    first access, so only the steps that are read are loaded.
+    """
+
+    def __init__(self, dirname: str):
+        """
+        Open the dataset
+
+        :param dirname: directory the shards were written to
+        """
+
+        self._shard_fpaths = []
+        lengths = []
+        self.height = self.width = None
+        for index_fpath in sorted(glob.glob(INDEX_PATH.format(os.path.join(dirname, "*")))):
+            with open(index_fpath) as f:
+                index = json.load(f)
+            self.height, self.width = index["height"], index["width"]
+            for shard in index["shards"]:
+                if shard["length"] > 0:
+                    self._shard_fpaths.append(os.path.join(dirname, shard["fpath"]))
+                    lengths.append(shard["length"])
+
+        # index of the first step of each shard, followed by the total number of steps
+        self._offsets = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)])
+        self._shards: List[Optional[np.ndarray]] = [None] * len(self._shard_fpaths)
+
+    def __len__(self) -> int:
+        return int(self._offsets[-1])
+
+    def __getitem__(self, idx: Union[int, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        :param idx: index of a step, or an array of indices
+        :return: observations ((H, W) or (N, H, W) bool), actions (Action values, NO_ACTION for none), rewards
+            and done flags
+        """
+
+        indices = np.asarray(idx, dtype=np.int64)
+        indices = np.where(indices < 0, indices + len(self), indices)
+        if ((indices < 0) | (indices >= len(self))).any():
+            raise IndexError(f"Step index out of range: {idx}")
+
+        flat_indices = indices.reshape(-1)
+        steps = np.empty(len(flat_indices), dtype=get_step_dtype(self.height, self.width))
+        shard_indices = np.searchsorted(self._offsets, flat_indices, side="right") - 1
+        for shard_idx in np.unique(shard_indices):
+            mask = shard_indices == shard_idx
+            steps[mask] = self._get_shard(shard_idx)[flat_indices[mask] - self._offsets[shard_idx]]
+        steps = steps.reshape(indices.shape)
+
+        observations = np.unpackbits(steps["observation"], axis=-1, count=self.height * self.width)
+        observations = observations.reshape(*indices.shape, self.height, self.width).astype(bool)
+
+        return observations, steps["action"], steps["reward"], steps["done"]
+
+    def _get_shard(self, shard_idx: int) -> np.ndarray:
+        if self._shards[shard_idx] is None:
+            self._shards[shard_idx] = np.load(self._shard_fpaths[shard_idx], mmap_mode="r")
+
+        return self._shards[shard_idx]
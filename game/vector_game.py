@@ -0,0 +1,284 @@
+import random
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from configs import config
+from element.tetris_blocks import BLOCK_TYPES
+from game.action import NO_ACTION, Action
+from game.game import Game
+
+
+# (dx, dy) cell offsets from the anchor, indexed by block type and rotation state - (T, 4, 4, 2)
+CELL_OFFSETS = np.array([
+    [orientation.cells for orientation in block_type.ORIENTATIONS] for block_type in BLOCK_TYPES
+], dtype=np.int64)
+
+
+def clear_full_rows_batch(boards: np.ndarray) -> np.ndarray:
+    """
+    Clear full rows on a stack of boards in place, shifting the rows above them down
+
+    :param boards: (N, H, W) bool boards
+    :return: (N,) number of rows cleared on each board
+    """
+
+    full = boards.all(axis=2)
+    num_rows_cleared = full.sum(axis=1)
+    board_idxs = np.nonzero(num_rows_cleared)[0]
+    if len(board_idxs) == 0:
+        return num_rows_cleared
+
+    full = full[board_idxs]
+    height = boards.shape[1]
+    # a row that is kept moves down by the number of full rows below it
+    num_full_below = np.cumsum(full[:, ::-1], axis=1)[:, ::-1]
+    target_rows = np.arange(height)[None, :] + num_full_below
+
+    cleared = np.zeros((len(board_idxs),) + boards.shape[1:], dtype=boards.dtype)
+    kept_board_idxs, kept_rows = np.nonzero(~full)
+    cleared[kept_board_idxs, target_rows[kept_board_idxs, kept_rows]] = boards[board_idxs[kept_board_idxs], kept_rows]
+    boards[board_idxs] = cleared
+
+    return num_rows_cleared
+
+
+class VectorGame:
+    """
+    Runs many headless games side by side, stepping all boards with one vectorized call.
+
+    Boards are held as a stacked (N, H, W) array of settled cells; the active block of every board is tracked
+    separately as its type, rotation state and anchor location. Gravity is not applied implicitly - issue
+    Action.MOVE_DOWN to advance it. Given the same seed and action sequence, each board evolves exactly like a single Game.
+    """
+
+    def __init__(self, num_games: int, seeds: Optional[Sequence[int]] = None):
+        """
+        Initialize the games
+
+        :param num_games: number of boards to run
+        :param seeds: optional seed for the block sequence of each board
+        """
+
+        if seeds is not None:
+            assert len(seeds) == num_games, "Expected one seed per game"
+
+        self.num_games = num_games
+        self.height = config.HEIGHT
+        self.width = config.WIDTH
+        self._spawn_location = np.array(BLOCK_TYPES[0].get_spawn_location(self.width))
+        self._points = np.array(Game.POINTS)
+
+        # board state - settled cells only
+        self._boards = np.zeros((num_games, self.height, self.width), dtype=bool)
+        self._scores = np.zeros(num_games, dtype=np.int64)
+        self._done = np.zeros(num_games, dtype=bool)
+
+        # active block state - block type index into BLOCK_TYPES, rotation state and anchor (x, y)
+        self._block_types = np.zeros(num_games, dtype=np.int64)
+        self._rotations = np.zeros(num_games, dtype=np.int64)
+        self._anchors = np.zeros((num_games, 2), dtype=np.int64)
+
+        # saved block state - -1 when no block is saved
+        self._saved_block_types = np.full(num_games, -1, dtype=np.int64)
+        self._saved_block_active = np.zeros(num_games, dtype=bool)
+
+        self._randoms = [random.Random(None if seeds is None else seeds[idx]) for idx in range(num_games)]
+        self._block_type_idxs = range(len(BLOCK_TYPES))
+        for idx in range(num_games):
+            # draw the initial block, activated when the games start
+            self._block_types[idx] = self._randoms[idx].choice(self._block_type_idxs)
+        self._activate(np.arange(num_games))
+
+    @property
+    def scores(self) -> np.ndarray:
+        """
+        :return: (N,) score of each board
+        """
+
+        return self._scores
+
+    @property
+    def done(self) -> np.ndarray:
+        """
+        :return: (N,) flags indicating which games are over
+        """
+
+        return self._done
+
+    def get_observations(self) -> np.ndarray:
+        """
+        Get the observation of every board, matching Grid.get_observation (settled cells plus the active block)
+
+        :return: (N, H, W) bool observations
+        """
+
+        observations = self._boards.copy()
+        idxs = np.nonzero(~self._done)[0]
+        cells = self._get_cells(idxs, self._rotations[idxs], self._anchors[idxs])
+        observations[idxs[:, None], cells[..., 1], cells[..., 0]] = True
+
+        return observations
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Apply one action to every board. Boards that are done ignore their action.
+
+        :param actions: (N,) Action values (NO_ACTION to leave a board untouched)
+        :return: points gained by each board and the done flags
+        """
+
+        actions = np.where(self._done, NO_ACTION, np.asarray(actions))
+        scores = self._scores.copy()
+
+        idxs = np.nonzero(actions == Action.ROTATE.value)[0]
+        if len(idxs) > 0:
+            self._rotate(idxs)
+
+        for action, dx in ((Action.MOVE_LEFT, -1), (Action.MOVE_RIGHT, 1)):
+            idxs = np.nonzero(actions == action.value)[0]
+            if len(idxs) > 0:
+                self._translate(idxs, dx=dx, dy=0)
+
+        idxs = np.nonzero(actions == Action.MOVE_DOWN.value)[0]
+        if len(idxs) > 0:
+            moved = self._translate(idxs, dx=0, dy=1)
+            self._settle(idxs[~moved])
+
+        idxs = np.nonzero(actions == Action.MOVE_TO_BOTTOM.value)[0]
+        if len(idxs) > 0:
+            moving = idxs
+            while len(moving := moving[self._fits(moving, self._rotations[moving], self._anchors[moving] + (0, 1))]) > 0:
+                self._anchors[moving, 1] += 1
+            self._settle(idxs)
+
+        idxs = np.nonzero(actions == Action.SAVE_BLOCK.value)[0]
+        if len(idxs) > 0:
+            self._save_block(idxs[~self._saved_block_active[idxs]])
+
+        return self._scores - scores, self._done
+
+    def _get_cells(self, idxs: np.ndarray, rotations: np.ndarray, anchors: np.ndarray) -> np.ndarray:
+        """
+        Get the cells covered by the active blocks at the given rotation states and anchors
+
+        :param idxs: (M,) board indices
+        :param rotations: (M,) rotation states
+        :param anchors: (M, 2) anchor (x, y)
+        :return: (M, 4, 2) absolute (x, y) cells
+        """
+
+        return anchors[:, None, :] + CELL_OFFSETS[self._block_types[idxs], rotations]
+
+    def _fits(self, idxs: np.ndarray, rotations: np.ndarray, anchors: np.ndarray) -> np.ndarray:
+        """
+        Check whether the active blocks at the given rotation states and anchors are in bounds and unoccupied
+
+        :param idxs: (M,) board indices
+        :param rotations: (M,) candidate rotation states
+        :param anchors: (M, 2) candidate anchor (x, y)
+        :return: (M,) flags
+        """
+
+        cells = self._get_cells(idxs, rotations, anchors)
+        x = cells[..., 0]
+        y = cells[..., 1]
+        inbounds = ((x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)).all(axis=1)
+        occupied = self._boards[
+            idxs[:, None],
+            np.clip(y, 0, self.height - 1),
+            np.clip(x, 0, self.width - 1),
+        ].any(axis=1)
+
+        return inbounds & ~occupied
+
+    def _translate(self, idxs: np.ndarray, dx: int, dy: int) -> np.ndarray:
+        """
+        Translate the active blocks by dx and dy where possible
+
+        :param idxs: (M,) board indices
+        :param dx: delta to move in x dir
+        :param dy: delta to move in y dir
+        :return: (M,) flags indicating translation success
+        """
+
+        anchors = self._anchors[idxs] + (dx, dy)
+        moved = self._fits(idxs, self._rotations[idxs], anchors)
+        self._anchors[idxs[moved]] = anchors[moved]
+
+        return moved
+
+    def _rotate(self, idxs: np.ndarray) -> None:
+        """
+        Rotate the active blocks 90 deg where possible
+
+        :param idxs: (M,) board indices
+        """
+
+        rotations = (self._rotations[idxs] + 1) % 4
+        rotated = self._fits(idxs, rotations, self._anchors[idxs])
+        self._rotations[idxs[rotated]] = rotations[rotated]
+
+    def _settle(self, idxs: np.ndarray) -> None:
+        """
+        Settle the active blocks, clear full rows and spawn the next blocks
+
+        :param idxs: (M,) board indices
+        """
+
+        if len(idxs) == 0:
+            return
+
+        cells = self._get_cells(idxs, self._rotations[idxs], self._anchors[idxs])
+        self._boards[idxs[:, None], cells[..., 1], cells[..., 0]] = True
+
+        boards = self._boards[idxs]
+        num_rows_cleared = clear_full_rows_batch(boards)
+        self._boards[idxs] = boards
+        self._scores[idxs] += self._points[num_rows_cleared]
+
+        self._next_block_state(idxs)
+
+    def _save_block(self, idxs: np.ndarray) -> None:
+        """
+        Save the active blocks and replace them with the already saved blocks if they exist
+
+        :param idxs: (M,) board indices of boards whose saved block is not active
+        """
+
+        if len(idxs) == 0:
+            return
+
+        self._saved_block_active[idxs] = True
+        saved_block_types = self._saved_block_types[idxs]
+        self._saved_block_types[idxs] = self._block_types[idxs]
+
+        has_saved = saved_block_types >= 0
+        self._next_block_state(idxs[~has_saved])
+
+        swap_idxs = idxs[has_saved]
+        self._block_types[swap_idxs] = saved_block_types[has_saved]
+        self._activate(swap_idxs)
+
+    def _next_block_state(self, idxs: np.ndarray) -> None:
+        """
+        Draw and activate the next blocks
+
+        :param idxs: (M,) board indices
+        """
+
+        self._saved_block_active[idxs] = False
+        for idx in idxs:
+            self._block_types[idx] = self._randoms[idx].choice(self._block_type_idxs)
+        self._activate(idxs)
+
+    def _activate(self, idxs: np.ndarray) -> None:
+        """
+        Place blocks at their spawn location, ending the games where the spawn location is blocked
+
+        :param idxs: (M,) board indices
+        """
+
+        self._rotations[idxs] = 0
+        self._anchors[idxs] = self._spawn_location
+        self._done[idxs] |= ~self._fits(idxs, self._rotations[idxs], self._anchors[idxs])
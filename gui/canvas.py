@@ -1,7 +1,7 @@
 import tkinter as tk
 from element.point import Point
 
-from typing import Tuple, Callable
+from typing import Callable, Dict, List, Tuple
 
 
 class Canvas:
@@ -9,6 +9,14 @@ class Canvas:
     The Canvas class manages the gui abstracts away the underlying logic with tkinter.
     """
 
+    # tag of the pooled rectangles points are drawn with, which sets them apart from the grid lines
+    CELL_TAG = "cell"
+    # temporary tags for the rectangles being cleared and shifted by clear_rows
+    CLEAR_TAG = "clear"
+    SHIFT_TAG = "shift{}"
+    # row above the canvas where unused rectangles are parked
+    PARKED_ROW = -2
+
     def __init__(self, root: tk.Tk, height: int, width: int, cell_size: int, padding: int):
         """
         Initialize the Canvas
@@ -29,6 +37,11 @@ class Canvas:
         self._padding = padding
         self._canvas = self._init_canvas()
 
+        # pool of rectangles, one per cell so that a full board can be drawn. Rectangles are recolored and moved
+        # rather than created and deleted, and are parked above the visible area while unused.
+        self._free_rectangles: List[int] = [self._create_rectangle() for _ in range(height * width)]
+        self._rectangle_colors: Dict[int, str] = {}
+
     def raster_point(self, point: Point) -> None:
         """
         Raster a new point on the canvas if point is in bounds (returns False otherwise)
@@ -36,7 +49,14 @@ class Canvas:
         :param point: point to raster
         """
 
-        self._create_rectangle(point)
+        rectangle = self._free_rectangles.pop()
+        # blocks of a type share a color, so a recycled rectangle often has the right one already
+        if self._rectangle_colors.get(rectangle) != point.color:
+            self._canvas.itemconfigure(rectangle, outline=point.color, fill=point.color)
+            self._rectangle_colors[rectangle] = point.color
+        x1, y1, x2, y2 = self._get_rectangle_coordinates(point.x, point.y)
+        self._canvas.coords(rectangle, x1, y1, x2, y2)
+        point.rectangle = rectangle
 
     def move_point(self, point: Point, x: int, y: int) -> None:
         """
@@ -69,9 +89,42 @@ class Canvas:
         :param point: point to remove
         """
 
-        self._canvas.delete(point.rectangle)
+        x1, y1, x2, y2 = self._get_rectangle_coordinates(0, self.PARKED_ROW)
+        self._canvas.coords(point.rectangle, x1, y1, x2, y2)
+        self._free_rectangles.append(point.rectangle)
         point.rectangle = None
 
+    def clear_rows(self, full_rows: List[int]) -> None:
+        """
+        Remove the rectangles in full rows and shift the rectangles above them down by the number of full rows
+        below them, with a few tag operations per band of rows rather than a call per rectangle. Rectangles are
+        tagged by the rows they sit in, so every rectangle on the board must belong to a point on the grid.
+
+        :param full_rows: indices of the full rows in ascending order
+        """
+
+        # tag everything before moving anything, so that shifted rectangles are never picked up by another band
+        for start, end in self._get_bands(full_rows):
+            self._tag_rows(self.CLEAR_TAG, start, end)
+        shifts = []
+        num_rows_below = len(full_rows)
+        band_start = 0
+        for row_idx in full_rows:
+            if band_start < row_idx:
+                tag = self.SHIFT_TAG.format(len(shifts))
+                self._tag_rows(tag, band_start, row_idx)
+                shifts.append((tag, num_rows_below))
+            band_start = row_idx + 1
+            num_rows_below -= 1
+
+        # park the cleared rectangles - they start in [0, height), so this moves them all above the visible area
+        self._free_rectangles.extend(self._canvas.find_withtag(self.CLEAR_TAG))
+        self._canvas.move(self.CLEAR_TAG, 0, (self.PARKED_ROW - self.height) * self._cell_size)
+        self._canvas.dtag(self.CLEAR_TAG)
+        for tag, dy in shifts:
+            self._canvas.move(tag, 0, dy * self._cell_size)
+            self._canvas.dtag(tag)
+
     def bind_key_listener(self, key: str, fn: Callable) -> None:
         """
         Binds a keyboard listener
@@ -131,16 +184,43 @@ class Canvas:
         button = tk.Button(self._root, text="Start Over", command=start_over_fn)
         self._canvas.create_window(text_x, text_y + 100, window=button)
 
-    def _create_rectangle(self, point: Point) -> None:
+    def _create_rectangle(self) -> int:
         """
-        Create rectangle for a point
-        :param point: point to create rectangle for
+        Create a parked rectangle for the pool
+        :return: id of the rectangle
         """
 
-        x1, y1, x2, y2 = self._get_rectangle_coordinates(point.x, point.y)
-        point.rectangle = self._canvas.create_rectangle(
-            x1, y1, x2, y2, outline=point.color, fill=point.color,
-        )
+        x1, y1, x2, y2 = self._get_rectangle_coordinates(0, self.PARKED_ROW)
+        return self._canvas.create_rectangle(x1, y1, x2, y2, outline="", fill="", tags=self.CELL_TAG)
+
+    def _tag_rows(self, tag: str, start: int, end: int) -> None:
+        """
+        Tag the rectangles in rows [start, end)
+        :param tag: tag to add
+        :param start: first row
+        :param end: row after the last row
+        """
+
+        self._canvas.addtag_enclosed(tag, 0, start * self._cell_size, self.width * self._cell_size, end * self._cell_size)
+        # the region can also enclose grid lines, which must stay put
+        self._canvas.dtag(f"!{self.CELL_TAG}", tag)
+
+    @staticmethod
+    def _get_bands(rows: List[int]) -> List[Tuple[int, int]]:
+        """
+        Group rows into bands of consecutive rows
+        :param rows: row indices in ascending order
+        :return: list of bands [start, end)
+        """
+
+        bands = []
+        for row_idx in rows:
+            if bands and bands[-1][1] == row_idx:
+                bands[-1] = (bands[-1][0], row_idx + 1)
+            else:
+                bands.append((row_idx, row_idx + 1))
+
+        return bands
 
     def _get_rectangle_coordinates(self, x: int, y: int) -> Tuple[int, int, int, int]:
         """
@@ -0,0 +1,42 @@
+from gui.canvas import Canvas
+from element.point import Point
+
+from typing import Callable, List
+
+
+class NullCanvas(Canvas):
+    """
+    A rendering backend that draws nothing. Used to run the grid headlessly (no tkinter root or display).
+    """
+
+    def __init__(self, height: int, width: int):
+        """
+        Initialize the NullCanvas
+
+        :param height: height of the board (includes one hidden row at the top)
+        :param width: width of board
+        """
+
+        self.height = height
+        self.width = width
+
+    def raster_point(self, point: Point) -> None:
+        pass
+
+    def move_point(self, point: Point, x: int, y: int) -> None:
+        pass
+
+    def translate_point(self, point: Point, dx: int, dy: int) -> None:
+        pass
+
+    def remove_point(self, point: Point) -> None:
+        pass
+
+    def clear_rows(self, full_rows: List[int]) -> None:
+        pass
+
+    def bind_key_listener(self, key: str, fn: Callable) -> None:
+        pass
+
+    def display_game_over(self, start_over_fn: Callable, score: int):
+        pass
@@ -0,0 +1,45 @@
+from gui.canvas import Canvas
+from element.point import Point
+from game.instrumentation import Instrumentation, Phase
+
+from typing import Callable, List
+
+
+class TimedCanvas(Canvas):
+    """
+    A canvas that forwards to another canvas and records the time spent in drawing calls
+    """
+
+    def __init__(self, canvas: Canvas, instrumentation: Instrumentation):
+        """
+        Initialize the TimedCanvas
+
+        :param canvas: canvas to draw on
+        :param instrumentation: instrumentation to record the RENDER phase in
+        """
+
+        self.height = canvas.height
+        self.width = canvas.width
+        self._inner = canvas
+        self._instrumentation = instrumentation
+
+    def raster_point(self, point: Point) -> None:
+        self._instrumentation.time(Phase.RENDER, self._inner.raster_point, point)
+
+    def move_point(self, point: Point, x: int, y: int) -> None:
+        self._instrumentation.time(Phase.RENDER, self._inner.move_point, point, x, y)
+
+    def translate_point(self, point: Point, dx: int, dy: int) -> None:
+        self._instrumentation.time(Phase.RENDER, self._inner.translate_point, point, dx, dy)
+
+    def remove_point(self, point: Point) -> None:
+        self._instrumentation.time(Phase.RENDER, self._inner.remove_point, point)
+
+    def clear_rows(self, full_rows: List[int]) -> None:
+        self._instrumentation.time(Phase.RENDER, self._inner.clear_rows, full_rows)
+
+    def bind_key_listener(self, key: str, fn: Callable) -> None:
+        self._inner.bind_key_listener(key, fn)
+
+    def display_game_over(self, start_over_fn: Callable, score: int):
+        self._inner.display_game_over(start_over_fn, score)
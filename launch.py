@@ -1,13 +1,95 @@
 import argparse
-from typing import Optional
-from agent.repository import AgentType, get_agent
+import multiprocessing
+import random
+from typing import Any, Dict, List, Optional, Tuple
+from agent.repository import AgentType, get_agent, supports_action_space
+from game.action import ActionSpace
+from game.agent_runner import Fallback
 from game.game import Game
 from game.mode import Mode
+from game.results import DEFAULT_BATCH_SIZE, ResultsFormat, ResultsWriter
+from game.trajectory import TrajectoryWriter
+from configs import config
 
 
 # Default simulation parameters
 DEFAULT_SIMULATION_DELTA_T = 0.1
 DEFAULT_NUM_SIMULATIONS = 100
+DEFAULT_NUM_WORKERS = 1
+
+# trajectory writers of this process by directory, kept across the games a worker process runs so that their steps
+# share shards
+_trajectory_writers: Dict[str, TrajectoryWriter] = {}
+
+
+def run_simulation(
+        id: str,
+        duration: Optional[float],
+        agent_type: AgentType,
+        simulation_delta_t: float,
+        headless: bool,
+        seed: int,
+        instrument: bool = False,
+        agent_fallback: Optional[Fallback] = None,
+        record_replay: bool = False,
+        trajectory_dirname: Optional[str] = None,
+        action_space: ActionSpace = ActionSpace.KEYSTROKE,
+        log_keystroke_delta: bool = False,
+        agent_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Tuple[float, ...], Dict[str, Any]]:
+    """
+    Run a single simulated game. Module level so that it can be shipped to worker processes.
+
+    :param id: id for the game used in outputting metrics
+    :param duration: duration of the game in seconds
+    :param agent_type: type of agent to play the game
+    :param simulation_delta_t: time period to wait between simulation actions
+    :param headless: run the game without a GUI on a virtual clock
+    :param seed: seed for both the block sequence and the agent
+    :param instrument: record per-phase latencies, reporting their percentiles in the result record
+    :param agent_fallback: enforce a decision deadline of simulation_delta_t with this fallback
+    :param record_replay: write a replay of the game
+    :param trajectory_dirname: directory to record the agent's decisions to, if any
+    :param action_space: whether the agent picks keystrokes or a target placement per block
+    :param log_keystroke_delta: append the game time between the agent's keystrokes to Game.KEYSTROKE_DELTA_FPATH
+    :param agent_kwargs: optional keyword arguments for the agent's constructor
+    :return: legacy results row (score and elapsed game time) and typed result record
+    """
+
+    # agents draw from the global RNG - seed it so every game is reproducible regardless of the worker it runs on
+    random.seed(seed)
+    trajectory_writer = None
+    if trajectory_dirname is not None:
+        if trajectory_dirname not in _trajectory_writers:
+            _trajectory_writers[trajectory_dirname] = TrajectoryWriter(
+                trajectory_dirname, height=config.HEIGHT, width=config.WIDTH)
+        trajectory_writer = _trajectory_writers[trajectory_dirname]
+    game = Game(
+        mode=Mode.SIMULATION,
+        id=id,
+        duration=duration,
+        agent=get_agent(agent_type=agent_type, action_space=action_space, **(agent_kwargs or {})),
+        simulation_delta_t=simulation_delta_t,
+        headless=headless,
+        seed=seed,
+        record_results=False,
+        instrument=instrument,
+        agent_fallback=agent_fallback,
+        record_replay=record_replay,
+        trajectory_writer=trajectory_writer,
+        log_keystroke_delta=log_keystroke_delta,
+    )
+    game.run()
+
+    return game.result, game.result_record
+
+
+def _run_simulation_from_args(args: Tuple) -> Tuple[Tuple[float, ...], Dict[str, Any]]:
+    """
+    Unpack run_simulation arguments for Pool.imap
+    """
+
+    return run_simulation(*args)
 
 
 def launch_game(
@@ -19,6 +101,15 @@ def launch_game(
         simulation_delta_t: Optional[float] = None, 
         log_keystroke_delta: bool = False, 
         num_human_benchmark_games: Optional[int] = None,
+        headless: bool = False,
+        num_workers: int = DEFAULT_NUM_WORKERS,
+        seed: Optional[int] = None,
+        instrument: bool = False,
+        agent_fallback: Optional[Fallback] = None,
+        record_replay: bool = False,
+        results_formats: Tuple[ResultsFormat, ...] = (ResultsFormat.CSV,),
+        record_trajectories: bool = False,
+        action_space: ActionSpace = ActionSpace.KEYSTROKE,
     ): 
     """
     Launch a game session.
@@ -29,50 +120,95 @@ def launch_game(
     :param agent_type: type of agent to play the game
     :param num_simulations: number of simulations to run
     :param simulation_delta_t: time period to wait between simulation actions
-    :param log_keystroke_delta: whether to log the keystroke delta
+    :param log_keystroke_delta: whether to log the keystroke delta of every game, the player's or the agent's
     :param num_human_benchmark_games: number of games to play in human benchmark mode
+    :param headless: run simulations without a GUI on a virtual clock
+    :param num_workers: number of worker processes to run simulations on
+    :param seed: base seed for simulations, game i is seeded with seed + i (random if not provided)
+    :param instrument: record per-phase latencies, reporting their percentiles in the typed results
+    :param agent_fallback: enforce a decision deadline of simulation_delta_t with this fallback, reporting the
+        number of missed decisions in the typed results
+    :param record_replay: write a replay of every game to Game.REPLAY_PATH
+    :param results_formats: formats to write the results in
+    :param record_trajectories: record the agent's decisions of every simulation to Game.TRAJECTORY_DIR
+    :param action_space: whether the agent picks keystrokes or a target placement per block
     """
 
+    # human games are few and far between, so their results are written right away
+    results_writer = ResultsWriter(
+        csv_fpath=Game.RESULTS_PATH.format(id) if ResultsFormat.CSV in results_formats else None,
+        npz_fpath=Game.NPZ_RESULTS_PATH.format(id) if ResultsFormat.NPZ in results_formats else None,
+        batch_size=1 if mode == Mode.HUMAN else DEFAULT_BATCH_SIZE,
+    )
+
     def init_game() -> Game:
         return Game(
             mode=mode,
             id=id,
             duration=duration,
-            agent=get_agent(agent_type=agent_type) if agent_type is not None else None,
+            agent=get_agent(agent_type=agent_type, action_space=action_space) if agent_type is not None else None,
             simulation_delta_t=simulation_delta_t,
             log_keystroke_delta=log_keystroke_delta, 
+            headless=headless,
+            instrument=instrument,
+            agent_fallback=agent_fallback,
+            record_replay=record_replay,
+            results_writer=results_writer,
         )
 
-    if mode == Mode.HUMAN:
-        if num_human_benchmark_games is None:
-            continue_game = True
-            while continue_game:
-                game = init_game()
-                continue_game = game.run()
+    with results_writer:
+        if mode == Mode.HUMAN:
+            if num_human_benchmark_games is None:
+                continue_game = True
+                while continue_game:
+                    game = init_game()
+                    continue_game = game.run()
+            else:
+                for _ in range(num_human_benchmark_games):
+                    game = init_game()
+                    game.run()
         else:
-            for _ in range(num_human_benchmark_games):
-                game = init_game()
-                game.run()
-    else:
-        for _ in range(num_simulations):
-            game = init_game()
-            game.run()
+            if seed is None:
+                seed = random.randrange(2 ** 32)
+            trajectory_dirname = Game.TRAJECTORY_DIR.format(id) if record_trajectories else None
+            simulation_args = [
+                (id, duration, agent_type, simulation_delta_t, headless, seed + game_idx, instrument, agent_fallback, record_replay, trajectory_dirname, action_space, log_keystroke_delta)
+                for game_idx in range(num_simulations)
+            ]
+
+            if num_workers == 1:
+                for args in simulation_args:
+                    results_writer.write(*run_simulation(*args))
+            else:
+                with multiprocessing.Pool(processes=num_workers) as pool:
+                    # results stream back as games finish but are yielded in game order
+                    for result in pool.imap(_run_simulation_from_args, simulation_args):
+                        results_writer.write(*result)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Launch Tetris session")
 
     # Game mode and id arguments
-    parser.add_argument("--mode", choices=[mode.name for mode in Mode], help="mode to launch tetris", default=Mode.HUMAN.name)
+    parser.add_argument("--mode", choices=[mode.name for mode in Mode if mode != Mode.REPLAY], help="mode to launch tetris; replays are re-executed with python -m game.replay", default=Mode.HUMAN.name)
     parser.add_argument("--id", type=str, help="id for the game used in outputting metrics", default="default", required=False)
     parser.add_argument("--duration", type=float, help="duration of the game in seconds", required=False)
     # Human mode arguments
-    parser.add_argument("--log_keystroke_delta", action="store_true", help="log the keystroke time delta; only works in human mode", default=False)
+    parser.add_argument("--log_keystroke_delta", action="store_true", help="append the time between keystrokes of every game to out/keystroke_delta_{id}.csv - the player's key presses, or the agent's actions in game time in simulation mode, so the two can be compared", default=False)
     parser.add_argument("--num_human_benchmark_games", type=int, help="number of games to play in human benchmark mode", required=False)
     # Simulation mode arguments - these are required in simulation mode
     parser.add_argument("--agent_type", type=str, help="type of agent to play the game", choices=[agent_type.name for agent_type in AgentType], default=None, required=False)
+    parser.add_argument("--action_space", type=str, help="what the agent decides on: a keystroke per simulation_delta_t, or a target placement per block whose keystrokes are then issued one per simulation_delta_t; the keystroke and decision counts are only written with --results_format NPZ", choices=[action_space.name for action_space in ActionSpace], default=ActionSpace.KEYSTROKE.name, required=False)
     parser.add_argument("--simulation_delta_t", type=float, help="time period to wait between simulation actions", default=DEFAULT_SIMULATION_DELTA_T, required=False)
     parser.add_argument("--num_simulations", type=int, help="number of simulations to run", default=DEFAULT_NUM_SIMULATIONS, required=False)
+    parser.add_argument("--workers", type=int, help="number of worker processes to run simulations on; requires --headless when more than 1", default=DEFAULT_NUM_WORKERS, required=False)
+    parser.add_argument("--seed", type=int, help="base seed for simulations; game i is seeded with seed + i", default=None, required=False)
+    parser.add_argument("--headless", action="store_true", help="run simulations without a GUI on a virtual clock; only works in simulation mode", default=False)
+    parser.add_argument("--instrument", action="store_true", help="record per-phase latencies and write their p50/p90/p99 (us) to the typed results; requires --results_format NPZ", default=False)
+    parser.add_argument("--agent_fallback", type=str, help="run the agent with a decision deadline of simulation_delta_t, taking this fallback on a miss; the miss count is written to the typed results (--results_format NPZ)", choices=[fallback.name for fallback in Fallback], default=None, required=False)
+    parser.add_argument("--results_format", type=str, nargs="+", help="formats to write the results in: the legacy CSV and/or a typed, columnar NumPy archive written in shards (out/results_{id}.{n}.npz, read them with game.results.read_npz_results)", choices=[results_format.name for results_format in ResultsFormat], default=[ResultsFormat.CSV.name], required=False)
+    parser.add_argument("--record_trajectories", action="store_true", help="record (observation, action, reward, done) steps of every simulation to memory-mapped shards in out/trajectories/{id}/; only works in simulation mode", default=False)
+    parser.add_argument("--record_replay", action="store_true", help="write a compact replay of every game to out/replays/{id}/; check them with python -m game.replay", default=False)
     args = parser.parse_args()
 
     # Input validation
@@ -80,7 +216,21 @@ def main():
     if mode == Mode.SIMULATION:
         if args.agent_type is None or args.simulation_delta_t is None or args.num_simulations is None or args.duration is None:
             parser.error("--agent_type, --simulation_delta_t, --num_simulations, and --duration are required when mode is SIMULATION")
+        if not supports_action_space(AgentType[args.agent_type], ActionSpace[args.action_space]):
+            parser.error(f"--agent_type {args.agent_type} does not support --action_space {args.action_space}")
+        if args.workers < 1:
+            parser.error("--workers must be at least 1")
+        if args.workers > 1 and not args.headless:
+            parser.error("--workers greater than 1 requires --headless")
+    if args.instrument and ResultsFormat.NPZ.name not in args.results_format:
+        parser.error("--instrument requires --results_format NPZ, since the legacy results rows are score and elapsed time only")
     if mode == Mode.HUMAN:
+        if args.headless:
+            parser.error("--headless is only supported when mode is SIMULATION")
+        if args.agent_fallback is not None:
+            parser.error("--agent_fallback is only supported when mode is SIMULATION")
+        if args.record_trajectories:
+            parser.error("--record_trajectories is only supported when mode is SIMULATION")
         if (args.duration is None) ^ (args.num_human_benchmark_games is None):
             parser.error("--duration and --num_human_benchmark_games should both be provided or neither be provided")
 
@@ -93,6 +243,15 @@ def main():
         simulation_delta_t=args.simulation_delta_t,
         log_keystroke_delta=args.log_keystroke_delta,
         num_human_benchmark_games=args.num_human_benchmark_games,
+        headless=args.headless,
+        num_workers=args.workers,
+        seed=args.seed,
+        instrument=args.instrument,
+        agent_fallback=Fallback[args.agent_fallback] if args.agent_fallback is not None else None,
+        record_replay=args.record_replay,
+        results_formats=tuple(ResultsFormat[results_format] for results_format in args.results_format),
+        record_trajectories=args.record_trajectories,
+        action_space=ActionSpace[args.action_space],
     )
 
 
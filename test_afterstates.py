@@ -0,0 +1,40 @@
+import numpy as np
+
+from configs import config
+from element.grid import Grid
+from element.point import Point
+from element.tetris_blocks import BLOCK_TYPES
+from game.afterstates import get_afterstates
+from game.game import Game
+from gui.null_canvas import NullCanvas
+
+
+def test_afterstates_match_grid():
+    rng = np.random.default_rng(0)
+    board = np.zeros((config.HEIGHT, config.WIDTH), dtype=bool)
+    # full rows at the bottom apart from a well, so that some placements clear rows
+    board[-4:] = True
+    # ragged stack above them, keeping the well open
+    board[-8:-4] = rng.random((4, config.WIDTH)) < 0.4
+    board[:, 3] = False
+
+    for block_type in BLOCK_TYPES:
+        afterstates = get_afterstates(board, block_type)
+        assert len(afterstates.placements) == len(afterstates.boards) > 0
+
+        for placement, after_board, num_rows_cleared, points in zip(*afterstates):
+            grid = Grid(NullCanvas(height=config.HEIGHT, width=config.WIDTH))
+            for y, x in zip(*np.nonzero(board)):
+                grid.add_point(Point(x=int(x), y=int(y), color='black'))
+            for x, y in placement.cells:
+                assert grid.add_point(Point(x=x, y=y, color='black'))
+            expected_num_rows_cleared = grid.clear_full_rows()
+
+            assert num_rows_cleared == expected_num_rows_cleared
+            assert points == Game.POINTS[expected_num_rows_cleared]
+            assert (after_board == grid.get_observation()).all()
+
+    # a vertical line dropped down the well clears all four rows
+    assert get_afterstates(board, BLOCK_TYPES[2]).num_rows_cleared.max() == 4
+
+    print("test_afterstates_match_grid success!")
@@ -0,0 +1,64 @@
+import random
+
+import numpy as np
+
+from agent.agent import Agent
+from agent.biased_random_agent import BiasedRandomAgent
+from agent.random_agent import RandomAgent
+from configs import config
+from game.action import NO_ACTION, Action
+from game.vector_game import VectorGame
+
+
+class AlternatingAgent(Agent):
+    """
+    Rotates on every other call and takes no action otherwise
+    """
+
+    def __init__(self):
+        self.num_calls = 0
+
+    def get_action(self, observation, state=None):
+        self.num_calls += 1
+        return Action.ROTATE if self.num_calls % 2 else None
+
+
+def test_default_get_actions():
+    agent = AlternatingAgent()
+    actions = agent.get_actions(np.zeros((5, config.HEIGHT, config.WIDTH), dtype=bool))
+    assert actions.tolist() == [Action.ROTATE.value, NO_ACTION] * 2 + [Action.ROTATE.value]
+    assert agent.num_calls == 5
+
+    print("test_default_get_actions success!")
+
+
+def test_vectorized_random_agents():
+    num_games = 100000
+    observations = np.zeros((num_games, config.HEIGHT, config.WIDTH), dtype=bool)
+    codes = np.array([action.value for action in Action])
+    for agent_cls, probabilities in (
+        (RandomAgent, np.full(len(Action), 1 / len(Action))),
+        (BiasedRandomAgent, BiasedRandomAgent.PROBABILITIES / BiasedRandomAgent.PROBABILITIES.sum()),
+    ):
+        random.seed(0)
+        actions = agent_cls().get_actions(observations)
+        assert actions.shape == (num_games,)
+        # seeding the global RNG makes the batched draws reproducible
+        random.seed(0)
+        assert (agent_cls().get_actions(observations) == actions).all()
+
+        # sampled with the same probabilities as get_action
+        frequencies = np.array([(actions == code).mean() for code in codes])
+        expected = np.zeros(len(codes))
+        for action, probability in zip(agent_cls.ACTIONS, probabilities):
+            expected[codes == action.value] = probability
+        assert np.abs(frequencies - expected).max() < 0.01
+
+    # one call steps every game of a vector game
+    vector_game = VectorGame(num_games=1000, seeds=range(1000))
+    agent = BiasedRandomAgent()
+    for _ in range(100):
+        vector_game.step(agent.get_actions(vector_game.get_observations()))
+    assert vector_game.get_observations().any(axis=(1, 2)).all()
+
+    print("test_vectorized_random_agents success!")
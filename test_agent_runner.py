@@ -0,0 +1,157 @@
+import threading
+import time
+
+import numpy as np
+
+from agent.agent import Agent
+from agent.random_agent import RandomAgent
+from game.action import Action
+from game.agent_runner import DeadlineAgentRunner, Fallback
+from game.clock import VirtualClock
+from game.game import Game
+from game.mode import Mode
+from game.state import GameState
+
+
+class BlockingAgent(Agent):
+    """
+    Returns its next scripted action once released, or immediately when not gated
+    """
+
+    DEFAULT_ACTION = Action.MOVE_DOWN
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.gate.set()
+        self.actions = iter([Action.MOVE_LEFT, Action.ROTATE, Action.MOVE_RIGHT, Action.ROTATE])
+
+    def get_action(self, observation: np.ndarray, state: GameState) -> Action:
+        self.gate.wait()
+        return next(self.actions)
+
+
+def _run(fallback: Fallback):
+    agent = BlockingAgent()
+    runner = DeadlineAgentRunner(agent, deadline=0.05, fallback=fallback)
+    observation = np.zeros((2, 2), dtype=bool)
+
+    actions = [runner.get_action(observation, None)]
+    agent.gate.clear()
+    # the agent misses this deadline and is still busy at the next decision
+    actions.append(runner.get_action(observation, None))
+    actions.append(runner.get_action(observation, None))
+    agent.gate.set()
+    # the late decision has finished and is discarded in favor of a fresh one
+    runner._pending.result()
+    actions.append(runner.get_action(observation, None))
+    runner.shutdown()
+
+    assert (runner.num_decisions, runner.num_missed) == (4, 2)
+
+    return actions
+
+
+def test_fallbacks():
+    assert _run(Fallback.NOOP) == [Action.MOVE_LEFT, None, None, Action.MOVE_RIGHT]
+    assert _run(Fallback.REPEAT_LAST) == [Action.MOVE_LEFT, Action.MOVE_LEFT, Action.MOVE_LEFT, Action.MOVE_RIGHT]
+    assert _run(Fallback.AGENT_DEFAULT) == [Action.MOVE_LEFT, Action.MOVE_DOWN, Action.MOVE_DOWN, Action.MOVE_RIGHT]
+
+    print("test_fallbacks success!")
+
+
+def test_game_reports_missed_decisions():
+    game = Game(
+        mode=Mode.SIMULATION,
+        id="test",
+        duration=10,
+        agent=RandomAgent(),
+        simulation_delta_t=0.1,
+        headless=True,
+        seed=0,
+        record_results=False,
+        agent_fallback=Fallback.NOOP,
+    )
+    game.run()
+
+    # a fast agent never misses
+    assert len(game.result) == 2
+    assert game.result_record["num_missed"] == 0
+
+    print("test_game_reports_missed_decisions success!")
+
+
+class ClockedAgent(Agent):
+    """
+    Takes a scripted amount of time on a virtual clock per decision
+    """
+
+    def __init__(self, clock: VirtualClock, durations):
+        self.clock = clock
+        self.durations = iter(durations)
+
+    def get_action(self, observation: np.ndarray, state: GameState = None) -> Action:
+        self.clock.advance_to(self.clock.time() + next(self.durations))
+        return Action.ROTATE
+
+
+def test_clocked_runner():
+    clock = VirtualClock()
+    agent = ClockedAgent(clock, [0.05, 0.25, 0.0])
+    runner = DeadlineAgentRunner(agent, deadline=0.1, fallback=Fallback.NOOP, clock=clock.time)
+    observation = np.zeros((2, 2), dtype=bool)
+
+    actions = [runner.get_action(observation) for _ in range(3)]
+    # the second decision takes longer than the deadline on the clock and is discarded
+    assert actions == [Action.ROTATE, None, Action.ROTATE]
+    assert (runner.num_decisions, runner.num_missed) == (3, 1)
+
+    print("test_clocked_runner success!")
+
+
+def test_headless_deadline_is_deterministic():
+    # decisions take no time on the virtual clock, however long they take in real time
+    agent = BlockingAgent()
+    agent.actions = iter(lambda: time.sleep(0.002) or Action.ROTATE, None)
+    game = Game(
+        mode=Mode.SIMULATION,
+        id="test",
+        duration=2,
+        agent=agent,
+        simulation_delta_t=0.001,
+        headless=True,
+        seed=0,
+        record_results=False,
+        agent_fallback=Fallback.NOOP,
+    )
+    game.run()
+
+    assert game.result_record["num_missed"] == 0
+
+    print("test_headless_deadline_is_deterministic success!")
+
+
+def test_requested_decisions():
+    agent = BlockingAgent()
+    runner = DeadlineAgentRunner(agent, deadline=0.05, fallback=Fallback.REPEAT_LAST)
+    observation = np.zeros((2, 2), dtype=bool)
+
+    agent.gate.clear()
+    assert runner.request(observation)
+    # polling never waits for the agent
+    assert runner.poll() == (False, None)
+    agent.gate.set()
+    runner._pending.result()
+    assert runner.poll() == (True, Action.MOVE_LEFT)
+
+    agent.gate.clear()
+    assert runner.request(observation)
+    assert runner.miss() == Action.MOVE_LEFT
+    # the worker is still busy with the missed decision
+    assert not runner.request(observation)
+    assert runner.miss() == Action.MOVE_LEFT
+    agent.gate.set()
+    runner.shutdown()
+
+    assert (runner.num_decisions, runner.num_missed) == (3, 2)
+
+    print("test_requested_decisions success!")
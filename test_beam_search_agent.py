@@ -0,0 +1,65 @@
+import pytest
+
+from agent.beam_search_agent import BeamSearchAgent
+from game.action import Action
+from game.game import Game
+from game.mode import Mode
+
+
+def _play(agent: BeamSearchAgent, duration: float) -> Game:
+    game = Game(
+        mode=Mode.SIMULATION,
+        id="test",
+        duration=duration,
+        agent=agent,
+        simulation_delta_t=0.1,
+        headless=True,
+        seed=0,
+        record_results=False,
+    )
+    game.run()
+
+    return game
+
+
+def test_beam_search_clears_rows():
+    agent = BeamSearchAgent(beam_width=2, time_budget=None, max_depth=2)
+    game = _play(agent, duration=60)
+
+    score, elapsed = game.result
+    # survives the whole game and clears rows (random agents score 0)
+    assert elapsed == 60
+    assert score > 0
+    assert agent.last_depth == 2
+
+    print("test_beam_search_clears_rows success!")
+
+
+def test_beam_search_degrades_under_budget():
+    # no time for lookahead beyond what is already cached - the first ply is always searched and the agent still plays
+    agent = BeamSearchAgent(time_budget=0.0, max_depth=3)
+    game = _play(agent, duration=30)
+
+    score, elapsed = game.result
+    assert elapsed == 30
+    assert score > 0
+
+    print("test_beam_search_degrades_under_budget success!")
+
+
+def test_beam_search_budget_covers_first_ply():
+    # a fresh block can be swapped into the empty hold, which takes expanding every block type to weigh
+    game = Game(mode=Mode.SIMULATION, id="test", headless=True, seed=0, record_results=False)
+    game.start()
+    state = game.get_state()
+    assert state.can_save and state.saved_block_type is None
+
+    # with no time left the swap is not weighed and the agent heads for the best placement
+    agent = BeamSearchAgent(time_budget=0.0, max_depth=3)
+    assert agent.get_action(game.get_observation(), state) != Action.SAVE_BLOCK
+    assert agent.last_depth == 1
+
+    with pytest.raises(AssertionError):
+        agent.get_action(game.get_observation())
+
+    print("test_beam_search_budget_covers_first_ply success!")
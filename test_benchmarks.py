@@ -0,0 +1,39 @@
+import json
+
+from benchmarks.suite import find_regressions, main
+
+
+def test_regressions_use_relative_timings():
+    baseline = {
+        "a": {"seconds": 1.0, "relative": 10.0},
+        "b": {"seconds": 1.0, "relative": 10.0},
+        "c": {"seconds": 1.0},
+    }
+    results = {
+        # twice as slow, but so is the machine
+        "a": {"seconds": 2.0, "relative": 10.0},
+        "b": {"seconds": 1.0, "relative": 20.0},
+        # baselines without relative timings fall back to seconds
+        "c": {"seconds": 2.0, "relative": 10.0},
+        "d": {"seconds": 5.0, "relative": 10.0},
+    }
+    regressions = find_regressions(results, baseline, max_regression_pct=50)
+    assert [regression.split(":")[0] for regression in regressions] == ["b", "c"]
+
+    print("test_regressions_use_relative_timings success!")
+
+
+def test_update_baseline_merges(tmp_path):
+    baseline_fpath = tmp_path / "baseline.json"
+    baseline_fpath.write_text(json.dumps({"canvas.add_remove_block": {"seconds": 1.0}}))
+
+    args = ["--benchmarks", "grid.can_place", "--repeat", "1", "--baseline", str(baseline_fpath)]
+    assert main(args + ["--update_baseline"]) == 0
+    text = baseline_fpath.read_text()
+    assert text.endswith("}\n")
+    baseline = json.loads(text)
+    # benchmarks that did not run are kept
+    assert set(baseline) == {"canvas.add_remove_block", "grid.can_place"}
+    assert baseline["grid.can_place"]["relative"] > 0
+
+    print("test_update_baseline_merges success!")
@@ -0,0 +1,75 @@
+from agent.beam_search_agent import BeamSearchAgent
+from game.action import NO_ACTION
+from game.env import TetrisEnv
+from game.game import Game
+from game.mode import Mode
+from test_helpers import ScriptedAgent
+
+
+def test_matches_game():
+    for seed, agent in ((0, ScriptedAgent(seed=100)), (1, BeamSearchAgent(beam_width=2, time_budget=None, max_depth=1))):
+        observations = []
+        actions = []
+        get_action = agent.get_action
+
+        def recording_get_action(observation, state):
+            action = get_action(observation, state)
+            observations.append(observation.copy())
+            actions.append(action)
+            return action
+
+        agent.get_action = recording_get_action
+        game = Game(
+            mode=Mode.SIMULATION,
+            id="env",
+            duration=30,
+            agent=agent,
+            simulation_delta_t=0.1,
+            headless=True,
+            seed=seed,
+            record_results=False,
+        )
+        game.run()
+
+        env = TetrisEnv(simulation_delta_t=0.1)
+        assert env.steps_per_gravity == 10
+        observation = env.reset(seed=seed)
+        score = 0
+        done = False
+        for step, action in enumerate(actions):
+            assert not done
+            assert (observation == observations[step]).all()
+            observation, reward, done, info = env.step(action)
+            score += reward
+            assert info["score"] == score
+
+        # the game ends with a gravity tick after its last action or with the last action
+        if not done:
+            observation, reward, done, info = env.step(NO_ACTION)
+            score += reward
+        assert score == game.result[0]
+
+    print("test_matches_game success!")
+
+
+def test_max_steps():
+    env = TetrisEnv(max_steps=25)
+    env.reset(seed=0)
+    for step in range(25):
+        observation, reward, done, info = env.step(NO_ACTION)
+        assert done == (step == 24)
+    assert info["truncated"]
+
+    # without a step limit, gravity stacks blocks until the board fills up - see env.no_action_episode in the
+    # benchmarks for how long that takes
+    env = TetrisEnv()
+    env.reset(seed=0)
+    num_steps = 0
+    done = False
+    while not done:
+        observation, reward, done, info = env.step(NO_ACTION)
+        num_steps += 1
+    assert not info["truncated"]
+    assert num_steps == info["num_steps"]
+
+    print("test_max_steps success!")
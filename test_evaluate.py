@@ -0,0 +1,72 @@
+import math
+
+import numpy as np
+
+from agent.repository import AgentType
+from evaluate import Entrant, compare, get_entrants, main, run_tournament, sign_test, summarize
+from game.action import ActionSpace
+from game.results import read_npz_results
+
+
+def get_outcomes(records):
+    # result records hold nan latencies, which never compare equal
+    return [
+        [(record["score"], record["pieces_placed"], record["keystrokes"]) for record in entrant_records]
+        for entrant_records in records
+    ]
+
+
+def test_statistics():
+    # all 10 games won: 2 * 0.5 ** 10
+    assert math.isclose(sign_test(10, 0), 2 / 1024)
+    assert sign_test(5, 5) == 1.0
+    assert sign_test(0, 0) == 1.0
+    assert math.isclose(sign_test(2, 8), 2 * (1 + 10 + 45) / 1024)
+
+    comparison = compare(np.array([3, 5, 5, 9]), np.array([1, 5, 7, 2]))
+    assert (comparison.wins, comparison.ties, comparison.losses) == (2, 1, 1)
+    assert comparison.mean_diff == 1.75
+    assert comparison.ci_low < comparison.mean_diff < comparison.ci_high
+
+    summary = summarize(np.arange(101))
+    assert summary["mean"] == 50 and summary["p10"] == 10 and summary["p50"] == 50 and summary["max"] == 100
+
+    print("test_statistics success!")
+
+
+def test_tournament(tmp_path, capsys):
+    entrants = get_entrants(list(AgentType), [ActionSpace.PLACEMENT])
+    # the biased random agent has no placement action space
+    assert entrants == [
+        Entrant(AgentType.RANDOM, ActionSpace.PLACEMENT),
+        Entrant(AgentType.BEAM_SEARCH, ActionSpace.PLACEMENT),
+    ]
+
+    # games are seeded, so they play out the same on any number of workers
+    records = run_tournament(entrants, num_games=3, duration=20, seed=5, num_workers=1)
+    parallel_records = run_tournament(entrants, num_games=3, duration=20, seed=5, num_workers=2)
+    assert get_outcomes(records) == get_outcomes(parallel_records)
+    for entrant, entrant_records in zip(entrants, records):
+        assert [record["seed"] for record in entrant_records] == [5, 6, 7]
+        assert all(record["id"] == entrant.name for record in entrant_records)
+    assert sum(record["score"] for record in records[1]) > 0
+
+    output_fpath = str(tmp_path / "tournament.npz")
+    assert main([
+        "--agent_types", "RANDOM", "BEAM_SEARCH",
+        "--action_spaces", "PLACEMENT",
+        "--num_games", "3",
+        "--duration", "20",
+        "--seed", "5",
+        "--workers", "1",
+        "--output", output_fpath,
+    ]) == 0
+    report = capsys.readouterr().out
+    # best first, then the paired comparison
+    assert report.index("BEAM_SEARCH:PLACEMENT") < report.index("RANDOM:PLACEMENT")
+    assert "BEAM_SEARCH:PLACEMENT vs RANDOM:PLACEMENT" in report
+
+    results = read_npz_results(output_fpath)
+    assert results["score"].tolist() == [record["score"] for entrant_records in records for record in entrant_records]
+
+    print("test_tournament success!")
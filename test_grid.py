@@ -1,43 +1,20 @@
 from gui.canvas import Canvas
+from gui.null_canvas import NullCanvas
+from element.features import compute_column_heights, compute_features
 from element.grid import Grid
 from element.point import Point
+from element.zobrist import hash_observations, hash_rows
 from configs import config
 
+import random
+import tkinter as tk
 from typing import Callable
 
-from overrides import override
+import pytest
 
 
-# TODO replace this with a mock library
-class MockCanvas(Canvas):
-    """
-    A mock canvas used for testing
-    """
-
-    @override
-    def raster_point(self, point: Point) -> None:
-        pass
-    
-    @override
-    def move_point(self, point: Point, x: int, y: int) -> None:
-        pass
-    
-    @override
-    def translate_point(self, point: Point, dx: int, dy: int) -> None:
-        pass
-
-    @override
-    def remove_point(self, point: Point) -> None:
-        pass
-    
-
 def create_grid() -> Grid:
-    canvas = MockCanvas(
-        root=None, 
-        height=config.HEIGHT, 
-        width=config.WIDTH,
-        cell_size=config.CELL_SIZE,
-        padding=config.PADDING)
+    canvas = NullCanvas(height=config.HEIGHT, width=config.WIDTH)
 
     return Grid(canvas)
 
@@ -413,6 +390,152 @@ def test_clear_rows_multiple():
     print("test_clear_rows_multiple success!")
 
 
+def test_observation():
+    grid = create_grid()
+
+    observation = grid.get_observation()
+    assert observation.shape == (grid.height, grid.width)
+    assert not observation.any()
+    assert _is_error_caught(lambda: observation.__setitem__((0, 0), True))
+
+    # populate a full row at row_idx=19 and a few points around it
+    for x in range(grid.width):
+        grid.add_point(Point(x=x, y=19, color='black'))
+    moving_point = Point(x=2, y=20, color='black')
+    grid.add_point(moving_point)
+    grid.add_point(Point(x=5, y=12, color='black'))
+    grid.batch_translate({moving_point: (1, 0)})
+
+    # the view reflects changes made after it was handed out
+    def _check_observation():
+        assert observation is grid.get_observation()
+        for y in range(grid.height):
+            for x in range(grid.width):
+                assert observation[y, x] == (grid.get_point(x, y) is not None)
+
+    _check_observation()
+
+    snapshot = grid.get_observation(copy=True)
+    assert grid.clear_full_rows() == 1
+    _check_observation()
+
+    # the copy is a writeable snapshot of the state before the clear
+    assert snapshot[19].all()
+    snapshot[0, 0] = True
+
+    print("test_observation success!")
+
+
+def test_features():
+    rng = random.Random(0)
+    grid = create_grid()
+
+    def _check_features():
+        observation = grid.get_observation()
+        assert (grid.get_features() == compute_features(observation)).all()
+        assert (grid.get_column_heights() == compute_column_heights(observation)).all()
+
+    _check_features()
+
+    points = []
+    for _ in range(2000):
+        op = rng.random()
+        if op < 0.5:
+            # stack points towards the bottom so rows fill up
+            x = rng.randrange(grid.width)
+            y = grid.height - 1 - min(rng.randrange(grid.height), rng.randrange(grid.height))
+            point = Point(x=x, y=y, color='black')
+            if grid.add_point(point):
+                points.append(point)
+        elif op < 0.6 and points:
+            point = points.pop(rng.randrange(len(points)))
+            if grid.get_point(point.x, point.y) is point:
+                grid.remove(point)
+        elif op < 0.8 and points:
+            point = rng.choice(points)
+            if grid.get_point(point.x, point.y) is point:
+                grid.batch_translate({point: (rng.choice([-1, 0, 1]), rng.choice([0, 1]))})
+        else:
+            grid.clear_full_rows()
+            points = [point for point in points if grid.get_point(point.x, point.y) is point]
+
+        # read the features at irregular intervals so dirty state accumulates across operations
+        if rng.random() < 0.3:
+            _check_features()
+
+    _check_features()
+
+    print("test_features success!")
+
+
+def test_hash():
+    rng = random.Random(0)
+    grid = create_grid()
+    assert grid.get_hash() == 0
+
+    points = []
+    for _ in range(1000):
+        if rng.random() < 0.8:
+            point = Point(x=rng.randrange(grid.width), y=grid.height - 1 - rng.randrange(grid.height // 2), color='black')
+            if grid.add_point(point):
+                points.append(point)
+        else:
+            grid.clear_full_rows()
+            points = [point for point in points if grid.get_point(point.x, point.y) is point]
+
+        observation = grid.get_observation()
+        assert grid.get_hash() == hash_rows(grid.get_rows(), grid.width) == int(hash_observations(observation))
+
+    # the hash only depends on the occupied cells
+    for point in points:
+        grid.remove(point)
+    assert grid.get_hash() == 0
+
+    print("test_hash success!")
+
+
+def test_canvas_clear_rows():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display")
+
+    try:
+        canvas = Canvas(root, height=config.HEIGHT, width=config.WIDTH, cell_size=config.CELL_SIZE, padding=config.PADDING)
+        widget = next(child for child in root.winfo_children() if isinstance(child, tk.Canvas))
+        num_items = len(widget.find_all())
+        grid = Grid(canvas)
+        rng = random.Random(0)
+        # full rows split the stack into several bands, which shift by different amounts
+        for y in range(8, grid.height):
+            is_full = y in (10, 14, 15, 20)
+            for x in range(grid.width):
+                if is_full or rng.random() < 0.5:
+                    grid.add_point(Point(x=x, y=y, color='red'))
+
+        assert grid.clear_full_rows() == 4
+        # drawn and cleared points reuse the canvas items rather than creating new ones
+        for _ in range(3):
+            point = Point(x=0, y=0, color='blue')
+            grid.add_point(point)
+            grid.remove(point)
+        assert len(widget.find_all()) == num_items
+
+        # every point is drawn in its cell, and nothing else is on the board
+        points = [grid.get_point(x, y) for y in range(grid.height) for x in range(grid.width)]
+        drawn = {}
+        for item in widget.find_withtag(Canvas.CELL_TAG):
+            x1, y1, _, y2 = widget.coords(item)
+            if y2 > 0:
+                drawn[(int(x1 // config.CELL_SIZE), int(y1 // config.CELL_SIZE))] = widget.itemcget(item, "fill")
+        assert drawn == {(point.x, point.y): point.color for point in points if point is not None}
+    finally:
+        # a failed assertion must not leave the root behind for later Tk tests
+        root.destroy()
+
+    print("test_canvas_clear_rows success!")
+
+
 def _is_error_caught(fn: Callable):
     try:
         fn()
@@ -430,3 +553,7 @@ if __name__ == '__main__':
     test_clear_rows_single()
     test_clear_rows_top()
     test_clear_rows_multiple()
+    test_observation()
+    test_features()
+    test_hash()
+    test_canvas_clear_rows()
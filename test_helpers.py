@@ -0,0 +1,29 @@
+import random
+from typing import List, Optional
+
+import numpy as np
+
+from agent.agent import Agent
+from game.action import Action
+from game.state import GameState
+
+
+class ScriptedAgent(Agent):
+    """
+    Plays seeded random actions and records what it saw and did
+    """
+
+    ACTIONS = list(Action)
+    WEIGHTS = [0.2, 0.05, 0.3, 0.3, 0.1, 0.05]
+
+    def __init__(self, seed: int):
+        self._random = random.Random(seed)
+        self.observations: List[np.ndarray] = []
+        self.actions: List[Action] = []
+
+    def get_action(self, observation: np.ndarray, state: Optional[GameState] = None) -> Action:
+        action = self._random.choices(self.ACTIONS, weights=self.WEIGHTS)[0]
+        self.observations.append(observation.copy())
+        self.actions.append(action)
+
+        return action
@@ -0,0 +1,59 @@
+import math
+import random
+
+import numpy as np
+
+from agent.random_agent import RandomAgent
+from game.game import Game
+from game.instrumentation import SUMMARY_COLUMNS, LatencyHistogram, Phase
+from game.mode import Mode
+
+
+def test_histogram_percentiles():
+    rng = random.Random(0)
+    samples = sorted(rng.lognormvariate(math.log(1e-4), 1.0) for _ in range(10000))
+
+    histogram = LatencyHistogram()
+    assert math.isnan(histogram.percentile(50))
+    for sample in samples:
+        histogram.record(sample)
+
+    assert histogram.count == len(samples)
+    assert histogram.max == samples[-1]
+    # within one bucket of the exact percentile
+    bucket_ratio = 2 ** (1 / LatencyHistogram.BUCKETS_PER_DOUBLING)
+    for percentile in (50, 90, 99):
+        exact = samples[int(percentile / 100 * len(samples)) - 1]
+        assert exact / bucket_ratio <= histogram.percentile(percentile) <= exact * bucket_ratio
+
+    print("test_histogram_percentiles success!")
+
+
+def test_instrumented_game():
+    random.seed(0)
+    game = Game(
+        mode=Mode.SIMULATION,
+        id="test",
+        duration=30,
+        agent=RandomAgent(),
+        simulation_delta_t=0.1,
+        headless=True,
+        seed=0,
+        record_results=False,
+        instrument=True,
+    )
+    game.run()
+
+    # the latency percentiles are in the typed record, not the legacy results row
+    assert len(game.result) == 2
+    summary = game.instrumentation.summary_dict()
+    # a game over ends the game inside a timed move, which is recorded after the record is taken
+    columns = [column for column in SUMMARY_COLUMNS if not column.startswith(Phase.MOVE.name.lower())]
+    assert np.allclose([game.result_record[column] for column in columns], [summary[column] for column in columns], equal_nan=True)
+    for phase in (Phase.AGENT, Phase.OBSERVATION, Phase.MOVE, Phase.RENDER):
+        assert game.instrumentation.get_histogram(phase).count > 0
+        assert summary[f"{phase.name.lower()}_p50_us"] > 0
+    # nothing is scheduled on a real clock when headless
+    assert math.isnan(summary["tick_jitter_p99_us"])
+
+    print("test_instrumented_game success!")
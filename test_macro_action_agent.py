@@ -0,0 +1,165 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from agent.beam_search_agent import BeamSearchAgent
+from agent.macro_action_agent import MacroActionAgent
+from agent.placement_agent import PlacementAgent
+from agent.repository import AgentType, get_agent, supports_action_space
+from game.action import ActionSpace
+from game.game import Game
+from game.mode import Mode
+from game.results import ResultsFormat, read_npz_results
+import launch
+
+
+class RecordingPlacementAgent(PlacementAgent):
+    """
+    Placement agent that keeps the cells of every target it picks, swapping the first block
+    """
+
+    def __init__(self):
+        self.targets = []
+
+    def get_placement(self, observation, state, placements):
+        if state.can_save and state.saved_block_type is None:
+            return None
+        # the placement furthest to the right
+        placement_idx = max(range(len(placements)), key=lambda idx: max(x for x, _ in placements[idx].cells))
+        self.targets.append(placements[placement_idx].cells)
+        return placement_idx
+
+
+def test_blocks_lock_at_targets(tmp_path, monkeypatch):
+    monkeypatch.setattr(Game, "KEYSTROKE_DELTA_FPATH", os.path.join(tmp_path, "keystroke_delta_{0}.csv"))
+    placement_agent = RecordingPlacementAgent()
+    agent = MacroActionAgent(placement_agent)
+    boards = []
+    get_action = agent.get_action
+
+    def recording_get_action(observation, state):
+        boards.append(state.board.copy())
+        return get_action(observation, state)
+
+    agent.get_action = recording_get_action
+    num_plans = 0
+    get_placements = MacroActionAgent._get_placements
+
+    def counting_get_placements(state):
+        nonlocal num_plans
+        num_plans += 1
+        return get_placements(state)
+
+    monkeypatch.setattr(MacroActionAgent, "_get_placements", staticmethod(counting_get_placements))
+    game = Game(
+        mode=Mode.SIMULATION,
+        id="macro",
+        duration=60,
+        agent=agent,
+        simulation_delta_t=0.1,
+        headless=True,
+        seed=0,
+        record_results=False,
+        log_keystroke_delta=True,
+    )
+    game.run()
+
+    record = game.result_record
+    # one decision per block, plus swapping the first one
+    assert record["decisions"] == len(placement_agent.targets) + 1 == agent.num_decisions
+    assert record["pieces_placed"] >= len(placement_agent.targets) - 1
+    assert record["keystrokes"] > 2 * record["decisions"]
+    assert record["agent"] == "MacroActionAgent(RecordingPlacementAgent)"
+    # placements are searched once per target and again only when gravity moved the block off its path
+    assert record["decisions"] <= num_plans < record["keystrokes"] / 2
+
+    # every target is where the next settled board has the block, as long as no rows were cleared
+    locked = [board for prev, board in zip(boards, boards[1:]) if not np.array_equal(prev, board)]
+    num_checked = 0
+    for target, prev, board in zip(placement_agent.targets, [boards[0]] + locked, locked):
+        if board.sum() == prev.sum() + len(target):
+            assert all(board[y, x] and not prev[y, x] for x, y in target)
+            num_checked += 1
+    assert num_checked > 5
+
+    # the agent's keystrokes are logged at the simulation cadence, like a human's key presses
+    with open(os.path.join(tmp_path, "keystroke_delta_macro.csv")) as f:
+        deltas = np.array([float(line) for line in f])
+    assert len(deltas) == record["keystrokes"]
+    assert np.allclose(deltas / 0.1, np.round(deltas / 0.1))
+
+    print("test_blocks_lock_at_targets success!")
+
+
+def test_placement_action_space():
+    agent = get_agent(AgentType.BEAM_SEARCH, action_space=ActionSpace.PLACEMENT, time_budget=None, max_depth=1)
+    assert isinstance(agent, MacroActionAgent) and isinstance(agent.agent, BeamSearchAgent)
+    game = Game(
+        mode=Mode.SIMULATION,
+        id="macro",
+        duration=60,
+        agent=agent,
+        simulation_delta_t=0.1,
+        headless=True,
+        seed=1,
+        record_results=False,
+    )
+    game.run()
+
+    record = game.result_record
+    assert record["score"] > 0
+    # the search runs once per block (and once more for a block swapped in) rather than once per keystroke
+    assert record["decisions"] <= 2 * record["pieces_placed"] + 1
+    assert record["keystrokes"] > 2 * record["decisions"]
+
+    # the biased random agent has no placement action space
+    assert not supports_action_space(AgentType.BIASED_RANDOM, ActionSpace.PLACEMENT)
+    with pytest.raises(ValueError):
+        get_agent(AgentType.BIASED_RANDOM, action_space=ActionSpace.PLACEMENT)
+
+    print("test_placement_action_space success!")
+
+
+def test_launch_validates_action_space(monkeypatch):
+    launched = []
+    monkeypatch.setattr(launch, "launch_game", lambda **kwargs: launched.append(kwargs))
+    # validating the flags does not build an agent
+    monkeypatch.setattr(launch, "get_agent", None)
+    args = ["launch.py", "--mode", "SIMULATION", "--duration", "10", "--headless", "--action_space", "PLACEMENT"]
+
+    monkeypatch.setattr(sys, "argv", args + ["--agent_type", "BIASED_RANDOM"])
+    with pytest.raises(SystemExit):
+        launch.main()
+    monkeypatch.setattr(sys, "argv", args + ["--agent_type", "BEAM_SEARCH"])
+    launch.main()
+    assert [kwargs["agent_type"] for kwargs in launched] == [AgentType.BEAM_SEARCH]
+
+    print("test_launch_validates_action_space success!")
+
+
+def test_launch_logs_agent_keystroke_deltas(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for num_workers in (1, 2):
+        launch.launch_game(
+            mode=Mode.SIMULATION,
+            id=f"deltas{num_workers}",
+            duration=20,
+            agent_type=AgentType.RANDOM,
+            num_simulations=3,
+            simulation_delta_t=0.1,
+            log_keystroke_delta=True,
+            headless=True,
+            num_workers=num_workers,
+            seed=0,
+            results_formats=(ResultsFormat.NPZ,),
+        )
+
+        # every game's deltas are kept, not just the last game's
+        with open(Game.KEYSTROKE_DELTA_FPATH.format(f"deltas{num_workers}")) as f:
+            deltas = np.array([float(line) for line in f])
+        results = read_npz_results(Game.NPZ_RESULTS_PATH.format(f"deltas{num_workers}"))
+        assert len(deltas) == results["keystrokes"].sum() > 0
+
+    print("test_launch_logs_agent_keystroke_deltas success!")
@@ -0,0 +1,120 @@
+import random
+from collections import deque
+from typing import Dict, FrozenSet, Tuple
+
+from configs import config
+from element.grid import Grid
+from element.placement import get_block_placements
+from element.point import Point
+from element.tetris_blocks import BLOCK_TYPES
+from game.action import Action
+from gui.null_canvas import NullCanvas
+
+
+def create_grid() -> Grid:
+    return Grid(NullCanvas(height=config.HEIGHT, width=config.WIDTH))
+
+
+def _fill_random(grid: Grid, rng: random.Random) -> None:
+    # ragged stack in the bottom half with overhangs
+    for y in range(grid.height // 2, grid.height):
+        for x in range(grid.width):
+            if rng.random() < 0.25 + 0.5 * (y - grid.height // 2) / grid.height:
+                grid.add_point(Point(x=x, y=y, color='black'))
+
+
+def _brute_force_placements(rows, block_type) -> Dict[FrozenSet[Tuple[int, int]], int]:
+    """
+    BFS over (rotation, x, y) with real Block moves, returning the shortest action count to lock each cell set
+    """
+
+    def _replay(actions):
+        grid = create_grid()
+        for y, row in enumerate(rows):
+            for x in range(grid.width):
+                if (row >> x) & 1:
+                    grid.add_point(Point(x=x, y=y, color='black'))
+        block = block_type(grid)
+        assert block.activate()
+        for action in actions:
+            {
+                Action.ROTATE: block.rotate,
+                Action.MOVE_LEFT: lambda: block.translate(dx=-1, dy=0),
+                Action.MOVE_RIGHT: lambda: block.translate(dx=1, dy=0),
+                Action.MOVE_DOWN: lambda: block.translate(dx=0, dy=1),
+            }[action]()
+        return block
+
+    start = _replay([])
+    seen = {(start.rotation_state, start.x, start.y): ()}
+    queue = deque([()])
+    results: Dict[FrozenSet[Tuple[int, int]], int] = {}
+    while queue:
+        actions = queue.popleft()
+        block = _replay(actions)
+        while block.translate(dx=0, dy=1):
+            continue
+        cells = frozenset((block.x + dx, block.y + dy) for dx, dy in block.shape.cells)
+        results[cells] = min(results.get(cells, len(actions) + 1), len(actions) + 1)
+
+        for action in (Action.MOVE_DOWN, Action.MOVE_LEFT, Action.MOVE_RIGHT, Action.ROTATE):
+            block = _replay(actions + (action,))
+            state = (block.rotation_state, block.x, block.y)
+            if state not in seen:
+                seen[state] = actions + (action,)
+                queue.append(actions + (action,))
+
+    return results
+
+
+def test_placements_match_brute_force():
+    rng = random.Random(0)
+    for block_type in BLOCK_TYPES:
+        grid = create_grid()
+        _fill_random(grid, rng)
+        rows = grid.get_rows()
+
+        block = block_type(grid)
+        assert block.activate()
+        placements = get_block_placements(grid, block)
+
+        expected = _brute_force_placements(rows, block_type)
+        assert {frozenset(placement.cells): len(placement.actions) for placement in placements} == expected
+
+        # replaying each action sequence on a real block locks it in the reported cells
+        for placement in placements:
+            replay_grid = create_grid()
+            for y, row in enumerate(rows):
+                for x in range(replay_grid.width):
+                    if (row >> x) & 1:
+                        replay_grid.add_point(Point(x=x, y=y, color='black'))
+            replay_block = block_type(replay_grid)
+            assert replay_block.activate()
+            for action in placement.actions[:-1]:
+                assert {
+                    Action.ROTATE: replay_block.rotate,
+                    Action.MOVE_LEFT: lambda: replay_block.translate(dx=-1, dy=0),
+                    Action.MOVE_RIGHT: lambda: replay_block.translate(dx=1, dy=0),
+                    Action.MOVE_DOWN: lambda: replay_block.translate(dx=0, dy=1),
+                }[action]()
+            assert placement.actions[-1] == Action.MOVE_TO_BOTTOM
+            while replay_block.translate(dx=0, dy=1):
+                continue
+            assert (replay_block.rotation_state, replay_block.x, replay_block.y) == \
+                (placement.rotation_state, placement.x, placement.y)
+
+    print("test_placements_match_brute_force success!")
+
+
+def test_square_placements_deduplicated():
+    grid = create_grid()
+    block = BLOCK_TYPES[0](grid)
+    assert block.activate()
+
+    placements = get_block_placements(grid, block)
+
+    # one placement per column pair on an empty board
+    assert len(placements) == grid.width - 1
+    assert len({frozenset(placement.cells) for placement in placements}) == len(placements)
+
+    print("test_square_placements_deduplicated success!")
@@ -0,0 +1,68 @@
+import glob
+import os
+import struct
+
+from agent.beam_search_agent import BeamSearchAgent
+from agent.repository import AgentType
+from game.game import Game
+from game.mode import Mode
+from game.replay import (
+    GRAVITY_CODE, MAGIC, Replay, decode_replay, encode_replay, read_replay, read_results, verify_replay,
+)
+from launch import run_simulation
+
+
+def test_record_and_verify(tmp_path, monkeypatch):
+    monkeypatch.setattr(Game, "REPLAY_PATH", os.path.join(tmp_path, "replays", "{0}", "{1}.replay"))
+    monkeypatch.setattr(Game, "RESULTS_PATH", os.path.join(tmp_path, "results_{0}.csv"))
+
+    game = Game(
+        mode=Mode.SIMULATION,
+        id="test",
+        duration=30,
+        agent=BeamSearchAgent(beam_width=2, time_budget=None, max_depth=1),
+        simulation_delta_t=0.1,
+        headless=True,
+        seed=0,
+        record_replay=True,
+    )
+    game.run()
+    score, elapsed = game.result
+    assert score > 0
+
+    fpaths = glob.glob(os.path.join(tmp_path, "replays", "test", "*.replay"))
+    assert len(fpaths) == 1
+    replay = read_replay(fpaths[0])
+    assert (replay.id, replay.seed, replay.score, replay.elapsed) == ("test", 0, score, elapsed)
+    # one gravity tick per second, the first at time 0
+    assert sum(code == GRAVITY_CODE for _, code in replay.events) == 31
+    # mostly one byte per event
+    assert os.path.getsize(fpaths[0]) < 2 * len(replay.events) + len(replay.block_types) + 32
+
+    assert decode_replay(encode_replay(replay)) == replay
+    assert verify_replay(replay, read_results(Game.RESULTS_PATH.format("test"))) == []
+
+    # a replay that does not reproduce its score is caught
+    assert len(verify_replay(replay._replace(events=replay.events[:len(replay.events) // 2]))) == 1
+
+    print("test_record_and_verify success!")
+
+
+def test_negative_seed(tmp_path, monkeypatch):
+    monkeypatch.setattr(Game, "REPLAY_PATH", os.path.join(tmp_path, "replays", "{0}", "{1}.replay"))
+
+    (score, _), _ = run_simulation("neg", 5, AgentType.RANDOM, 0.1, True, -3, record_replay=True)
+
+    fpaths = glob.glob(os.path.join(tmp_path, "replays", "neg", "*.replay"))
+    assert len(fpaths) == 1
+    replay = read_replay(fpaths[0])
+    assert (replay.seed, replay.score) == (-3, score)
+    assert verify_replay(replay) == []
+    for seed in (-1, -2 ** 40, 2 ** 63):
+        assert decode_replay(encode_replay(replay._replace(seed=seed))).seed == seed
+
+    # version 1 replays stored the seed as a plain varint
+    data = MAGIC + bytes([1, 1]) + b"v" + bytes([200, 1, 0, 0, 7]) + struct.pack("<d", 1.5)
+    assert decode_replay(data) == Replay("v", 200, [], [], 7, 1.5)
+
+    print("test_negative_seed success!")
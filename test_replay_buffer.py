@@ -0,0 +1,58 @@
+import numpy as np
+
+from agent.replay_buffer import ReplayBuffer
+from configs import config
+from element.grid import Grid
+from element.point import Point
+from gui.null_canvas import NullCanvas
+
+
+def test_pack_matches_grid_rows():
+    grid = Grid(NullCanvas(height=config.HEIGHT, width=config.WIDTH))
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        grid.add_point(Point(x=int(rng.integers(grid.width)), y=int(rng.integers(grid.height)), color='black'))
+
+    buffer = ReplayBuffer(capacity=1, height=grid.height, width=grid.width)
+    rows = buffer.pack(grid.get_observation())
+    assert rows.dtype == np.uint16
+    assert rows.tolist() == grid.get_rows()
+    assert (buffer.unpack(rows) == grid.get_observation()).all()
+
+    print("test_pack_matches_grid_rows success!")
+
+
+def test_ring_buffer():
+    rng = np.random.default_rng(0)
+    capacity = 50
+    buffer = ReplayBuffer(capacity=capacity, height=config.HEIGHT, width=config.WIDTH)
+
+    num_transitions = 120
+    observations = rng.random((num_transitions + 1, config.HEIGHT, config.WIDTH)) < 0.3
+    actions = rng.integers(0, 7, size=num_transitions)
+    rewards = rng.integers(0, 9, size=num_transitions)
+    dones = rng.random(num_transitions) < 0.1
+    for idx in range(40):
+        buffer.add(observations[idx], actions[idx], rewards[idx], observations[idx + 1], dones[idx])
+    assert len(buffer) == 40
+    buffer.add_batch(observations[40:-1], actions[40:], rewards[40:], observations[41:], dones[40:])
+    assert len(buffer) == capacity
+
+    # only the last capacity transitions are kept, in ring order
+    kept = np.arange(num_transitions - capacity, num_transitions)
+    slots = kept % capacity
+    sampled_observations, sampled_actions, sampled_rewards, sampled_next_observations, sampled_dones = buffer.get(slots)
+    assert (sampled_observations == observations[kept]).all()
+    assert (sampled_next_observations == observations[kept + 1]).all()
+    assert (sampled_actions == actions[kept]).all()
+    assert (sampled_rewards == rewards[kept]).all()
+    assert (sampled_dones == dones[kept]).all()
+
+    batch = buffer.sample(256, rng)
+    assert batch[0].shape == (256, config.HEIGHT, config.WIDTH) and batch[0].dtype == bool
+    assert all(len(array) == 256 for array in batch)
+
+    # two boards of 21 2-byte rows, plus the action, reward and done flag
+    assert buffer.nbytes == capacity * (2 * 2 * config.HEIGHT + 1 + 4 + 1)
+
+    print("test_ring_buffer success!")
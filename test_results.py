@@ -0,0 +1,91 @@
+import math
+import os
+
+import numpy as np
+
+from agent.random_agent import RandomAgent
+from game.game import Game
+from game.mode import Mode
+from game.results import RESULT_COLUMNS, ResultsWriter, get_shard_fpath, get_shard_fpaths, read_npz_results
+
+
+def test_results_writer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    csv_fpath = os.path.join("out", "results.csv")
+    npz_fpath = os.path.join("out", "results.npz")
+    records = []
+    with ResultsWriter(csv_fpath=csv_fpath, npz_fpath=npz_fpath, batch_size=2) as writer:
+        for seed in range(5):
+            game = Game(
+                mode=Mode.SIMULATION,
+                id="results",
+                duration=10,
+                agent=RandomAgent(),
+                simulation_delta_t=0.1,
+                headless=True,
+                seed=seed,
+                results_writer=writer,
+            )
+            game.run()
+            records.append(game.result_record)
+
+    # the legacy rows are unchanged
+    with open(csv_fpath) as f:
+        rows = [line.strip().split(", ") for line in f]
+    assert [(int(row[0]), float(row[1])) for row in rows] == [(record["score"], record["elapsed"]) for record in records]
+
+    results = read_npz_results(npz_fpath)
+    assert list(results) == [name for name, _ in RESULT_COLUMNS]
+    for name, dtype in RESULT_COLUMNS:
+        assert results[name].dtype.type == dtype
+        assert len(results[name]) == len(records)
+    assert results["seed"].tolist() == list(range(5))
+    assert (results["agent"] == "RandomAgent").all()
+    assert (results["pieces_placed"] > 0).all()
+    assert (results["num_missed"] == -1).all()
+    assert np.isnan(results["agent_p50_us"]).all()
+    assert math.isclose(results["duration"][0], 10)
+
+    print("test_results_writer success!")
+
+
+def test_results_accumulate_across_writers(tmp_path):
+    npz_fpath = os.path.join(tmp_path, "results.npz")
+    records = []
+    # two sessions with the same id, like two launches of a simulation
+    for seeds in (range(3), range(3, 5)):
+        with ResultsWriter(npz_fpath=npz_fpath, batch_size=2) as writer:
+            for seed in seeds:
+                game = Game(
+                    mode=Mode.SIMULATION,
+                    id="results",
+                    duration=10,
+                    agent=RandomAgent(),
+                    simulation_delta_t=0.1,
+                    headless=True,
+                    seed=seed,
+                    record_results=False,
+                )
+                game.run()
+                writer.write(game.result, game.result_record)
+                records.append(game.result_record)
+
+    # every batch went to a shard of its own: two batches in the first session and one in the second
+    assert get_shard_fpaths(npz_fpath) == [get_shard_fpath(npz_fpath, shard_idx) for shard_idx in range(3)]
+    assert not os.path.exists(npz_fpath)
+    results = read_npz_results(npz_fpath)
+    assert results["seed"].tolist() == list(range(5))
+    assert results["score"].tolist() == [record["score"] for record in records]
+
+    # a single archive written before shards is read first, with the columns it predates filled with missing values
+    legacy_fpath = os.path.join(tmp_path, "legacy.npz")
+    del results["agent"]
+    np.savez(legacy_fpath, **results)
+    with ResultsWriter(npz_fpath=legacy_fpath) as writer:
+        writer.write(game.result, game.result_record)
+    results = read_npz_results(legacy_fpath)
+    assert results["seed"].tolist() == list(range(5)) + [4]
+    assert results["agent"].tolist() == [""] * 5 + ["RandomAgent"]
+
+    print("test_results_accumulate_across_writers success!")
@@ -0,0 +1,187 @@
+import threading
+import time
+
+import numpy as np
+
+import game.game as game_module
+from agent.agent import Agent
+from game.action import Action
+from game.agent_runner import Fallback
+from game.clock import VirtualClock
+from game.game import Game
+from game.instrumentation import Instrumentation, Phase
+from game.mode import Mode
+from game.scheduler import TkScheduler
+from gui.null_canvas import NullCanvas
+
+
+class FakeRoot:
+    """
+    Stands in for the Tk root: runs after() callbacks in due order as the virtual clock advances
+    """
+
+    def __init__(self, clock: VirtualClock):
+        self.clock = clock
+        self.pending = {}
+        self._next_id = 0
+
+    def after(self, delay_ms, callback):
+        self._next_id += 1
+        self.pending[self._next_id] = (self.clock.time() + delay_ms / 1000, self._next_id, callback)
+        return self._next_id
+
+    def after_cancel(self, after_id):
+        del self.pending[after_id]
+
+    def run_until(self, t, callback_cost=0.0):
+        while self.pending:
+            due, after_id, callback = min(self.pending.values())
+            if due > t:
+                break
+            del self.pending[after_id]
+            self.clock.advance_to(max(due, self.clock.time()))
+            callback()
+            # the callback takes callback_cost seconds of the Tk thread
+            self.clock.advance_to(self.clock.time() + callback_cost)
+
+
+def test_deadlines_do_not_drift():
+    clock = VirtualClock()
+    root = FakeRoot(clock)
+    instrumentation = Instrumentation()
+    scheduler = TkScheduler(root, clock, instrumentation)
+
+    fired = []
+    scheduler.schedule_periodic("tick", 0.0, 0.1, lambda: fired.append(clock.time()))
+    # every run takes 30 ms, which would add up to a full period of drift after a few runs with relative delays
+    root.run_until(1.05, callback_cost=0.03)
+
+    # one run per period, each within the callback cost of its absolute deadline
+    assert len(fired) == 11
+    for k, t in enumerate(fired):
+        assert 0.1 * k <= t < 0.1 * k + 0.031
+    assert scheduler.jitter["tick"].count == 11
+    assert instrumentation.get_histogram(Phase.TICK_JITTER).count == 11
+
+
+def test_late_task_catches_up():
+    clock = VirtualClock()
+    root = FakeRoot(clock)
+    scheduler = TkScheduler(root, clock)
+
+    fired = []
+    scheduler.schedule_periodic("tick", 0.0, 0.1, lambda: fired.append(clock.time()))
+    # the first run blocks the Tk thread for 350 ms
+    root.run_until(0.0, callback_cost=0.35)
+    root.run_until(1.05)
+
+    # the missed runs happen back to back instead of being skipped, so the count matches the deadlines passed
+    assert len(fired) == 11
+    assert fired[1:4] == [0.35] * 3
+    assert scheduler.jitter["tick"].max >= 0.25 - 1e-9
+
+
+def test_cancel_is_immediate():
+    clock = VirtualClock()
+    root = FakeRoot(clock)
+    scheduler = TkScheduler(root, clock)
+
+    fired = []
+
+    def tick():
+        fired.append(clock.time())
+        if len(fired) == 3:
+            scheduler.cancel()
+
+    scheduler.schedule_periodic("tick", 0.0, 0.1, tick)
+    scheduler.schedule_once("end", 10.0, lambda: fired.append(None))
+    root.run_until(20.0)
+
+    assert len(fired) == 3
+    assert not root.pending
+
+
+def test_one_shot_tasks_are_dropped():
+    clock = VirtualClock()
+    root = FakeRoot(clock)
+    scheduler = TkScheduler(root, clock)
+
+    fired = []
+    for k in range(100):
+        scheduler.schedule_once("poll", 0.01 * k, lambda: fired.append(clock.time()))
+    root.run_until(2.0)
+
+    assert len(fired) == 100
+    assert not scheduler._tasks
+
+
+class FakeTk(FakeRoot):
+    """
+    Stands in for tk.Tk in a GUI game, timing how long each callback holds the Tk thread in real time
+    """
+
+    def __init__(self, clock: VirtualClock):
+        super().__init__(clock)
+        self.max_callback_seconds = 0.0
+
+    def title(self, title):
+        pass
+
+    def mainloop(self):
+        while self.pending:
+            due, after_id, callback = min(self.pending.values())
+            del self.pending[after_id]
+            self.clock.advance_to(max(due, self.clock.time()))
+            start = time.perf_counter()
+            callback()
+            self.max_callback_seconds = max(self.max_callback_seconds, time.perf_counter() - start)
+
+    def destroy(self):
+        self.pending.clear()
+
+
+class StuckAgent(Agent):
+    """
+    Never decides until released
+    """
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.num_calls = 0
+
+    def get_action(self, observation: np.ndarray, state=None) -> Action:
+        self.num_calls += 1
+        self.release.wait()
+        return Action.ROTATE
+
+
+def test_gui_agent_decisions_do_not_block(monkeypatch):
+    clock = VirtualClock()
+    root = FakeTk(clock)
+    monkeypatch.setattr(game_module.tk, "Tk", lambda: root)
+    monkeypatch.setattr(game_module, "WallClock", lambda: clock)
+    monkeypatch.setattr(game_module, "Canvas", lambda root, height, width, **kwargs: NullCanvas(height, width))
+
+    agent = StuckAgent()
+    game = Game(
+        mode=Mode.SIMULATION,
+        id="test",
+        duration=5,
+        agent=agent,
+        simulation_delta_t=1.0,
+        headless=False,
+        seed=0,
+        record_results=False,
+        agent_fallback=Fallback.NOOP,
+    )
+    try:
+        game.run()
+    finally:
+        agent.release.set()
+
+    # waiting on the stuck agent would hold the Tk thread for a whole deadline per decision
+    assert root.max_callback_seconds < 0.5
+    # gravity kept running, and every decision missed - the first by its deadline, the rest on the busy worker
+    assert game.tick_jitter[Game.GRAVITY_TASK].count == 5
+    assert agent.num_calls == 1
+    assert game.result_record["decisions"] == 5 and game.result_record["num_missed"] == 5
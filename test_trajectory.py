@@ -0,0 +1,73 @@
+import glob
+import os
+
+import numpy as np
+
+from agent.beam_search_agent import BeamSearchAgent
+from configs import config
+from game.action import NO_ACTION
+from game.game import Game
+from game.mode import Mode
+from game.trajectory import TrajectoryDataset, TrajectoryWriter
+
+
+class RecordingAgent(BeamSearchAgent):
+    """
+    Beam search agent that keeps what it saw and did
+    """
+
+    def __init__(self):
+        super().__init__(beam_width=2, time_budget=None, max_depth=1)
+        self.observations = []
+        self.actions = []
+
+    def get_action(self, observation, state):
+        action = super().get_action(observation, state)
+        self.observations.append(observation.copy())
+        self.actions.append(action.value if action is not None else NO_ACTION)
+        return action
+
+
+def test_trajectories(tmp_path):
+    writer = TrajectoryWriter(str(tmp_path), height=config.HEIGHT, width=config.WIDTH, shard_size=100)
+    agents = []
+    scores = []
+    for seed in range(3):
+        agent = RecordingAgent()
+        game = Game(
+            mode=Mode.SIMULATION,
+            id="trajectory",
+            duration=20,
+            agent=agent,
+            simulation_delta_t=0.1,
+            headless=True,
+            seed=seed,
+            record_results=False,
+            trajectory_writer=writer,
+        )
+        game.run()
+        agents.append(agent)
+        scores.append(game.result[0])
+
+    dataset = TrajectoryDataset(str(tmp_path))
+    num_steps = sum(len(agent.actions) for agent in agents)
+    assert len(dataset) == num_steps
+    # the steps roll over into fixed size shards
+    assert len(glob.glob(os.path.join(tmp_path, "*.npy"))) == (num_steps + 99) // 100
+
+    observations, actions, rewards, done = dataset[np.arange(num_steps)]
+    assert (observations == np.concatenate([agent.observations for agent in agents])).all()
+    assert actions.tolist() == [action for agent in agents for action in agent.actions]
+    # the last step of each game is done
+    assert (np.flatnonzero(done) == np.cumsum([len(agent.actions) for agent in agents]) - 1).all()
+    # rewards add up to each game's score
+    game_ids = np.cumsum(done) - done
+    assert [rewards[game_ids == game_idx].sum() for game_idx in range(3)] == scores
+    assert sum(scores) > 0
+
+    # single steps and negative indices
+    observation, action, reward, step_done = dataset[-1]
+    assert observation.shape == (config.HEIGHT, config.WIDTH)
+    assert step_done and action == actions[-1] and reward == rewards[-1]
+
+    print("test_trajectories success!")
@@ -0,0 +1,27 @@
+from agent.transposition_cache import TranspositionCache
+
+
+def test_lru_eviction():
+    cache = TranspositionCache(capacity=2)
+    assert cache.hit_rate == 0.0
+
+    cache.put(1, 'T', None, 'a')
+    cache.put(2, 'T', None, 'b')
+    # the piece and hold are part of the key
+    assert cache.get(1, 'S', None) is None
+    assert cache.get(1, 'T', 'S') is None
+    # touching board 1 makes board 2 the least recently used
+    assert cache.get(1, 'T', None) == 'a'
+    cache.put(3, 'T', None, 'c')
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.get(2, 'T', None) is None
+    assert cache.get(1, 'T', None) == 'a'
+    assert cache.get_or_compute(3, 'T', None, lambda: 'unused') == 'c'
+    assert cache.get_or_compute(4, 'T', None, lambda: 'd') == 'd'
+
+    assert (cache.hits, cache.misses, cache.evictions) == (3, 4, 2)
+    assert cache.hit_rate == 3 / 7
+
+    print("test_lru_eviction success!")
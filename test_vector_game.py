@@ -0,0 +1,80 @@
+import numpy as np
+
+from configs import config
+from element.grid import Grid
+from element.point import Point
+from game.action import Action
+from game.game import Game
+from game.mode import Mode
+from game.vector_game import NO_ACTION, VectorGame, clear_full_rows_batch
+from gui.null_canvas import NullCanvas
+from test_helpers import ScriptedAgent
+
+
+def test_clear_full_rows_batch():
+    rng = np.random.default_rng(0)
+    boards = rng.random((64, config.HEIGHT, config.WIDTH)) < 0.6
+    for board in boards:
+        # make a random set of rows full
+        board[rng.random(config.HEIGHT) < 0.2] = True
+
+    expected_boards = []
+    expected_num_rows_cleared = []
+    for board in boards:
+        grid = Grid(NullCanvas(height=config.HEIGHT, width=config.WIDTH))
+        for y, x in zip(*np.nonzero(board)):
+            grid.add_point(Point(x=int(x), y=int(y), color='black'))
+        expected_num_rows_cleared.append(grid.clear_full_rows())
+        expected_boards.append(grid.get_observation(copy=True))
+
+    num_rows_cleared = clear_full_rows_batch(boards)
+
+    assert num_rows_cleared.tolist() == expected_num_rows_cleared
+    assert (boards == np.stack(expected_boards)).all()
+
+    print("test_clear_full_rows_batch success!")
+
+
+def test_matches_game(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    seeds = list(range(8))
+    agents = []
+    for seed in seeds:
+        agent = ScriptedAgent(seed=100 + seed)
+        game = Game(
+            mode=Mode.SIMULATION,
+            id="vector",
+            duration=30,
+            agent=agent,
+            simulation_delta_t=0.1,
+            headless=True,
+            seed=seed,
+        )
+        game.run()
+        agents.append(agent)
+
+    with open(tmp_path / Game.RESULTS_PATH.format("vector")) as f:
+        scores = [int(line.split(",")[0]) for line in f]
+
+    # replay the headless schedule: a gravity tick followed by 10 agent actions
+    vector_game = VectorGame(num_games=len(seeds), seeds=seeds)
+    num_steps = max(len(agent.actions) for agent in agents)
+    for step in range(num_steps + 1):
+        if step % 10 == 0:
+            vector_game.step(np.full(len(seeds), Action.MOVE_DOWN.value))
+
+        if step == num_steps:
+            break
+
+        observations = vector_game.get_observations()
+        actions = np.full(len(seeds), NO_ACTION)
+        for idx, agent in enumerate(agents):
+            if step < len(agent.actions):
+                assert (observations[idx] == agent.observations[step]).all()
+                actions[idx] = agent.actions[step].value
+        vector_game.step(actions)
+
+    assert vector_game.scores.tolist() == scores
+
+    print("test_matches_game success!")